@@ -36,21 +36,32 @@ _RELOADABLE_MODULE_NAMES = (
     "ot_keymap",
     "xraysel_ot_info",
     "geometry_tests",
+    "geometry_versions",
     "timer",
     "view3d_utils",
+    "screen_grid",
+    "thread_pool",
+    "parallel_kernels",
+    "process_pool",
+    "projection_cache",
     "edge_attr",
     "loop_attr",
     "poly_attr",
     "vert_attr",
+    "mesh_topology",
     "selection_utils",
+    "mesh_snapshot",
     "mesh_intersect",
+    "stroke_scheduler",
     "mesh_modal",
     "mesh_ot_box",
     "mesh_ot_circle",
     "lasso_cursor",
     "mesh_ot_lasso",
     "mesh_ot_toggle",
+    "vertex_tree",
     "object_intersect_shared",
+    "object_geometry_cache",
     "object_intersect_box",
     "object_intersect_circle",
     "object_intersect_lasso",
@@ -93,16 +104,30 @@ else:
     # Prevent imports when run in the background, since gpu shaders will not be available
     if not bpy.app.background:
         from . import addon_info, operators, preferences, startup_handlers, tools, types, ui
-        from .functions import geometry_tests, timer, view3d_utils
+        from .functions import (
+            geometry_tests,
+            geometry_versions,
+            mesh_topology,
+            parallel_kernels,
+            process_pool,
+            projection_cache,
+            screen_grid,
+            thread_pool,
+            timer,
+            view3d_utils,
+        )
         from .functions.intersections import mesh_intersect, object_intersect, selection_utils
+        from .functions.intersections.mesh_intersect import mesh_snapshot
         from .functions.intersections.object_intersect import (
+            object_geometry_cache,
             object_intersect_box,
             object_intersect_circle,
             object_intersect_lasso,
             object_intersect_shared,
+            vertex_tree,
         )
         from .functions.mesh_attr import edge_attr, loop_attr, poly_attr, vert_attr
-        from .functions.modals import mesh_modal, object_modal
+        from .functions.modals import mesh_modal, object_modal, stroke_scheduler
         from .icon import lasso_cursor
         from .operators import ot_keymap, xraysel_ot_info
         from .operators.mesh_ot import mesh_ot_box, mesh_ot_circle, mesh_ot_lasso, mesh_ot_toggle
@@ -1,8 +1,31 @@
+import dataclasses
 from collections.abc import Sequence
 
 import numpy as np
 
-from ..types import Bool1DArray, Float1DArray, Float2DArray, Float2x2DArray, Int1DArray
+from ..types import Bool1DArray, BoolNxMArray, Float1DArray, Float2DArray, Float2x2DArray, Int1DArray
+
+# Upper bound for the number of pixels in the lasso bitmap.
+_MAX_RASTER_PIXEL_COUNT = 1 << 24
+# Upper bound for the number of point-edge pairs tested at once by the slab point-in-polygon test.
+_MAX_PAIR_COUNT = 1 << 22
+# Default budget in bytes for temporary arrays of the segment-polygon intersection test.
+_SEGMENT_TEST_MEMORY_BUDGET = 8 << 20
+# Approximate size in bytes of temporary arrays per segment-side pair of the segment-polygon intersection test.
+_SEGMENT_TEST_BYTES_PER_PAIR = 32
+# Upper bound for the number of cells of the grid over polygon sides.
+_MAX_SIDE_GRID_CELL_COUNT = 1 << 20
+# Padding in pixels of segment bounding boxes when looking up grid cells, covers rounding in intersection tests.
+_SIDE_GRID_PADDING = 0.5
+
+
+def _run_offsets(counts: Int1DArray) -> Int1DArray:
+    """
+    Offsets of elements within their runs for runs of the given lengths.
+
+    For example, `[2, 0, 3]` gives `[0, 1, 0, 1, 2]`.
+    """
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
 
 
 def circle_bbox(center: tuple[float, float], radius: float) -> tuple[float, float, float, float]:
@@ -23,6 +46,27 @@ def circle_bbox(center: tuple[float, float], radius: float) -> tuple[float, floa
     return xmin, xmax, ymin, ymax
 
 
+def capsule_bbox(
+    start: tuple[float, float], end: tuple[float, float], radius: float
+) -> tuple[float, float, float, float]:
+    """
+    Computes the bounding box of a capsule, the area swept by a circle moving from one center to another.
+
+    Args:
+        start: Coordinates (x, y) of the first center of the circle.
+        end: Coordinates (x, y) of the last center of the circle.
+        radius: The radius of the circle.
+
+    Returns:
+        Bounding box coordinates (xmin, xmax, ymin, ymax).
+    """
+    xmin = min(start[0], end[0]) - radius
+    xmax = max(start[0], end[0]) + radius
+    ymin = min(start[1], end[1]) - radius
+    ymax = max(start[1], end[1]) + radius
+    return xmin, xmax, ymin, ymax
+
+
 def polygon_bbox(poly: Sequence[tuple[float, float]]) -> tuple[float, float, float, float]:
     """
     Computes the bounding box of a polygon.
@@ -327,6 +371,96 @@ def segments_intersect_circle_prefiltered(
     return segments_mask_isect
 
 
+def _points_to_segment_dist_sq(
+    x: Float1DArray, y: Float1DArray, start: tuple[float, float], end: tuple[float, float]
+) -> Float1DArray:
+    """Squared distances from points to a line segment of non-zero length."""
+    ux = end[0] - start[0]
+    uy = end[1] - start[1]
+    hx = x - start[0]
+    hy = y - start[1]
+    # Parameter of the point closest to each point, clamped to the segment.
+    param = np.clip((hx * ux + hy * uy) / (ux**2 + uy**2), 0, 1)
+    dx = hx - ux * param
+    dy = hy - uy * param
+    return dx**2 + dy**2
+
+
+def points_inside_capsule(
+    co: Float2DArray, start: tuple[float, float], end: tuple[float, float], radius: float
+) -> Bool1DArray:
+    """
+    Determines if multiple points lie inside a single capsule, the area swept by a circle moving from one center
+    to another.
+
+    Args:
+        co: Coordinates of the points, where each row represents (x, y).
+        start: Coordinates (x, y) of the first center of the circle.
+        end: Coordinates (x, y) of the last center of the circle.
+        radius: The radius of the circle.
+
+    Returns:
+        A boolean mask where each element is `True` if the corresponding point is inside
+        the capsule, and `False` otherwise.
+    """
+    if start == end:
+        return points_inside_circle(co, end, radius)
+
+    with np.errstate(invalid="ignore"):
+        return _points_to_segment_dist_sq(co[:, 0], co[:, 1], start, end) < radius**2
+
+
+def segments_intersect_capsule(
+    segment_co: Float2x2DArray, start: tuple[float, float], end: tuple[float, float], radius: float
+) -> Bool1DArray:
+    """
+    Determines if multiple line segments intersect a single capsule, the area swept by a circle moving from one center
+    to another, or lie fully within it.
+
+    A segment intersects the capsule when its distance to the path of the circle center is less than the radius,
+    that is when it crosses the path, or when one of its endpoints is close to the path, or when one of the path
+    endpoints is close to the segment.
+
+    Args:
+        segment_co: Line segments defined by their endpoints, where each segment is ((x1, y1), (x2, y2)).
+        start: Coordinates (x, y) of the first center of the circle.
+        end: Coordinates (x, y) of the last center of the circle.
+        radius: The radius of the circle.
+
+    Returns:
+        A boolean mask where each element is `True` if the corresponding segment intersects the capsule
+        or lies entirely within it, and `False` otherwise.
+    """
+    if start == end:
+        return segments_intersect_circle(segment_co, end, radius)
+
+    x1 = segment_co[:, 0, 0]
+    y1 = segment_co[:, 0, 1]
+    x2 = segment_co[:, 1, 0]
+    y2 = segment_co[:, 1, 1]
+    ux = end[0] - start[0]
+    uy = end[1] - start[1]
+
+    with np.errstate(invalid="ignore"):
+        # Segment endpoints close to the path.
+        segments_mask_isect = _points_to_segment_dist_sq(x1, y1, start, end) < radius**2
+        segments_mask_isect |= _points_to_segment_dist_sq(x2, y2, start, end) < radius**2
+
+        # Path endpoints close to the segments.
+        segments_mask_isect |= segments_intersect_circle(segment_co, start, radius)
+        segments_mask_isect |= segments_intersect_circle(segment_co, end, radius)
+
+        # Segments crossing the path, with endpoints on opposite sides of the path and the path endpoints
+        # on opposite sides of the segment.
+        side1 = ux * (y1 - start[1]) - uy * (x1 - start[0])
+        side2 = ux * (y2 - start[1]) - uy * (x2 - start[0])
+        side3 = (x2 - x1) * (start[1] - y1) - (y2 - y1) * (start[0] - x1)
+        side4 = (x2 - x1) * (end[1] - y1) - (y2 - y1) * (end[0] - x1)
+        segments_mask_isect |= (side1 * side2 < 0) & (side3 * side4 < 0)
+
+    return segments_mask_isect
+
+
 def point_inside_polygons(
     co: tuple[float, float],
     poly_vert_co: Float2DArray,
@@ -449,10 +583,121 @@ def point_inside_polygons_prefiltered(
     return polys_mask_has
 
 
+@dataclasses.dataclass(frozen=True)
+class PolygonSlabTable:
+    """
+    Polygon edges bucketed into horizontal slabs between consecutive distinct vertex y-coordinates.
+
+    Slab `i` spans (slab_y[i], slab_y[i + 1]]. Edges of the slab `i` are
+    `slab_edges[slab_edge_starts[i]:slab_edge_starts[i] + slab_edge_counts[i]]`, where edge `j` goes from
+    (p1x[j], p1y[j]) to (p2x[j], p2y[j]).
+    """
+
+    p1x: Float1DArray
+    p1y: Float1DArray
+    p2x: Float1DArray
+    p2y: Float1DArray
+    slab_y: Float1DArray
+    slab_edges: Int1DArray
+    slab_edge_counts: Int1DArray
+    slab_edge_starts: Int1DArray
+
+
+def build_polygon_slab_table(poly: Sequence[tuple[float, float]]) -> PolygonSlabTable:
+    """
+    Bucket polygon edges into slabs for `points_inside_polygon_slabs`.
+
+    Args:
+        poly: Coordinates (x, y) of the polygon's vertices.
+
+    Returns:
+        The slab table of the polygon.
+    """
+    np_poly = np.array(poly, "f")
+    poly1 = np_poly
+    poly2 = np.roll(np_poly, 2)
+    p1x = poly1[:, 0]
+    p1y = poly1[:, 1]
+    p2x = poly2[:, 0]
+    p2y = poly2[:, 1]
+
+    # An edge crosses points with y in (min(p1y, p2y), max(p1y, p2y)], which is a run of whole slabs,
+    # since edge endpoints are slab bounds.
+    slab_y = np.unique(np_poly[:, 1])
+    edge_slab_starts = np.searchsorted(slab_y, np.minimum(p1y, p2y))
+    edge_slab_counts = np.searchsorted(slab_y, np.maximum(p1y, p2y)) - edge_slab_starts
+
+    edge_slabs = np.repeat(edge_slab_starts, edge_slab_counts) + _run_offsets(edge_slab_counts)
+    order = np.argsort(edge_slabs, kind="stable")
+    slab_edges = np.repeat(np.arange(np_poly.shape[0]), edge_slab_counts)[order]
+    slab_edge_counts = np.bincount(edge_slabs, minlength=slab_y.size)
+    slab_edge_starts = np.cumsum(slab_edge_counts) - slab_edge_counts
+    return PolygonSlabTable(p1x, p1y, p2x, p2y, slab_y, slab_edges, slab_edge_counts, slab_edge_starts)
+
+
+def points_inside_polygon_slabs(co: Float2DArray, table: PolygonSlabTable) -> Bool1DArray:
+    """
+    Determines if multiple points lie inside a single polygon using the ray-casting method, testing each point
+    only against the edges spanning its slab.
+
+    Args:
+        co: Coordinates of the points, where each row represents (x, y).
+        table: Slab table of the polygon made by `build_polygon_slab_table`.
+
+    Returns:
+        A boolean mask where each element is `True` if the corresponding point is inside the polygon,
+        and `False` otherwise.
+    """
+    x = co[:, 0]
+    y = co[:, 1]
+    p1x, p1y, p2x, p2y = table.p1x, table.p1y, table.p2x, table.p2y
+    slab_y = table.slab_y
+    slab_edges = table.slab_edges
+    slab_edge_counts = table.slab_edge_counts
+    slab_edge_starts = table.slab_edge_starts
+
+    # Slab of each point. Points below the polygon and `np.nan` points go to the last slab, which has no edges.
+    point_slabs = np.searchsorted(slab_y, y) - 1
+    point_slabs[point_slabs < 0] = slab_y.size - 1
+
+    point_count = co.shape[0]
+    points_mask_in = np.zeros(point_count, "?")
+    # Points per chunk, bounding the number of point-edge pairs tested at once.
+    chunk_size = max(_MAX_PAIR_COUNT // max(int(np.amax(slab_edge_counts)), 1), 1)
+
+    for chunk_start in range(0, point_count, chunk_size):
+        chunk_stop = min(chunk_start + chunk_size, point_count)
+        chunk_point_slabs = point_slabs[chunk_start:chunk_stop]
+
+        # Pairs of points and edges of their slabs.
+        pair_counts = slab_edge_counts[chunk_point_slabs]
+        pair_points = np.repeat(np.arange(chunk_start, chunk_stop), pair_counts)
+        pair_edges = slab_edges[np.repeat(slab_edge_starts[chunk_point_slabs], pair_counts) + _run_offsets(pair_counts)]
+
+        px = x[pair_points]
+        py = y[pair_points]
+        e1x = p1x[pair_edges]
+        e1y = p1y[pair_edges]
+        e2x = p2x[pair_edges]
+        e2y = p2y[pair_edges]
+
+        # Edges of the slab are never horizontal.
+        xints = (py - e1y) * (e2x - e1x) / (e2y - e1y) + e1x
+        pairs_mask_cross = (px <= np.maximum(e1x, e2x)) & ((e1x == e2x) | (px <= xints))
+
+        crossing_counts = np.bincount(pair_points[pairs_mask_cross] - chunk_start, minlength=chunk_stop - chunk_start)
+        points_mask_in[chunk_start:chunk_stop] = crossing_counts % 2 == 1
+
+    return points_mask_in
+
+
 def points_inside_polygon(co: Float2DArray, poly: Sequence[tuple[float, float]]) -> Bool1DArray:
     """
     Determines if multiple points lie inside a single polygon using the ray-casting method.
 
+    Polygon edges are bucketed into horizontal slabs between consecutive distinct vertex y-coordinates,
+    so each point is tested only against the edges spanning its slab.
+
     Args:
         co: Line segments defined by their endpoints, where each segment is ((x1, y1), (x2, y2)).
         poly: Coordinates (x, y) of the polygon's vertices.
@@ -466,43 +711,195 @@ def points_inside_polygon(co: Float2DArray, poly: Sequence[tuple[float, float]])
         - Point-in-polygon algorithm: https://wrf.ecse.rpi.edu/Research/Short_Notes/pnpoly.html
         - Blender implementation: https://github.com/blender/blender/blob/594f47ecd2d5367ca936cf6fc6ec8168c2b360d0/source/blender/blenlib/intern/math_geom.c#L1541
     """
-    x = co[:, 0]
-    y = co[:, 1]
+    return points_inside_polygon_slabs(co, build_polygon_slab_table(poly))
+
+
+def _rasterize_polygon(poly: Float2DArray, x0: int, y0: int, width: int, height: int) -> BoolNxMArray:
+    """
+    Scan-convert a polygon into a bitmap of pixels with centers inside the polygon using the even–odd rule.
+
+    Pixel (row, col) covers [x0 + col, x0 + col + 1) x [y0 + row, y0 + row + 1). The crossing rule matches
+    `points_inside_polygon`: an edge crosses the pixel row if the row center lies in (ymin, ymax] of the edge,
+    and toggles pixels with centers not past the intersection.
+    """
+    p1 = poly.astype("d")
+    p2 = np.roll(p1, 1, axis=0)
+    p1x, p1y, p2x, p2y = p1[:, 0], p1[:, 1], p2[:, 0], p2[:, 1]
+    edge_ymin = np.minimum(p1y, p2y)
+    edge_ymax = np.maximum(p1y, p2y)
+
+    # Rows with centers in (edge_ymin, edge_ymax] for each edge, horizontal edges cross no rows.
+    row_starts = np.clip(np.floor(edge_ymin - y0 - 0.5).astype("i") + 1, 0, height)
+    row_ends = np.clip(np.floor(edge_ymax - y0 - 0.5).astype("i") + 1, 0, height)
+    row_counts = np.maximum(row_ends - row_starts, 0)
+
+    # Expand edges into (edge, row) crossings.
+    crossing_edges = np.repeat(np.arange(poly.shape[0]), row_counts)
+    crossing_rows = np.repeat(row_starts, row_counts) + _run_offsets(row_counts)
+
+    # Intersections of pixel row centers with the edges.
+    y = crossing_rows + y0 + 0.5
+    e1x, e1y, e2x, e2y = p1x[crossing_edges], p1y[crossing_edges], p2x[crossing_edges], p2y[crossing_edges]
+    xints = (y - e1y) * (e2x - e1x) / (e2y - e1y) + e1x
+
+    # Index of the first pixel with the center past the intersection.
+    crossing_cols = np.clip(np.floor(xints - x0 - 0.5).astype("i") + 1, 0, width)
+
+    # Each row is crossed an even number of times, so parity of crossings past a pixel center equals
+    # parity of crossings before it. Toggle at crossings and accumulate the toggles along the row.
+    toggles = np.zeros((height, width + 1), "?")
+    np.logical_xor.at(toggles, (crossing_rows, crossing_cols), True)
+    return np.logical_xor.accumulate(toggles, axis=1)[:, :width]
+
+
+def _rasterize_polygon_boundary(poly: Float2DArray, x0: int, y0: int, width: int, height: int) -> BoolNxMArray:
+    """
+    Mark pixels touched by the polygon boundary, together with their neighbors.
+
+    Edges are sampled at steps of at most half a pixel, so every pixel the boundary passes through is within
+    one pixel of a sample. Marking the 3x3 neighborhood of sampled pixels then covers the whole boundary.
+    """
+    p1 = poly.astype("d")
+    p2 = np.roll(p1, 1, axis=0)
+    edge_lengths = np.hypot(p2[:, 0] - p1[:, 0], p2[:, 1] - p1[:, 1])
+    sample_counts = np.ceil(edge_lengths * 2).astype("i") + 2
+
+    # Parameter of each sample along its edge.
+    sample_edges = np.repeat(np.arange(poly.shape[0]), sample_counts)
+    t = _run_offsets(sample_counts) / np.repeat(sample_counts - 1, sample_counts)
+
+    sample_co = p1[sample_edges] + (p2 - p1)[sample_edges] * t[:, np.newaxis]
+    cols = np.clip(np.floor(sample_co[:, 0] - x0).astype("i"), 0, width - 1)
+    rows = np.clip(np.floor(sample_co[:, 1] - y0).astype("i"), 0, height - 1)
+
+    sampled = np.zeros((height, width), "?")
+    sampled[rows, cols] = True
+
+    # Dilate by one pixel.
+    boundary = sampled.copy()
+    boundary[1:, :] |= sampled[:-1, :]
+    boundary[:-1, :] |= sampled[1:, :]
+    dilated_rows = boundary.copy()
+    boundary[:, 1:] |= dilated_rows[:, :-1]
+    boundary[:, :-1] |= dilated_rows[:, 1:]
+    return boundary
+
+
+@dataclasses.dataclass(frozen=True)
+class PolygonBitmap:
+    """
+    Polygon scan-converted over its integer bounding box.
 
+    Pixel (row, col) covers [x0 + col, x0 + col + 1) x [y0 + row, y0 + row + 1).
+    """
+
+    x0: int
+    y0: int
+    # Pixels with centers inside the polygon.
+    inside: BoolNxMArray
+    # Pixels touched by the polygon boundary, together with their neighbors.
+    boundary: BoolNxMArray
+    # Slab table for the exact test of points near the boundary.
+    slab_table: PolygonSlabTable
+
+
+def rasterize_polygon(poly: Sequence[tuple[float, float]]) -> PolygonBitmap:
+    """
+    Scan-convert a polygon for `points_inside_polygon_bitmap`.
+
+    Args:
+        poly: Coordinates (x, y) of the polygon's vertices.
+
+    Returns:
+        The polygon bitmap.
+    """
     np_poly = np.array(poly, "f")
-    poly1 = np_poly
-    poly2 = np.roll(np_poly, 2)
+    x0 = int(np.floor(np.amin(np_poly[:, 0])))
+    y0 = int(np.floor(np.amin(np_poly[:, 1])))
+    width = int(np.ceil(np.amax(np_poly[:, 0]))) - x0 + 1
+    height = int(np.ceil(np.amax(np_poly[:, 1]))) - y0 + 1
 
-    point_count = co.shape[0]
-    points_mask_in = np.zeros(point_count, "?")
+    inside = _rasterize_polygon(np_poly, x0, y0, width, height)
+    boundary = _rasterize_polygon_boundary(np_poly, x0, y0, width, height)
+    return PolygonBitmap(x0, y0, inside, boundary, build_polygon_slab_table(poly))
 
-    def loop(p1x: float, p1y: float, p2x: float, p2y: float) -> None:
-        xints = 0.0
 
-        with np.errstate(invalid="ignore"):
-            predicate: Bool1DArray = (y > min(p1y, p2y)) & (y <= max(p1y, p2y)) & (x <= max(p1x, p2x))
-            idx = np.nonzero(predicate)[0]
+def points_inside_polygon_bitmap(co: Float2DArray, bitmap: PolygonBitmap) -> Bool1DArray:
+    """
+    Determines if multiple points lie inside a single polygon by looking up the pixel of the polygon bitmap
+    they fall into.
+
+    Points on pixels touched by the polygon boundary are tested exactly with `points_inside_polygon`,
+    so the result matches it.
+
+    Args:
+        co: Coordinates of the points, where each row represents (x, y).
+        bitmap: Bitmap of the polygon made by `rasterize_polygon`.
 
-        if idx.size > 0:
-            if p1y != p2y:
-                xints = (y[idx] - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-            if p1x == p2x:
-                points_mask_in[idx] = ~points_mask_in[idx]
-            else:
-                idxx = idx[x[idx] <= xints]
-                points_mask_in[idxx] = ~points_mask_in[idxx]
+    Returns:
+        A boolean mask where each element is `True` if the corresponding point is inside the polygon,
+        and `False` otherwise.
+    """
+    height, width = bitmap.inside.shape
 
-    np.frompyfunc(loop, 4, 1)(poly1[:, 0], poly1[:, 1], poly2[:, 0], poly2[:, 1])
+    # Pixels of the points, points outside the bitmap are outside the polygon.
+    with np.errstate(invalid="ignore"):
+        cols = np.floor(co[:, 0] - bitmap.x0)
+        rows = np.floor(co[:, 1] - bitmap.y0)
+        points_mask_in_bitmap = (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+    point_indices = np.flatnonzero(points_mask_in_bitmap)
+    cols = cols[point_indices].astype("i")
+    rows = rows[point_indices].astype("i")
+
+    points_mask_in = np.zeros(co.shape[0], "?")
+    points_mask_in[point_indices] = bitmap.inside[rows, cols]
+
+    # Exact test for points near the boundary.
+    boundary_point_indices = point_indices[bitmap.boundary[rows, cols]]
+    if boundary_point_indices.size:
+        points_mask_in[boundary_point_indices] = points_inside_polygon_slabs(
+            co[boundary_point_indices], bitmap.slab_table
+        )
     return points_mask_in
 
 
+def points_inside_polygon_rasterized(co: Float2DArray, poly: Sequence[tuple[float, float]]) -> Bool1DArray:
+    """
+    Determines if multiple points lie inside a single polygon using a rasterized polygon mask.
+
+    The polygon is scan-converted once into a bitmap over its integer bounding box, and points are classified
+    by looking up the pixel they fall into. Points on pixels touched by the polygon boundary are tested
+    exactly with `points_inside_polygon`, so the result matches it.
+
+    Args:
+        co: Coordinates of the points, where each row represents (x, y).
+        poly: Coordinates (x, y) of the polygon's vertices.
+
+    Returns:
+        A boolean mask where each element is `True` if the corresponding point is inside the polygon,
+        and `False` otherwise.
+    """
+    return points_inside_polygon_bitmap(co, rasterize_polygon(poly))
+
+
+def is_rasterized_test_cheaper(point_count: int, poly: Sequence[tuple[float, float]]) -> bool:
+    """
+    Whether testing the points against a rasterized polygon is cheaper than testing them against polygon edges,
+    which is when there are more point-edge pairs to test than pixels in the polygon bounding box.
+    """
+    xmin, xmax, ymin, ymax = polygon_bbox(poly)
+    pixel_count = (float(xmax - xmin) + 2) * (float(ymax - ymin) + 2)
+    return point_count * len(poly) > pixel_count and pixel_count <= _MAX_RASTER_PIXEL_COUNT
+
+
 def points_inside_polygon_prefiltered(co: Float2DArray, poly: Sequence[tuple[float, float]]) -> Bool1DArray:
     """
     Determines if multiple points lie inside a single polygon using the ray-casting method,
     with pre-filtering for efficiency.
 
     For optimization, points outside the polygon bounding box are filtered out before performing
-    a detailed check.
+    a detailed check. When there are more point-edge pairs to test than pixels in the bounding box,
+    the check is done on a rasterized polygon mask.
 
     Args:
         co: Line segments defined by their endpoints, where each segment is ((x1, y1), (x2, y2)).
@@ -520,22 +917,295 @@ def points_inside_polygon_prefiltered(co: Float2DArray, poly: Sequence[tuple[flo
         return points_mask_in
 
     prefiltered_co = co[points_mask_prefiltered]
-    prefiltered_points_mask_in = points_inside_polygon(prefiltered_co, poly)
+    if is_rasterized_test_cheaper(prefiltered_co.shape[0], poly):
+        prefiltered_points_mask_in = points_inside_polygon_rasterized(prefiltered_co, poly)
+    else:
+        prefiltered_points_mask_in = points_inside_polygon(prefiltered_co, poly)
 
     points_mask_in[points_mask_prefiltered] = prefiltered_points_mask_in
     return points_mask_in
 
 
-def segments_intersect_polygon(segment_co: Float2x2DArray, poly: Sequence[tuple[float, float]]) -> Bool1DArray:
+def _segments_intersect_sides(
+    s1x: Float1DArray,
+    s1y: Float1DArray,
+    s2x: Float1DArray,
+    s2y: Float1DArray,
+    p1x: Float1DArray,
+    p1y: Float1DArray,
+    dx2: Float1DArray,
+    dy2: Float1DArray,
+) -> Bool1DArray:
+    """
+    Determines if line segments intersect polygon sides, with arguments broadcast against each other.
+
+    Sides are defined by their first vertex (p1x, p1y) and their direction (dx2, dy2).
+    """
+    # isect_seg_seg_v2_int
+    # https://github.com/blender/blender/blob/594f47ecd2d5367ca936cf6fc6ec8168c2b360d0/source/blender/blenlib/intern/math_geom.c#L1105  # noqa
+    dx0 = s1x - p1x
+    dy0 = s1y - p1y
+    dx1 = s2x - s1x
+    dy1 = s2y - s1y
+
+    div = dx1 * dy2 - dy1 * dx2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        param = (dy0 * dx2 - dx0 * dy2) / div
+        mu = (dy0 * dx1 - dx0 * dy1) / div
+    with np.errstate(invalid="ignore"):
+        return (0.0 <= param) & (param <= 1.0) & (0.0 <= mu) & (mu <= 1.0)
+
+
+@dataclasses.dataclass(frozen=True)
+class PolygonSideGrid:
+    """
+    Polygon sides binned into a uniform grid over the polygon bounding box.
+
+    Side `j` starts at (p1x[j], p1y[j]) and has the direction (dx2[j], dy2[j]). Cell (row, col) covers
+    [grid_xmin + col * cell_size, grid_xmin + (col + 1) * cell_size) x [grid_ymin + row * cell_size, ...), and
+    sides of the cell `i = row * col_count + col` are
+    `cell_sides[cell_side_starts[i]:cell_side_starts[i] + cell_side_counts[i]]`.
+    """
+
+    p1x: Float1DArray
+    p1y: Float1DArray
+    dx2: Float1DArray
+    dy2: Float1DArray
+    grid_xmin: float
+    grid_ymin: float
+    cell_size: float
+    col_count: int
+    row_count: int
+    cell_sides: Int1DArray
+    cell_side_counts: Int1DArray
+    cell_side_starts: Int1DArray
+    # Summed-area table of side counts, to count candidate pairs of a segment without expanding them.
+    side_count_table: np.ndarray
+
+
+def _grid_cell_ranges(
+    bboxes: tuple[Float1DArray, Float1DArray, Float1DArray, Float1DArray],
+    grid_xmin: float,
+    grid_ymin: float,
+    cell_size: float,
+    col_count: int,
+    row_count: int,
+) -> tuple[Int1DArray, Int1DArray, Int1DArray, Int1DArray]:
+    """
+    Ranges of grid cells overlapping bounding boxes (xmin, xmax, ymin, ymax), cells outside the grid are clamped
+    to its border.
+    """
+    xmin, xmax, ymin, ymax = bboxes
+    col_min = np.clip((xmin - grid_xmin) // cell_size, 0, col_count - 1).astype("i")
+    col_max = np.clip((xmax - grid_xmin) // cell_size, 0, col_count - 1).astype("i")
+    row_min = np.clip((ymin - grid_ymin) // cell_size, 0, row_count - 1).astype("i")
+    row_max = np.clip((ymax - grid_ymin) // cell_size, 0, row_count - 1).astype("i")
+    return col_min, col_max, row_min, row_max
+
+
+def _expand_grid_cells(
+    col_count: int, col_min: Int1DArray, col_max: Int1DArray, row_min: Int1DArray, row_max: Int1DArray
+) -> tuple[Int1DArray, Int1DArray]:
+    """Pairs of bounding boxes and indices of grid cells they overlap."""
+    range_col_counts = col_max - col_min + 1
+    range_cell_counts = range_col_counts * (row_max - row_min + 1)
+    offsets = _run_offsets(range_cell_counts)
+    range_col_counts = np.repeat(range_col_counts, range_cell_counts)
+    cols = np.repeat(col_min, range_cell_counts) + offsets % range_col_counts
+    rows = np.repeat(row_min, range_cell_counts) + offsets // range_col_counts
+    return np.repeat(np.arange(col_min.size), range_cell_counts), rows * col_count + cols
+
+
+def build_polygon_side_grid(poly: Sequence[tuple[float, float]]) -> PolygonSideGrid:
+    """
+    Bin polygon sides into a uniform grid for `segments_intersect_polygon_grid`.
+
+    Args:
+        poly: Coordinates (x, y) of the polygon's vertices.
+
+    Returns:
+        The side grid of the polygon.
+    """
+    np_poly = np.array(poly, "f")
+    poly1 = np_poly
+    poly2 = np.roll(np_poly, 2)
+    p1x = poly1[:, 0]
+    p1y = poly1[:, 1]
+    p2x = poly2[:, 0]
+    p2y = poly2[:, 1]
+    dx2 = p2x - p1x
+    dy2 = p2y - p1y
+
+    # Cells about twice as large as an average side.
+    grid_xmin = float(np.amin(p1x))
+    grid_ymin = float(np.amin(p1y))
+    grid_width = float(np.amax(p1x)) - grid_xmin
+    grid_height = float(np.amax(p1y)) - grid_ymin
+    cell_size = max(float(np.mean(np.hypot(dx2, dy2))) * 2, 1.0)
+    while (grid_width // cell_size + 1) * (grid_height // cell_size + 1) > _MAX_SIDE_GRID_CELL_COUNT:
+        cell_size *= 2
+    col_count = int(grid_width // cell_size) + 1
+    row_count = int(grid_height // cell_size) + 1
+
+    side_bboxes = np.minimum(p1x, p2x), np.maximum(p1x, p2x), np.minimum(p1y, p2y), np.maximum(p1y, p2y)
+    side_cell_ranges = _grid_cell_ranges(side_bboxes, grid_xmin, grid_ymin, cell_size, col_count, row_count)
+    cell_sides, side_cells = _expand_grid_cells(col_count, *side_cell_ranges)
+    order = np.argsort(side_cells, kind="stable")
+    cell_sides = cell_sides[order]
+    cell_side_counts = np.bincount(side_cells, minlength=col_count * row_count)
+    cell_side_starts = np.cumsum(cell_side_counts) - cell_side_counts
+    side_count_table = np.zeros((row_count + 1, col_count + 1), "i")
+    side_count_table[1:, 1:] = cell_side_counts.reshape(row_count, col_count).cumsum(axis=0).cumsum(axis=1)
+    return PolygonSideGrid(
+        p1x,
+        p1y,
+        dx2,
+        dy2,
+        grid_xmin,
+        grid_ymin,
+        cell_size,
+        col_count,
+        row_count,
+        cell_sides,
+        cell_side_counts,
+        cell_side_starts,
+        side_count_table,
+    )
+
+
+def segments_intersect_polygon_grid(
+    segment_co: Float2x2DArray, grid: PolygonSideGrid, memory_budget: int = _SEGMENT_TEST_MEMORY_BUDGET
+) -> Bool1DArray:
+    """
+    Determines if multiple line segments intersect a single polygon, testing each segment only against the sides
+    sharing grid cells with its bounding box.
+
+    Segments with bounding boxes overlapping too many sides are tested against all polygon sides. Tests run
+    in blocks, so the size of temporary arrays stays within the memory budget regardless of the number of segments.
+
+    Args:
+        segment_co: Line segments defined by their endpoints, where each segment is ((x1, y1), (x2, y2)).
+        grid: Side grid of the polygon made by `build_polygon_side_grid`.
+        memory_budget: Approximate upper bound in bytes for temporary arrays of a block.
+
+    Returns:
+        A boolean mask where each element is `True` if the corresponding segment intersects the polygon,
+        and `False` otherwise.
+    """
+    segment_count = segment_co.shape[0]
+    segments_mask_isect = np.zeros(segment_count, "?")
+    # Number of segment-side pairs tested at once.
+    block_pair_count = max(memory_budget // _SEGMENT_TEST_BYTES_PER_PAIR, 1)
+
+    poly_sides = grid.p1x.size
+    p1x, p1y, dx2, dy2 = grid.p1x, grid.p1y, grid.dx2, grid.dy2
+    cell_sides = grid.cell_sides
+    cell_side_counts = grid.cell_side_counts
+    cell_side_starts = grid.cell_side_starts
+    side_count_table = grid.side_count_table
+
+    # Segments with `np.nan` coordinates don't intersect anything.
+    s1x = segment_co[:, 0, 0]
+    s1y = segment_co[:, 0, 1]
+    s2x = segment_co[:, 1, 0]
+    s2y = segment_co[:, 1, 1]
+    segment_indices = np.flatnonzero(~(np.isnan(s1x) | np.isnan(s1y) | np.isnan(s2x) | np.isnan(s2y)))
+    s1x = s1x[segment_indices]
+    s1y = s1y[segment_indices]
+    s2x = s2x[segment_indices]
+    s2y = s2y[segment_indices]
+
+    # Number of cells and candidate pairs of each segment.
+    segment_bboxes = (
+        np.minimum(s1x, s2x) - _SIDE_GRID_PADDING,
+        np.maximum(s1x, s2x) + _SIDE_GRID_PADDING,
+        np.minimum(s1y, s2y) - _SIDE_GRID_PADDING,
+        np.maximum(s1y, s2y) + _SIDE_GRID_PADDING,
+    )
+    col_min, col_max, row_min, row_max = _grid_cell_ranges(
+        segment_bboxes, grid.grid_xmin, grid.grid_ymin, grid.cell_size, grid.col_count, grid.row_count
+    )
+    cell_counts = (col_max - col_min + 1) * (row_max - row_min + 1)
+    pair_counts = (
+        side_count_table[row_max + 1, col_max + 1]
+        - side_count_table[row_min, col_max + 1]
+        - side_count_table[row_max + 1, col_min]
+        + side_count_table[row_min, col_min]
+    )
+
+    # Segments that would have more candidates than polygon sides are tested against all sides.
+    segments_mask_all_sides = np.maximum(cell_counts, pair_counts) > poly_sides
+    all_sides_segment_indices = np.flatnonzero(segments_mask_all_sides)
+    block_size = max(block_pair_count // poly_sides, 1)
+    for block_start in range(0, all_sides_segment_indices.size, block_size):
+        block_indices = all_sides_segment_indices[block_start : block_start + block_size]
+        # Polygon sides as rows, so they broadcast against a block of segments in columns.
+        block_mask_isect = _segments_intersect_sides(
+            s1x[block_indices],
+            s1y[block_indices],
+            s2x[block_indices],
+            s2y[block_indices],
+            p1x[:, np.newaxis],
+            p1y[:, np.newaxis],
+            dx2[:, np.newaxis],
+            dy2[:, np.newaxis],
+        )
+        segments_mask_isect[segment_indices[block_indices]] = np.any(block_mask_isect, axis=0)
+
+    # Other segments are tested against the sides sharing grid cells with them.
+    grid_segment_indices = np.flatnonzero(~segments_mask_all_sides & (pair_counts > 0))
+    block_costs = np.cumsum(np.maximum(cell_counts, pair_counts)[grid_segment_indices])
+    block_start = 0
+    while block_start < grid_segment_indices.size:
+        cost_offset = block_costs[block_start - 1] if block_start else 0
+        block_stop = max(int(np.searchsorted(block_costs, cost_offset + block_pair_count, "right")), block_start + 1)
+        block_indices = grid_segment_indices[block_start:block_stop]
+        block_start = block_stop
+
+        cell_segments, cells = _expand_grid_cells(
+            grid.col_count,
+            col_min[block_indices],
+            col_max[block_indices],
+            row_min[block_indices],
+            row_max[block_indices],
+        )
+        cell_pair_counts = cell_side_counts[cells]
+        pair_segments = block_indices[np.repeat(cell_segments, cell_pair_counts)]
+        pair_sides = cell_sides[np.repeat(cell_side_starts[cells], cell_pair_counts) + _run_offsets(cell_pair_counts)]
+
+        pairs_mask_isect = _segments_intersect_sides(
+            s1x[pair_segments],
+            s1y[pair_segments],
+            s2x[pair_segments],
+            s2y[pair_segments],
+            p1x[pair_sides],
+            p1y[pair_sides],
+            dx2[pair_sides],
+            dy2[pair_sides],
+        )
+        segments_mask_isect[segment_indices[pair_segments[pairs_mask_isect]]] = True
+
+    return segments_mask_isect
+
+
+def segments_intersect_polygon(
+    segment_co: Float2x2DArray, poly: Sequence[tuple[float, float]], memory_budget: int = _SEGMENT_TEST_MEMORY_BUDGET
+) -> Bool1DArray:
     """
     Determines if multiple line segments intersect a single polygon or lie fully inside it.
 
     A segment is considered to intersect the rectangle if it passes through or touches any part of the polygon,
     including its edges, or if both endpoints lie entirely within the polygon.
 
+    Polygon sides are binned into a uniform grid, and each segment is tested only against the sides sharing
+    grid cells with its bounding box. Segments with bounding boxes overlapping too many sides are tested against
+    all polygon sides. Tests run in blocks, so the size of temporary arrays stays within the memory budget
+    regardless of the number of segments.
+
     Args:
         segment_co: Line segments defined by their endpoints, where each segment is ((x1, y1), (x2, y2)).
         poly: Coordinates (x, y) of the polygon's vertices.
+        memory_budget: Approximate upper bound in bytes for temporary arrays of a block.
 
     Returns:
         A boolean mask where each element is `True` if the corresponding segment intersects the polygon,
@@ -546,41 +1216,7 @@ def segments_intersect_polygon(segment_co: Float2x2DArray, poly: Sequence[tuple[
         - Point-in-polygon algorithm: https://wrf.ecse.rpi.edu/Research/Short_Notes/pnpoly.html
         - Blender implementation: https://github.com/blender/blender/blob/594f47ecd2d5367ca936cf6fc6ec8168c2b360d0/source/blender/blenlib/intern/lasso_2d.c#L69
     """
-    s1x = segment_co[:, 0, 0]
-    s1y = segment_co[:, 0, 1]
-    s2x = segment_co[:, 1, 0]
-    s2y = segment_co[:, 1, 1]
-
-    poly_sides = len(poly)
-    np_poly = np.array(poly, "f")
-    poly1 = np_poly
-    poly2 = np.roll(np_poly, 2)
-
-    # isect_seg_seg_v2_int
-    # https://github.com/blender/blender/blob/594f47ecd2d5367ca936cf6fc6ec8168c2b360d0/source/blender/blenlib/intern/math_geom.c#L1105  # noqa
-    def loop(p1x: Float1DArray, p1y: Float1DArray, p2x: Float1DArray, p2y: Float1DArray) -> Bool1DArray:
-        dx0 = s1x - p1x
-        dy0 = s1y - p1y
-        dx1 = s2x - s1x
-        dy1 = s2y - s1y
-        dx2 = p2x - p1x
-        dy2 = p2y - p1y
-
-        div = dx1 * dy2 - dy1 * dx2
-        with np.errstate(invalid="ignore", divide="ignore"):
-            param = (dy0 * dx2 - dx0 * dy2) / div
-        with np.errstate(invalid="ignore", divide="ignore"):
-            mu = (dy0 * dx1 - dx0 * dy1) / div
-        with np.errstate(invalid="ignore"):
-            poly_segments_mask_isect_segment = (0.0 <= param) & (param <= 1.0) & (0.0 <= mu) & (mu <= 1.0)
-
-        return poly_segments_mask_isect_segment
-
-    poly_segments_mask_isect_segments = np.frompyfunc(loop, 4, 1)(poly1[:, 0], poly1[:, 1], poly2[:, 0], poly2[:, 1])
-    poly_segments_mask_isect_segments = np.hstack(poly_segments_mask_isect_segments)
-    poly_segments_mask_isect_segments.shape = (poly_sides, segment_co.shape[0])
-    segments_mask_isect = np.any(poly_segments_mask_isect_segments, axis=0)
-    return segments_mask_isect
+    return segments_intersect_polygon_grid(segment_co, build_polygon_side_grid(poly), memory_budget)
 
 
 def segments_intersect_polygon_prefiltered(
@@ -616,3 +1252,250 @@ def segments_intersect_polygon_prefiltered(
 
     segments_mask_isect[segments_mask_prefiltered] = prefiltered_segments_mask_isect
     return segments_mask_isect
+
+
+def _polygon_sides(poly: Float2DArray) -> Float2x2DArray:
+    """Sides of a polygon, where each side is ((x1, y1), (x2, y2))."""
+    return np.stack((poly, np.roll(poly, -1, axis=0)), axis=1)
+
+
+def polygon_intersect_circle(poly: Float2DArray, center: tuple[float, float], radius: float) -> bool:
+    """
+    Determines if a polygon intersects a circle, lies fully within it or contains it.
+
+    Args:
+        poly: Coordinates (x, y) of the polygon's vertices.
+        center: Coordinates (x, y) of the center of the circle.
+        radius: The radius of the circle.
+
+    Returns:
+        `True` if the polygon and the circle share any point, and `False` otherwise.
+    """
+    if np.any(segments_intersect_circle(_polygon_sides(poly), center, radius)):
+        return True
+    return bool(points_inside_polygon(np.array((center,), "f"), poly)[0])
+
+
+def polygon_intersect_polygon(poly: Float2DArray, other_poly: Sequence[tuple[float, float]]) -> bool:
+    """
+    Determines if a polygon intersects another polygon, lies fully within it or contains it.
+
+    Args:
+        poly: Coordinates (x, y) of the polygon's vertices.
+        other_poly: Coordinates (x, y) of the other polygon's vertices.
+
+    Returns:
+        `True` if the polygons share any point, and `False` otherwise.
+    """
+    if np.any(segments_intersect_polygon_prefiltered(_polygon_sides(poly), other_poly)):
+        return True
+    # Without crossing sides, either polygon lies fully within the other exactly when any of its vertices does.
+    if points_inside_polygon(np.asarray(poly[:1], "f"), other_poly)[0]:
+        return True
+    return bool(points_inside_polygon(np.array(other_poly[:1], "f"), poly)[0])
+
+
+def classify_rectangles_against_rectangle(
+    rect_xmin: Float1DArray,
+    rect_xmax: Float1DArray,
+    rect_ymin: Float1DArray,
+    rect_ymax: Float1DArray,
+    xmin: float,
+    xmax: float,
+    ymin: float,
+    ymax: float,
+) -> tuple[Bool1DArray, Bool1DArray]:
+    """
+    Determines which of multiple rectangles lie entirely outside or entirely inside a single rectangle.
+
+    Args:
+        rect_xmin: Minimum x-coordinates of the rectangles.
+        rect_xmax: Maximum x-coordinates of the rectangles.
+        rect_ymin: Minimum y-coordinates of the rectangles.
+        rect_ymax: Maximum y-coordinates of the rectangles.
+        xmin: Minimum x-coordinate of the rectangle.
+        xmax: Maximum x-coordinate of the rectangle.
+        ymin: Minimum y-coordinate of the rectangle.
+        ymax: Maximum y-coordinate of the rectangle.
+
+    Returns:
+        A tuple containing:
+            - Mask of rectangles entirely outside the rectangle.
+            - Mask of rectangles entirely inside the rectangle.
+    """
+    rects_mask_out = (rect_xmax <= xmin) | (rect_xmin >= xmax) | (rect_ymax <= ymin) | (rect_ymin >= ymax)
+    rects_mask_in = (xmin < rect_xmin) & (rect_xmax < xmax) & (ymin < rect_ymin) & (rect_ymax < ymax)
+    return rects_mask_out, rects_mask_in
+
+
+def classify_rectangles_against_circle(
+    rect_xmin: Float1DArray,
+    rect_xmax: Float1DArray,
+    rect_ymin: Float1DArray,
+    rect_ymax: Float1DArray,
+    center: tuple[float, float],
+    radius: float,
+) -> tuple[Bool1DArray, Bool1DArray]:
+    """
+    Determines which of multiple rectangles lie entirely outside or entirely inside a single circle.
+
+    Args:
+        rect_xmin: Minimum x-coordinates of the rectangles.
+        rect_xmax: Maximum x-coordinates of the rectangles.
+        rect_ymin: Minimum y-coordinates of the rectangles.
+        rect_ymax: Maximum y-coordinates of the rectangles.
+        center: Coordinates (x, y) of the circle's center.
+        radius: The radius of the circle.
+
+    Returns:
+        A tuple containing:
+            - Mask of rectangles entirely outside the circle.
+            - Mask of rectangles entirely inside the circle.
+    """
+    cx, cy = center
+    # Distances to the closest and to the farthest points of the rectangles along each axis.
+    near_dx = np.maximum(np.maximum(rect_xmin - cx, cx - rect_xmax), 0)
+    near_dy = np.maximum(np.maximum(rect_ymin - cy, cy - rect_ymax), 0)
+    far_dx = np.maximum(np.abs(rect_xmin - cx), np.abs(rect_xmax - cx))
+    far_dy = np.maximum(np.abs(rect_ymin - cy), np.abs(rect_ymax - cy))
+
+    rects_mask_out = near_dx**2 + near_dy**2 >= radius**2
+    rects_mask_in = far_dx**2 + far_dy**2 < radius**2
+    return rects_mask_out, rects_mask_in
+
+
+def classify_rectangles_against_polygon(
+    rect_xmin: Float1DArray,
+    rect_xmax: Float1DArray,
+    rect_ymin: Float1DArray,
+    rect_ymax: Float1DArray,
+    poly: Sequence[tuple[float, float]],
+) -> tuple[Bool1DArray, Bool1DArray]:
+    """
+    Determines which of multiple rectangles lie entirely outside or entirely inside a single polygon.
+
+    Rectangles not crossed by any polygon side lie entirely on one side of the polygon boundary, which is
+    the side of their center.
+
+    Args:
+        rect_xmin: Minimum x-coordinates of the rectangles.
+        rect_xmax: Maximum x-coordinates of the rectangles.
+        rect_ymin: Minimum y-coordinates of the rectangles.
+        rect_ymax: Maximum y-coordinates of the rectangles.
+        poly: Coordinates (x, y) of the polygon's vertices.
+
+    Returns:
+        A tuple containing:
+            - Mask of rectangles entirely outside the polygon.
+            - Mask of rectangles entirely inside the polygon.
+    """
+    xmin, xmax, ymin, ymax = polygon_bbox(poly)
+    rects_mask_out, _ = classify_rectangles_against_rectangle(
+        rect_xmin, rect_xmax, rect_ymin, rect_ymax, xmin, xmax, ymin, ymax
+    )
+    rects_mask_in = np.zeros(rect_xmin.shape[0], "?")
+
+    poly_sides = _polygon_sides(np.array(poly, "f"))
+    rects_mask_uncrossed = np.zeros(rect_xmin.shape[0], "?")
+    for i in np.flatnonzero(~rects_mask_out):
+        sides_mask_isect = segments_intersect_rectangle(
+            poly_sides, rect_xmin[i], rect_xmax[i], rect_ymin[i], rect_ymax[i]
+        )
+        rects_mask_uncrossed[i] = not np.any(sides_mask_isect)
+
+    uncrossed_rect_center_co = np.column_stack(
+        (
+            (rect_xmin[rects_mask_uncrossed] + rect_xmax[rects_mask_uncrossed]) / 2,
+            (rect_ymin[rects_mask_uncrossed] + rect_ymax[rects_mask_uncrossed]) / 2,
+        )
+    )
+    uncrossed_rects_mask_in = points_inside_polygon(uncrossed_rect_center_co, poly)
+    rects_mask_in[rects_mask_uncrossed] = uncrossed_rects_mask_in
+    rects_mask_out[rects_mask_uncrossed] = ~uncrossed_rects_mask_in
+    return rects_mask_out, rects_mask_in
+
+
+def simplify_polygon(poly: Sequence[tuple[int, int]], tolerance: float) -> tuple[tuple[int, int], ...]:
+    """
+    Removes polygon vertices that deviate from the simplified outline by no more than the tolerance
+    using the Douglas–Peucker algorithm.
+
+    Distances are measured to the chord segments, not to the lines through them, so a zero tolerance removes
+    only vertices lying on the outline between their neighbors and keeps the polygon area identical. A nonzero
+    tolerance moves the outline by up to the tolerance, so points and edges within that distance of the outline
+    may be tested differently.
+
+    All chains are split at once on each iteration, so the number of iterations depends on the depth of
+    the recursion rather than on the number of vertices.
+
+    Args:
+        poly: Coordinates (x, y) of the polygon's vertices.
+        tolerance: Maximum distance in pixels between a removed vertex and the simplified outline.
+
+    Returns:
+        Coordinates (x, y) of the remaining vertices, in the original order.
+
+    References:
+        - Ramer–Douglas–Peucker algorithm: https://en.wikipedia.org/wiki/Ramer–Douglas–Peucker_algorithm
+    """
+    vert_count = len(poly)
+    if vert_count < 4:
+        return tuple(poly)
+
+    np_poly = np.array(poly, "d")
+    # Split the closed polygon into two open chains between the first vertex and the vertex farthest from it.
+    farthest_index = int(np.argmax(np.hypot(*(np_poly - np_poly[0]).T)))
+    if farthest_index == 0:
+        return tuple(poly[:1])
+    # Closing vertex duplicates the first one.
+    co = np.vstack((np_poly, np_poly[:1]))
+    verts_mask_keep = np.zeros(vert_count + 1, "?")
+    verts_mask_keep[[0, farthest_index, vert_count]] = True
+
+    chain_starts = np.array([0, farthest_index])
+    chain_ends = np.array([farthest_index, vert_count])
+    while chain_starts.size:
+        # Interior vertices of the chains.
+        interior_counts = chain_ends - chain_starts - 1
+        chain_starts = chain_starts[interior_counts > 0]
+        chain_ends = chain_ends[interior_counts > 0]
+        interior_counts = interior_counts[interior_counts > 0]
+        if not chain_starts.size:
+            break
+        interior_chains = np.repeat(np.arange(chain_starts.size), interior_counts)
+        interior_indices = np.repeat(chain_starts + 1, interior_counts) + _run_offsets(interior_counts)
+
+        # Distances from interior vertices to the chords of their chains. Vertices projecting beyond an end of
+        # the chord are measured to that end, so backtracking spikes are kept.
+        a = co[chain_starts][interior_chains]
+        b = co[chain_ends][interior_chains]
+        p = co[interior_indices]
+        ab = b - a
+        ap = p - a
+        bp = p - b
+        chord_lengths = np.hypot(ab[:, 0], ab[:, 1])
+        start_dists = np.hypot(ap[:, 0], ap[:, 1])
+        end_dists = np.hypot(bp[:, 0], bp[:, 1])
+        cross = np.abs(ab[:, 0] * ap[:, 1] - ab[:, 1] * ap[:, 0])
+        dots = ab[:, 0] * ap[:, 0] + ab[:, 1] * ap[:, 1]
+        dists = np.divide(cross, chord_lengths, out=start_dists.copy(), where=chord_lengths != 0)
+        dists = np.where(dots < 0, start_dists, np.where(dots > chord_lengths**2, end_dists, dists))
+
+        # The farthest vertex of each chain, the first one if there are several.
+        chain_interior_starts = np.cumsum(interior_counts) - interior_counts
+        max_dists = np.maximum.reduceat(dists, chain_interior_starts)
+        interior_mask_max = dists == max_dists[interior_chains]
+        split_chains, first_max = np.unique(interior_chains[interior_mask_max], return_index=True)
+        split_indices = interior_indices[interior_mask_max][first_max]
+
+        # Keep the farthest vertices beyond the tolerance and split their chains at them.
+        chains_mask_split = max_dists[split_chains] > tolerance
+        split_chains = split_chains[chains_mask_split]
+        split_indices = split_indices[chains_mask_split]
+        verts_mask_keep[split_indices] = True
+        chain_starts, chain_ends = (
+            np.concatenate((chain_starts[split_chains], split_indices)),
+            np.concatenate((split_indices, chain_ends[split_chains])),
+        )
+
+    return tuple(poly[i] for i in np.flatnonzero(verts_mask_keep[:vert_count]))
@@ -0,0 +1,89 @@
+import itertools
+
+import bmesh
+import bpy
+
+# Source of versions, increasing over the session so a version is never given twice.
+_version_counter = itertools.count()
+# Version of data-blocks whose geometry wasn't updated since the versions were reset.
+_base_version: int = next(_version_counter)
+# Version of the geometry of updated data-blocks, by session UID of the original data-block.
+_versions: dict[int, int] = {}
+# Session UIDs of meshes whose pending geometry update comes from a selection written by the add-on.
+_selection_update_uids: set[int] = set()
+
+
+def get_version(id_data: bpy.types.ID) -> int:
+    """
+    Version of the geometry of the data-block, which changes on every update of its geometry.
+
+    Updates are counted when the depsgraph is evaluated, so pending edits are counted only after
+    `bpy.types.Context.evaluated_depsgraph_get` is called.
+    """
+    return _versions.get(id_data.session_uid, _base_version)
+
+
+def update_edit_mesh_selection(me: bpy.types.Mesh) -> None:
+    """
+    Update the edit mesh after writing selection to its bmesh, keeping the version of its geometry.
+
+    `apply_selection_updates` is expected to be called after the selection of all meshes is written.
+    """
+    _selection_update_uids.add(me.session_uid)
+    bmesh.update_edit_mesh(me, loop_triangles=False, destructive=False)
+
+
+def apply_selection_updates(context: bpy.types.Context) -> None:
+    """Evaluate the depsgraph, so updates of written selections aren't mistaken for later geometry edits."""
+    if _selection_update_uids:
+        context.evaluated_depsgraph_get()
+        _selection_update_uids.clear()
+
+
+def reset() -> None:
+    """Give all data-blocks a new version."""
+    global _base_version
+    _base_version = next(_version_counter)
+    _versions.clear()
+    _selection_update_uids.clear()
+
+
+@bpy.app.handlers.persistent
+def _count_geometry_updates(_scene: bpy.types.Scene, depsgraph: bpy.types.Depsgraph) -> None:
+    """Give data-blocks with updated geometry a new version, unless only their selection was written."""
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        uid = update.id.original.session_uid
+        if uid not in _selection_update_uids:
+            _versions[uid] = next(_version_counter)
+
+
+@bpy.app.handlers.persistent
+def _reset_versions(_scene: bpy.types.Scene, _depsgraph: bpy.types.Depsgraph | None = None) -> None:
+    """Give all data-blocks a new version, when the file is loaded or undo restores data."""
+    reset()
+
+
+_RESETTING_HANDLERS = (
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+)
+
+
+def register() -> None:
+    if _count_geometry_updates not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_count_geometry_updates)
+    for handlers in _RESETTING_HANDLERS:
+        if _reset_versions not in handlers:
+            handlers.append(_reset_versions)
+
+
+def unregister() -> None:
+    if _count_geometry_updates in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_count_geometry_updates)
+    for handlers in _RESETTING_HANDLERS:
+        if _reset_versions in handlers:
+            handlers.remove(_reset_versions)
+    reset()
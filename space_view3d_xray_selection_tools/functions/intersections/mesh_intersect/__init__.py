@@ -1,7 +1,7 @@
+import concurrent.futures
 import dataclasses
 import itertools
-import operator
-from collections.abc import Iterator
+from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any, Literal, cast
 
 import bmesh
@@ -9,26 +9,87 @@ import bpy
 import mathutils
 import numpy as np
 
-from ....types import Bool1DArray, Float2DArray, Int1DArray
-from ... import geometry_tests, timer, view3d_utils
-from ...mesh_attr import edge_attr, loop_attr, poly_attr, vert_attr
+from ....types import Bool1DArray, Float2DArray, Float2x2DArray, Int1DArray
+from ... import (
+    geometry_tests,
+    geometry_versions,
+    parallel_kernels,
+    process_pool,
+    projection_cache,
+    screen_grid,
+    thread_pool,
+    timer,
+    view3d_utils,
+)
 from .. import selection_utils
+from ..object_intersect import object_intersect_shared
+from . import mesh_snapshot
+from .mesh_snapshot import begin_stroke, end_stroke
+
+__all__ = ("begin_stroke", "end_stroke", "select_mesh_elements")
+
+
+def _get_required_attributes(
+    mesh_select_mode: Sequence[bool], select_all_faces: bool, select_backfacing: bool
+) -> list[str]:
+    """Names of snapshot attributes read by the selection passes for the given settings."""
+    names: list[str] = []
+    check_verts = mesh_select_mode[0] or mesh_select_mode[1]
+    check_edges = mesh_select_mode[1] or mesh_select_mode[2] and select_all_faces
+
+    # Vertex pass.
+    if check_verts or check_edges:
+        names += ["vert_co_local", "verts_mask_vis"]
+        if check_verts and not select_backfacing:
+            names.append("vert_normal")
+        if mesh_select_mode[0]:
+            names.append("verts_mask_sel")
+
+    # Edge pass.
+    if check_edges:
+        names += ["topology", "edges_mask_vis"]
+        if mesh_select_mode[1]:
+            names.append("edges_mask_sel")
+
+    # Face pass.
+    if mesh_select_mode[2]:
+        names += ["faces_mask_vis", "faces_mask_sel"]
+        if not select_backfacing:
+            names.append("face_normal")
+        if not select_backfacing or not select_all_faces:
+            names.append("face_center_co_local")
+        if select_all_faces:
+            names.append("topology")
+
+    return names
+
+
+def _write_selection(
+    elements: bmesh.types.BMVertSeq | bmesh.types.BMEdgeSeq | bmesh.types.BMFaceSeq,
+    cur_selection_mask: Bool1DArray,
+    new_selection_mask: Bool1DArray,
+) -> None:
+    """
+    Write the new selection to bmesh elements, accessing only the elements whose selection changes.
+
+    Elements are written one by one however many of them change. Bmesh sequences have no bulk selection setter,
+    and in edit mode the bmesh owns the selection, so writing the selection attributes of the mesh with
+    `foreach_set` has no effect. The only bulk path is a round-trip through a temporary mesh: `bm.to_mesh`,
+    `foreach_set` of the selection attributes, then `bm.from_mesh` back into the edit bmesh. It may be faster
+    when most elements of a large mesh change, but it isn't used past any number of changes because rebuilding
+    the edit bmesh drops its selection history, and a temporary mesh has no shape keys to restore their layers
+    from.
+    """
+    update_indices = np.flatnonzero(cur_selection_mask ^ new_selection_mask)
+    if update_indices.size == 0:
+        return
 
-
-def _lookup_isin(index_array: Int1DArray, lut: Bool1DArray) -> Bool1DArray:
-    """Faster np.isin."""
-    # https://stackoverflow.com/questions/67391617/faster-membership-test-numpy-isin-too-slow/67393797#67393797
-
-    # Size of lookup table.
-    bound = lut.size
-
-    # Pre-filter the invalid ranges and locate the value to check further.
-    mask = index_array < bound
-    idx = np.where(mask)
-
-    # Correct the mask by using the very fast LUT.
-    mask[idx] = lut[index_array[idx]]
-    return mask
+    # The table is rebuilt only if the bmesh topology changed since the last call.
+    elements.ensure_lookup_table()
+    update_index_list: list[int] = update_indices.tolist()
+    update_state_list: list[bool] = new_selection_mask[update_indices].tolist()
+    for i, state in zip(update_index_list, update_state_list):
+        elements[i].select = state
 
 
 @dataclasses.dataclass(frozen=True)
@@ -39,8 +100,333 @@ class _ToolCoordinates:
     box_ymax: int = 0
     circle_center: tuple[int, int] = (0, 0)
     circle_radius: int = 0
+    # Center of the previous circle of the stroke. The selection region is the area swept by the circle moving
+    # from it to the current center.
+    circle_prev_center: tuple[int, int] | None = None
     lasso_poly: tuple[tuple[int, int], ...] = ()
 
+    @property
+    def circle_start(self) -> tuple[int, int]:
+        """Center the circle is swept from."""
+        return self.circle_center if self.circle_prev_center is None else self.circle_prev_center
+
+
+def _get_tool_bbox(
+    tool: Literal['BOX', 'CIRCLE', 'LASSO'], tool_co: _ToolCoordinates
+) -> tuple[float, float, float, float]:
+    """Bounding box (xmin, xmax, ymin, ymax) of the selection region."""
+    match tool:
+        case 'BOX':
+            return tool_co.box_xmin, tool_co.box_xmax, tool_co.box_ymin, tool_co.box_ymax
+        case 'CIRCLE':
+            return geometry_tests.capsule_bbox(tool_co.circle_start, tool_co.circle_center, tool_co.circle_radius)
+        case 'LASSO':
+            return geometry_tests.polygon_bbox(tool_co.lasso_poly)
+
+
+def _get_obs_mask_outside(
+    obs: Sequence[bpy.types.Object],
+    depsgraph: bpy.types.Depsgraph,
+    region: bpy.types.Region,
+    rv3d: bpy.types.RegionView3D,
+    tool: Literal['BOX', 'CIRCLE', 'LASSO'],
+    tool_co: _ToolCoordinates,
+) -> Bool1DArray:
+    """
+    Calculate a mask of objects that can't have elements inside the selection region.
+
+    These are objects with the 3D bounding box entirely clipped, or entirely in front of the view and with
+    the 2D bounding box not overlapping the bounding box of the selection region. Objects with modifiers shown
+    in edit mode are never included, because their bounding box encloses the modified mesh and not the edit cage.
+    """
+    ob_count = len(obs)
+    if ob_count == 0:
+        return np.zeros(0, "?")
+
+    # Bounding boxes of evaluated objects are up to date with the edit mesh.
+    obs_eval = [ob.evaluated_get(depsgraph) for ob in obs]
+    ob_3dbbox_co_2d, ob_3dbbox_co_2d_mask_clip = object_intersect_shared.get_ob_3dbbox_co_2d(
+        obs_eval, ob_count, region, rv3d
+    )
+
+    # Objects with 2D bounding box not overlapping the selection region bounding box, extended by a pixel
+    # to allow for the precision of the projection.
+    xmin, xmax, ymin, ymax = _get_tool_bbox(tool, tool_co)
+    xmin, xmax, ymin, ymax = xmin - 1, xmax + 1, ymin - 1, ymax + 1
+    x = ob_3dbbox_co_2d[:, :, 0]
+    y = ob_3dbbox_co_2d[:, :, 1]
+    obs_mask_2dbbox_out = (
+        (np.amax(x, axis=1) < xmin)
+        | (np.amin(x, axis=1) > xmax)
+        | (np.amax(y, axis=1) < ymin)
+        | (np.amin(y, axis=1) > ymax)
+    )
+
+    # 2D coordinates of clipped corners are meaningless, so partially clipped bounding boxes are kept.
+    obs_mask_2dbbox_any_clip = np.any(ob_3dbbox_co_2d_mask_clip, axis=1)
+    obs_mask_2dbbox_entire_clip = np.all(ob_3dbbox_co_2d_mask_clip, axis=1)
+    obs_mask_out = obs_mask_2dbbox_entire_clip | obs_mask_2dbbox_out & ~obs_mask_2dbbox_any_clip
+
+    obs_mask_modified = np.fromiter(
+        (any(mod.show_viewport and mod.show_in_editmode for mod in ob.modifiers) for ob in obs), "?", ob_count
+    )
+    return obs_mask_out & ~obs_mask_modified
+
+
+def _deselect_all(ob: bpy.types.Object, mesh_select_mode: Sequence[bool]) -> None:
+    """
+    Deselect all elements of the object's edit mesh, reading only selection masks of the selection mode elements.
+
+    Like a selection pass, only elements whose selection changes are written, and the snapshot tracks the written
+    selection, so repeated calls during a stroke don't touch the mesh.
+    """
+    me = ob.data
+    assert isinstance(me, bpy.types.Mesh)
+    if not (me.total_vert_sel or me.total_edge_sel or me.total_face_sel):
+        return
+
+    bm = bmesh.from_edit_mesh(me)
+    names = ("verts_mask_sel", "edges_mask_sel", "faces_mask_sel")
+    snapshot = mesh_snapshot.get_snapshot(ob, bm, list(itertools.compress(names, mesh_select_mode)))
+    for elements, name in itertools.compress(zip((bm.verts, bm.edges, bm.faces), names), mesh_select_mode):
+        cur_selection_mask = getattr(snapshot, name)
+        new_selection_mask = np.zeros_like(cur_selection_mask)
+        _write_selection(elements, cur_selection_mask, new_selection_mask)
+        setattr(snapshot, name, new_selection_mask)
+
+    if bpy.app.version >= (5, 0, 0):
+        # Ignore current UV selection.
+        bm.uv_select_sync_valid = False
+    # Flush deselection to other element types.
+    bm.select_flush_mode()
+    geometry_versions.update_edit_mesh_selection(me)
+
+    # Flushing the selection in a mixed selection mode may change the selection of other element types,
+    # so the selection tracked by the snapshot can't be reused.
+    if sum(mesh_select_mode) > 1:
+        mesh_snapshot.discard_snapshot(ob)
+
+
+def _points_inside_region(
+    co: Float2DArray, tool: Literal['BOX', 'CIRCLE', 'LASSO'], tool_co: _ToolCoordinates, worker_count: int
+) -> Bool1DArray:
+    """Calculate a mask of points inside the selection region."""
+    match tool:
+        case 'BOX':
+            return parallel_kernels.points_inside_rectangle(
+                co, tool_co.box_xmin, tool_co.box_xmax, tool_co.box_ymin, tool_co.box_ymax, worker_count
+            )
+        case 'CIRCLE':
+            return parallel_kernels.points_inside_capsule(
+                co, tool_co.circle_start, tool_co.circle_center, tool_co.circle_radius, worker_count
+            )
+        case 'LASSO':
+            if process_pool.is_worth_offloading(co.shape[0]):
+                return process_pool.points_inside_polygon(co, tool_co.lasso_poly)
+            return parallel_kernels.points_inside_polygon_prefiltered(co, tool_co.lasso_poly, worker_count)
+
+
+def _segments_intersect_region(
+    segment_co: Float2x2DArray,
+    tool: Literal['BOX', 'CIRCLE', 'LASSO'],
+    tool_co: _ToolCoordinates,
+    worker_count: int,
+) -> Bool1DArray:
+    """Calculate a mask of segments intersecting the selection region."""
+    match tool:
+        case 'BOX':
+            return parallel_kernels.segments_intersect_rectangle(
+                segment_co, tool_co.box_xmin, tool_co.box_xmax, tool_co.box_ymin, tool_co.box_ymax, worker_count
+            )
+        case 'CIRCLE':
+            return parallel_kernels.segments_intersect_capsule(
+                segment_co, tool_co.circle_start, tool_co.circle_center, tool_co.circle_radius, worker_count
+            )
+        case 'LASSO':
+            if process_pool.is_worth_offloading(segment_co.shape[0]):
+                return process_pool.segments_intersect_polygon(segment_co, tool_co.lasso_poly)
+            return parallel_kernels.segments_intersect_polygon(segment_co, tool_co.lasso_poly, worker_count)
+
+
+def _concatenate(arrays: Sequence[np.ndarray], tool: Literal['BOX', 'CIRCLE', 'LASSO']) -> np.ndarray:
+    """Concatenate elements of all objects to test, into shared memory when lasso tests may run in worker processes."""
+    if tool == 'LASSO':
+        return process_pool.concatenate(arrays)
+    return np.concatenate(arrays)
+
+
+def _split(array: np.ndarray, counts: Sequence[int]) -> list[np.ndarray]:
+    """Split a concatenated array back into consecutive parts with the given lengths."""
+    return np.split(array, np.cumsum(counts)[:-1])
+
+
+def _calculate_points_masks_in(
+    keys: Sequence[tuple[str, str]],
+    region: bpy.types.Region,
+    co: Sequence[Float2DArray],
+    vis_co: Sequence[Float2DArray],
+    points_mask_vis: Sequence[Bool1DArray],
+    tool: Literal['BOX', 'CIRCLE', 'LASSO'],
+    tool_co: _ToolCoordinates,
+    worker_count: int,
+    points_masks_undecided: Sequence[Bool1DArray | None] | None = None,
+) -> list[Bool1DArray]:
+    """
+    Calculate masks of visible points inside the selection region for several objects.
+
+    Circle tests, and box tests on a reused projection, run per object only on points from grid cells overlapping
+    the selection region, so their cost depends on the number of points under the tool rather than on
+    the number of mesh elements. The other tests run once on the concatenated visible points of all objects.
+    Points not in the optional undecided masks aren't tested and are reported as outside.
+    """
+    points_masks_visin = [np.zeros(ob_co.shape[0], "?") for ob_co in co]
+    if points_masks_undecided is None:
+        points_masks_undecided = [None] * len(keys)
+    batch_indices: list[int] = []
+
+    for i, key in enumerate(keys):
+        if tool == 'CIRCLE' or tool == 'BOX' and projection_cache.is_reused(key):
+            grid = projection_cache.get_grid(key, region)
+            xmin, xmax, ymin, ymax = _get_tool_bbox(tool, tool_co)
+
+            # Indices of points that may be inside the selection region.
+            candidate_indices = screen_grid.query_rectangle(grid, xmin, xmax, ymin, ymax)
+            points_mask_undecided = points_masks_undecided[i]
+            if points_mask_undecided is not None:
+                candidate_indices = candidate_indices[points_mask_undecided[candidate_indices]]
+            candidates_mask_in = _points_inside_region(co[i][candidate_indices], tool, tool_co, worker_count)
+            points_masks_visin[i][candidate_indices] = candidates_mask_in
+        else:
+            batch_indices.append(i)
+
+    if batch_indices:
+        # Masks of tested points and their coordinates, for each object.
+        batch_points_masks: list[Bool1DArray] = []
+        batch_co: list[Float2DArray] = []
+        for i in batch_indices:
+            points_mask_undecided = points_masks_undecided[i]
+            if points_mask_undecided is None:
+                batch_points_masks.append(points_mask_vis[i])
+                batch_co.append(vis_co[i])
+            else:
+                points_mask_test = points_mask_vis[i] & points_mask_undecided
+                batch_points_masks.append(points_mask_test)
+                batch_co.append(co[i][points_mask_test])
+
+        # Mask of points inside the selection region from tested points of all objects.
+        test_points_mask_in = _points_inside_region(_concatenate(batch_co, tool), tool, tool_co, worker_count)
+
+        # Masks of visible points inside the selection region from all points of each object.
+        parts = _split(test_points_mask_in, [ob_co.shape[0] for ob_co in batch_co])
+        for i, points_mask_test, ob_test_points_mask_in in zip(batch_indices, batch_points_masks, parts):
+            points_masks_visin[i][points_mask_test] = ob_test_points_mask_in
+
+    return points_masks_visin
+
+
+@dataclasses.dataclass
+class _ObjectPass:
+    """Mesh data of an object in edit mode and the selection masks passed between vertex, edge and face passes."""
+
+    ob: bpy.types.Object
+    bm: bmesh.types.BMesh
+    snapshot: mesh_snapshot.MeshSnapshot
+    # Object name and world matrix, copied for use on worker threads.
+    ob_name: str
+    mat_world: mathutils.Matrix
+    # View position, or view direction in orthographic views, in object local space.
+    eye_co_local: mathutils.Vector
+    verts_mask_vis: Bool1DArray = dataclasses.field(init=False)
+    vert_co: Float2DArray = dataclasses.field(init=False)
+    vis_vert_co: Float2DArray = dataclasses.field(init=False)
+    verts_mask_visin: Bool1DArray = dataclasses.field(init=False)
+    edges_mask_visin: Bool1DArray = dataclasses.field(init=False)
+    faces_mask_vis: Bool1DArray = dataclasses.field(init=False)
+    face_center_co: Float2DArray = dataclasses.field(init=False)
+    vis_face_center_co: Float2DArray = dataclasses.field(init=False)
+    faces_mask_visin: Bool1DArray = dataclasses.field(init=False)
+
+
+def _prepare_verts(
+    p: _ObjectPass, view: view3d_utils.RegionView, is_view_ortho: bool, filter_backfacing: bool, worker_count: int
+) -> None:
+    """
+    Calculate the mask of visible vertices of the object and project them to the region.
+
+    Runs on worker threads, so it uses only the snapshot and values copied to the pass on the main thread.
+    """
+    # Mask of visible vertices.
+    verts_mask_vis = p.snapshot.verts_mask_vis.copy()
+
+    # Filter out backfacing.
+    if filter_backfacing:
+        vert_normal = p.snapshot.vert_normal
+
+        if is_view_ortho:
+            verts_mask_facing = vert_normal @ p.eye_co_local[:] > 0
+        else:
+            offset_vec = p.snapshot.vert_co_local - p.eye_co_local[:]
+            verts_mask_facing = np.einsum("ij,ij->i", vert_normal, offset_vec) < 0
+
+        verts_mask_vis &= verts_mask_facing
+
+    # 2d coordinates of vertices and of visible vertices.
+    # Visibility is derived from the snapshot, so it changes only with the geometry and the backfacing filter.
+    p.vert_co, p.vis_vert_co = projection_cache.get_co_2d(
+        (p.ob_name, 'VERT'),
+        view,
+        view,
+        p.mat_world,
+        p.snapshot.vert_co_local,
+        verts_mask_vis,
+        (p.snapshot.signature, filter_backfacing),
+        worker_count,
+    )
+    p.verts_mask_vis = verts_mask_vis
+
+
+def _prepare_faces(
+    p: _ObjectPass,
+    view: view3d_utils.RegionView,
+    is_view_ortho: bool,
+    filter_backfacing: bool,
+    project_face_centers: bool,
+    worker_count: int,
+) -> None:
+    """
+    Calculate the mask of visible faces of the object and project centers of the faces to the region.
+
+    Runs on worker threads, so it uses only the snapshot and values copied to the pass on the main thread.
+    """
+    # Mask of visible faces.
+    faces_mask_vis = p.snapshot.faces_mask_vis.copy()
+
+    # Filter out backfacing.
+    if filter_backfacing:
+        face_normal = p.snapshot.face_normal
+
+        if is_view_ortho:
+            faces_mask_facing = face_normal @ p.eye_co_local[:] > 0
+        else:
+            offset_vec = p.snapshot.face_center_co_local - p.eye_co_local[:]
+            faces_mask_facing = np.einsum("ij,ij->i", face_normal, offset_vec) < 0
+
+        faces_mask_vis &= faces_mask_facing
+
+    # 2d coordinates of face centers and of visible face centers.
+    if project_face_centers:
+        p.face_center_co, p.vis_face_center_co = projection_cache.get_co_2d(
+            (p.ob_name, 'FACE'),
+            view,
+            view,
+            p.mat_world,
+            p.snapshot.face_center_co_local,
+            faces_mask_vis,
+            (p.snapshot.signature, filter_backfacing),
+            worker_count,
+        )
+    p.faces_mask_vis = faces_mask_vis
+
 
 def select_mesh_elements(
     context: bpy.types.Context,
@@ -50,10 +436,15 @@ def select_mesh_elements(
     select_all_edges: bool,
     select_all_faces: bool,
     select_backfacing: bool,
+    worker_count: int = 1,
 ) -> None:
     """
     Select mesh elements of selected objects that intersect or lie within the tool region.
 
+    Elements of all objects are tested together: masks and coordinates of each object are concatenated,
+    tested once, and split back per object for writing the selection. While the main thread reads mesh data of
+    the next object, visibility masks and projections of the already read objects are calculated on worker threads.
+
     Args:
         context: The Blender context.
         mode: The selection mode.
@@ -62,6 +453,7 @@ def select_mesh_elements(
         select_all_edges: If True, include edges that are partially inside the selection area.
         select_all_faces: If True, include faces that are partially inside the selection area.
         select_backfacing: If True, include back-facing geometry in the selection.
+        worker_count: Number of threads calculating visibility masks and projections.
 
     Returns:
         None
@@ -79,11 +471,7 @@ def select_mesh_elements(
         eye_co_local = cast(mathutils.Vector, cast(object, None))
         facing_vec_world = cast(mathutils.Vector, cast(object, None))
         cam = cast(bpy.types.Object, cast(object, None))
-        verts_mask_visin = cast(Bool1DArray, cast(object, None))
-        edges_mask_visin = cast(Bool1DArray, cast(object, None))
         vis_edges_mask_in = cast(Bool1DArray, cast(object, None))
-        vert_co = cast(Float2DArray, cast(object, None))
-        me: bpy.types.Mesh | None = None
 
     # View vector
     match rv3d.view_perspective:  # pyright: ignore [reportMatchNotExhaustive]
@@ -99,426 +487,366 @@ def select_mesh_elements(
             vec_z = mathutils.Vector((0.0, 0.0, 1.0))
             facing_vec_world = rv3d.view_matrix.inverted().to_3x3() @ vec_z
 
+    is_view_ortho = (
+        rv3d.view_perspective == 'ORTHO'
+        or rv3d.view_perspective == 'CAMERA'
+        and cast(bpy.types.Camera, cam.data).type == 'ORTHO'
+    )
+    mesh_select_mode = context.tool_settings.mesh_select_mode
+
     sel_obs = context.selected_objects if context.selected_objects else [context.object]
-    for ob in sel_obs:
-        assert isinstance(ob, bpy.types.Object)
-
-        if ob.type == 'MESH':
-            assert isinstance(ob.data, bpy.types.Mesh)
-
-            # View vector
-            match rv3d.view_perspective:  # pyright: ignore [reportMatchNotExhaustive]
-                case 'PERSP' | 'CAMERA':
-                    eye_co_local = ob.matrix_world.inverted() @ eye_co_world
-                case 'ORTHO':
-                    eye_co_local = facing_vec_world @ ob.matrix_world
-
-            mesh_select_mode = context.tool_settings.mesh_select_mode
-
-            try:
-                with timer.time_section("Retrieve mesh", prefix="\n>> BEGIN\n"):
-                    if bpy.app.version >= (3, 4, 0):
-                        bm = bmesh.from_edit_mesh(ob.data)
-                        me = bpy.data.meshes.new("xray_select_temp_mesh")
-                        bm.to_mesh(me)
-                    else:
-                        ob.update_from_editmode()
-                        me = ob.data
-                        bm = bmesh.from_edit_mesh(me)
-
-                # VERTEX PASS
-                if mesh_select_mode[0] or mesh_select_mode[1] or (mesh_select_mode[2] and select_all_faces):
-                    verts = me.vertices
-                    vert_count = len(verts)
-
-                    with timer.time_section("Get vertex attributes", prefix=">> VERTEX PASS\n"):
-                        # Local coordinates of vertices.
-                        vert_co_local = vert_attr.coordinates(me)
-
-                        # Mask of visible vertices.
-                        verts_mask_vis = vert_attr.visibility_mask(me)
-
-                    # Filter out backfacing.
-                    if (mesh_select_mode[0] or mesh_select_mode[1]) and not select_backfacing:
-                        with timer.time_section("Filter out vertex backfacing"):
-                            vert_normal = vert_attr.normal_vector(me)
-
-                            if (
-                                rv3d.view_perspective == 'ORTHO'
-                                or rv3d.view_perspective == 'CAMERA'
-                                and cast(bpy.types.Camera, cam.data).type == 'ORTHO'
-                            ):
-                                verts_mask_facing = vert_normal @ eye_co_local[:] > 0
-                            else:
-                                offset_vec = vert_co_local - eye_co_local[:]
-                                verts_mask_facing = np.einsum("ij,ij->i", vert_normal, offset_vec) < 0
-
-                            verts_mask_vis &= verts_mask_facing
-
-                    with timer.time_section("Calculate vertex 2d coordinates"):
-                        # Local coordinates of visible vertices.
-                        vis_vert_co_local = vert_co_local[verts_mask_vis]
-                        # World coordinates of visible vertices.
-                        vis_vert_co_world = view3d_utils.transform_local_to_world_co(ob.matrix_world, vis_vert_co_local)
-                        # 2d coordinates of visible vertices.
-                        vert_co = np.full((vert_count, 2), np.nan, "f")
-                        vis_vert_co = view3d_utils.transform_world_to_2d_co(region, rv3d, vis_vert_co_world)[0]
-                        vert_co[verts_mask_vis] = vis_vert_co
-
-                    with timer.time_section("Calculate vertex intersection"):
-                        # Mask of vertices inside the selection region from visible vertices.
-                        match tool:
-                            case 'BOX':
-                                vis_verts_mask_in = geometry_tests.points_inside_rectangle(
-                                    vis_vert_co, tool_co.box_xmin, tool_co.box_xmax, tool_co.box_ymin, tool_co.box_ymax
-                                )
-                            case 'CIRCLE':
-                                vis_verts_mask_in = geometry_tests.points_inside_circle(
-                                    vis_vert_co, tool_co.circle_center, tool_co.circle_radius
-                                )
-                            case 'LASSO':
-                                vis_verts_mask_in = geometry_tests.points_inside_polygon_prefiltered(
-                                    vis_vert_co, tool_co.lasso_poly
-                                )
-
-                        # Mask of visible vertices inside the selection region from all vertices.
-                        verts_mask_visin = np.zeros(vert_count, "?")
-                        verts_mask_visin[verts_mask_vis] = vis_verts_mask_in
-
-                    # Do selection.
-                    if mesh_select_mode[0]:
-                        with timer.time_section("Select vertices"):
-                            cur_selection_mask = vert_attr.selection_mask(me)
-                            new_selection_mask = selection_utils.calculate_selection_mask(
-                                cur_selection_mask, verts_mask_visin, mode
-                            )
-                            update_mask = cur_selection_mask ^ new_selection_mask
-
-                            vert_update_list: list[bool] = update_mask.tolist()
-                            vert_state_list: list[bool] = new_selection_mask.tolist()
-
-                            for v, state in itertools.compress(zip(bm.verts, vert_state_list), vert_update_list):
-                                v.select = state
-                # EDGE PASS
-                if mesh_select_mode[1] or (mesh_select_mode[2] and select_all_faces):
-                    edges = me.edges
-                    edge_count = len(edges)
-
-                    with timer.time_section("Get edge attributes", prefix=">> EDGE PASS\n"):
-                        # For each edge get 2 indices of its vertices.
-                        edge_vert_indices = edge_attr.vertex_indices(me)
-
-                        # Mask of visible edges.
-                        edges_mask_vis = edge_attr.visibility_mask(me)
-
-                    with timer.time_section("Calculate edge intersection"):
-                        # For each visible edge get 2 vertex indices.
-                        vis_edge_vert_indices = edge_vert_indices[edges_mask_vis]
-                        # For each visible edge, get mask of vertices in the selection region.
-                        vis_edge_verts_mask_in = verts_mask_visin[vis_edge_vert_indices]
-
-                        # Try to select edges that are completely inside the selection region.
-                        if not select_all_edges:
-                            # Mask of edges inside the selection region from visible edges.
-                            vis_edges_mask_in = vis_edge_verts_mask_in[:, 0] & vis_edge_verts_mask_in[:, 1]
-
-                        # If select_all_edges enabled or no inner edges found,
-                        # then select edges that intersect the selection region.
-                        if (
-                            select_all_edges
-                            or (not select_all_edges and not np.any(vis_edges_mask_in))
-                            or (mesh_select_mode[2] and select_all_faces)
-                        ):
-                            # Coordinates of vertices of visible edges.
-                            vis_edge_vert_co = vert_co[vis_edge_vert_indices]
-
-                            # Mask of edges from visible edges that have vertex inside the selection region and
-                            # should be selected.
-                            vis_edges_mask_vert_in = cast(
-                                Bool1DArray,
-                                vis_edge_verts_mask_in[:, 0] | vis_edge_verts_mask_in[:, 1],
-                            )
-
-                            # Selection region bbox.
-                            match tool:
-                                case 'BOX':
-                                    xmin, xmax, ymin, ymax = (
-                                        tool_co.box_xmin,
-                                        tool_co.box_xmax,
-                                        tool_co.box_ymin,
-                                        tool_co.box_ymax,
-                                    )
-                                case 'CIRCLE':
-                                    xmin, xmax, ymin, ymax = geometry_tests.circle_bbox(
-                                        tool_co.circle_center, tool_co.circle_radius
-                                    )
-                                case 'LASSO':
-                                    xmin, xmax, ymin, ymax = geometry_tests.polygon_bbox(tool_co.lasso_poly)
-
-                            # A mask of edges from visible edges whose vertices are both located outside any
-                            # side of the selection region's bounding box.
-                            # These edges cannot intersect the selection region and should not be selected.
-                            vis_edges_mask_cant_isect = geometry_tests.segments_on_same_rectangle_side(
-                                vis_edge_vert_co, xmin, xmax, ymin, ymax
-                            )
-
-                            # Mask of edges from visible edges that may intersect the selection region and
-                            # should be tested for intersection.
-                            vis_edges_mask_may_isect = ~vis_edges_mask_vert_in & ~vis_edges_mask_cant_isect
-
-                            # Skip if there are no edges that need to be tested for intersection.
-                            if np.any(vis_edges_mask_may_isect):
-                                # Get coordinates of verts of visible edges that may intersect the selection region.
-                                may_isect_vis_edge_co = vis_edge_vert_co[vis_edges_mask_may_isect]
-
-                                # Mask of edges that intersect the selection region from edges that may intersect it.
-                                match tool:
-                                    case 'BOX':
-                                        may_isect_vis_edges_mask_isect = geometry_tests.segments_intersect_rectangle(
-                                            may_isect_vis_edge_co,
-                                            tool_co.box_xmin,
-                                            tool_co.box_xmax,
-                                            tool_co.box_ymin,
-                                            tool_co.box_ymax,
-                                        )
-                                    case 'CIRCLE':
-                                        may_isect_vis_edges_mask_isect = geometry_tests.segments_intersect_circle(
-                                            may_isect_vis_edge_co, tool_co.circle_center, tool_co.circle_radius
-                                        )
-                                    case 'LASSO':
-                                        may_isect_vis_edges_mask_isect = geometry_tests.segments_intersect_polygon(
-                                            may_isect_vis_edge_co, tool_co.lasso_poly
-                                        )
-
-                                # Mask of edges that intersect the selection region from visible edges.
-                                vis_edges_mask_in = vis_edges_mask_vert_in
-                                vis_edges_mask_in[vis_edges_mask_may_isect] = may_isect_vis_edges_mask_isect
-                            else:
-                                vis_edges_mask_in = vis_edges_mask_vert_in
-
-                        # Mask of visible edges inside the selection region from all edges.
-                        edges_mask_visin = np.zeros(edge_count, "?")
-                        edges_mask_visin[edges_mask_vis] = vis_edges_mask_in
-
-                    # Do selection.
-                    if mesh_select_mode[1]:
-                        with timer.time_section("Select edges"):
-                            cur_selection_mask = edge_attr.selection_mask(me)
-                            new_selection_mask = selection_utils.calculate_selection_mask(
-                                cur_selection_mask, edges_mask_visin, mode
-                            )
-                            update_mask = cur_selection_mask ^ new_selection_mask
-
-                            edge_update_list: list[bool] = update_mask.tolist()
-                            edge_state_list: list[bool] = new_selection_mask.tolist()
-
-                            for e, state in itertools.compress(zip(bm.edges, edge_state_list), edge_update_list):
-                                e.select = state
-
-                # FACE PASS
+
+    # Skip objects lying entirely outside the selection region before reading their mesh data.
+    with timer.time_section("Cull objects", prefix="\n>> CULL\n"):
+        mesh_obs = [ob for ob in sel_obs if ob.type == 'MESH']
+        obs_mask_out = _get_obs_mask_outside(mesh_obs, context.evaluated_depsgraph_get(), region, rv3d, tool, tool_co)
+        out_ob_names = set(itertools.compress((ob.name for ob in mesh_obs), obs_mask_out.tolist()))
+
+    # Objects with elements that may be inside the selection region.
+    obs: list[bpy.types.Object] = []
+    for ob in mesh_obs:
+        if ob.name not in out_ob_names:
+            obs.append(ob)
+        # No elements inside the selection region, only setting a new selection can change anything.
+        elif mode == 'SET' or mode == 'AND':
+            with timer.time_section("Deselect all"):
+                _deselect_all(ob, mesh_select_mode)
+
+    check_verts = mesh_select_mode[0] or mesh_select_mode[1] or (mesh_select_mode[2] and select_all_faces)
+    executor = thread_pool.get_executor(worker_count)
+    view = view3d_utils.RegionView.from_region(region, rv3d)
+
+    passes: list[_ObjectPass] = []
+    futures: list[concurrent.futures.Future[None]] = []
+    try:
+        with timer.time_section("Retrieve meshes", prefix="\n>> BEGIN\n"):
+            required_attributes = _get_required_attributes(mesh_select_mode, select_all_faces, select_backfacing)
+            for ob in obs:
+                assert isinstance(ob.data, bpy.types.Mesh)
+
+                # View vector
+                match rv3d.view_perspective:  # pyright: ignore [reportMatchNotExhaustive]
+                    case 'PERSP' | 'CAMERA':
+                        eye_co_local = ob.matrix_world.inverted() @ eye_co_world
+                    case 'ORTHO':
+                        eye_co_local = facing_vec_world @ ob.matrix_world
+
+                bm = bmesh.from_edit_mesh(ob.data)
+                snapshot = mesh_snapshot.get_snapshot(ob, bm, required_attributes)
+                p = _ObjectPass(ob, bm, snapshot, ob.name, ob.matrix_world.copy(), eye_co_local)
+                passes.append(p)
+
+                # Process the object on a worker thread while reading the next one.
+                if check_verts:
+                    futures.append(
+                        executor.submit(
+                            _prepare_verts,
+                            p,
+                            view,
+                            is_view_ortho,
+                            (mesh_select_mode[0] or mesh_select_mode[1]) and not select_backfacing,
+                            worker_count,
+                        )
+                    )
                 if mesh_select_mode[2]:
-                    faces = me.polygons
-                    face_count = len(faces)
-
-                    with timer.time_section("Get face attributes", prefix=">> FACE PASS\n"):
-                        # Get mask of visible faces.
-                        faces_mask_vis = poly_attr.visibility_mask(me)
-
-                    # Filter out backfacing.
-                    if not select_backfacing:
-                        with timer.time_section("Filter out face backfacing"):
-                            face_normal = poly_attr.normal_vector(me)
-
-                            face_center_co_local = poly_attr.center_coordinates(me)
-
-                            if (
-                                rv3d.view_perspective == 'ORTHO'
-                                or rv3d.view_perspective == 'CAMERA'
-                                and cast(bpy.types.Camera, cam.data).type == 'ORTHO'
-                            ):
-                                faces_mask_facing = face_normal @ eye_co_local[:] > 0
-                            else:
-                                offset_vec = face_center_co_local - eye_co_local[:]
-                                faces_mask_facing = np.einsum("ij,ij->i", face_normal, offset_vec) < 0
-
-                            faces_mask_vis &= faces_mask_facing
-
-                    # Select faces which centers are inside the selection region.
-                    if not select_all_faces:
-                        with timer.time_section("Calculate faces centers intersection"):
-                            # Local coordinates of face centers.
-                            face_center_co_local = poly_attr.center_coordinates(me)
-
-                            # Local coordinates of visible face centers.
-                            vis_face_center_co_local = face_center_co_local[faces_mask_vis]
-                            # world coordinates of visible face centers.
-                            vis_vert_co_world = view3d_utils.transform_local_to_world_co(
-                                ob.matrix_world, vis_face_center_co_local
-                            )
-                            # 2d coordinates of visible face centers.
-                            vis_face_center_co = view3d_utils.transform_world_to_2d_co(region, rv3d, vis_vert_co_world)[
-                                0
-                            ]
-
-                            # Mask of face centers inside the selection region from visible faces.
-                            match tool:
-                                case 'BOX':
-                                    vis_faces_mask_in = geometry_tests.points_inside_rectangle(
-                                        vis_face_center_co,
-                                        tool_co.box_xmin,
-                                        tool_co.box_xmax,
-                                        tool_co.box_ymin,
-                                        tool_co.box_ymax,
-                                    )
-                                case 'CIRCLE':
-                                    vis_faces_mask_in = geometry_tests.points_inside_circle(
-                                        vis_face_center_co, tool_co.circle_center, tool_co.circle_radius
-                                    )
-                                case 'LASSO':
-                                    vis_faces_mask_in = geometry_tests.points_inside_polygon_prefiltered(
-                                        vis_face_center_co, tool_co.lasso_poly
-                                    )
-
-                            # Mask of visible faces inside the selection region from all faces.
-                            faces_mask_visin = np.zeros(face_count, "?")
-                            faces_mask_visin[faces_mask_vis] = vis_faces_mask_in
-                    else:
-                        with timer.time_section("Calculate faces by edges"):
-                            # Number of vertices for each face.
-                            face_loop_totals = poly_attr.vertex_count(me)
-
-                            # Skip calculating faces from edges if there is no edges inside selection region.
-                            in_edge_count = np.count_nonzero(edges_mask_visin)
-                            if in_edge_count:
-                                # Retrieving faces from bmesh is faster when a low number of faces need to be
-                                # selected from a large number of total faces,
-                                # otherwise numpy is faster.
-                                edge_count = len(me.edges)
-                                ratio = edge_count / in_edge_count
-
-                                if ratio > 5.9:
-                                    # Bmesh pass.
-                                    # Indices of visible edges inside the selection region.
-                                    visin_edge_indices: list[int] = np.nonzero(edges_mask_visin)[0].tolist()
-
-                                    # Visible edges inside the selection region.
-                                    visin_edges_: tuple[bmesh.types.BMEdge, ...] | bmesh.types.BMEdge = (
-                                        operator.itemgetter(
-                                            *visin_edge_indices,
-                                        )(bm.edges)
-                                    )
-                                    # itemgetter return-type is not consistent
-                                    visin_edges: tuple[bmesh.types.BMEdge, ...] = (
-                                        visin_edges_ if isinstance(visin_edges_, tuple) else (visin_edges_,)
-                                    )
-
-                                    # Faces per visible edge inside the selection region.
-                                    visin_edge_faces: Iterator[tuple[bmesh.types.BMFace, ...]] = map(
-                                        operator.attrgetter("link_faces"), visin_edges
-                                    )
-                                    # Faces inside the selection region.
-                                    in_faces: set[bmesh.types.BMFace] = set(
-                                        itertools.chain.from_iterable(visin_edge_faces)
-                                    )
-
-                                    # Indices of faces inside the selection region.
-                                    in_face_indices_it: Iterator[int] = map(operator.attrgetter("index"), in_faces)
-                                    in_face_indices = np.fromiter(in_face_indices_it, "i")
-                                else:
-                                    # Numpy pass.
-                                    # Indices of face edges.
-                                    loop_edge_indices: Int1DArray = loop_attr.edge_indices(me)
-
-                                    # Index of face for each edge in mesh loop.
-                                    face_indices: Int1DArray = np.arange(face_count)
-                                    loop_face_indices: Int1DArray = np.repeat(face_indices, face_loop_totals)
-
-                                    # Mask of visible edges in the selection region that are part of mesh loops,
-                                    # therefore forming face polygons in the selection region.
-                                    loop_edges_mask_visin = _lookup_isin(loop_edge_indices, edges_mask_visin)
-
-                                    # Indices of faces inside the selection region.
-                                    in_face_indices = np.unique(loop_face_indices[loop_edges_mask_visin])
-
-                                # Mask of all faces in the selection region.
-                                faces_mask_in = np.zeros(face_count, "?")
-                                faces_mask_in[in_face_indices] = np.True_
-                                # Mask of visible faces in the selection region.
-                                faces_mask_visin = faces_mask_vis & faces_mask_in
-                            else:
-                                faces_mask_in = faces_mask_visin = np.zeros(face_count, "?")
-
-                        with timer.time_section("Calculate faces under cursor"):
-                            # Select faces under the cursor (faces that have the selection region inside their area).
-
-                            # Visible faces not in the selection region.
-                            faces_mask_visnoin = ~faces_mask_in & faces_mask_vis
-
-                            # Number of vertices of each visible face not in the selection region.
-                            visnoin_face_loop_totals = face_loop_totals[faces_mask_visnoin]
-
-                            # Skip if all faces are already selected.
-                            if visnoin_face_loop_totals.size > 0:
-                                match tool:
-                                    case 'BOX':
-                                        cursor_co = (tool_co.box_xmax, tool_co.box_ymin)  # bottom right box corner
-                                    case 'CIRCLE':
-                                        cursor_co = tool_co.circle_center
-                                    case 'LASSO':
-                                        cursor_co = tool_co.lasso_poly[0]
-
-                                # Indices of vertices of all faces.
-                                face_vert_indices = loop_attr.vertex_indices(me)
-
-                                # Mask of vertices not in the selection region from face vertices.
-                                face_verts_mask_visnoin = np.repeat(faces_mask_visnoin, face_loop_totals)
-                                # Indices of vertices of visible faces not in the selection region.
-                                visnoin_face_vert_indices = face_vert_indices[face_verts_mask_visnoin]
-                                # Coordinates of vertices of visible face vertices not in the selection region.
-                                visnoin_face_vert_co = vert_co[visnoin_face_vert_indices]
-                                # Index of first face vertex in a face vertex sequence.
-                                cumsum: Int1DArray = visnoin_face_loop_totals.cumsum()
-                                visnoin_face_cell_starts = np.insert(cumsum[:-1], 0, 0)
-
-                                # Mask of faces that have cursor inside their polygon area.
-                                # From visible faces not in the selection region.
-                                visnoin_faces_mask_under = geometry_tests.point_inside_polygons_prefiltered(
-                                    cursor_co,
-                                    visnoin_face_vert_co,
-                                    visnoin_face_cell_starts,
-                                    visnoin_face_loop_totals,
-                                )
-
-                                # Mask of visible faces under cursor from all faces.
-                                faces_mask_visunder = np.zeros(face_count, "?")
-                                faces_mask_visunder[faces_mask_visnoin] = visnoin_faces_mask_under
-
-                                # Mask of visible faces in the selection region and under the cursor.
-                                faces_mask_visin[faces_mask_visunder] = np.True_
-
-                    with timer.time_section("Select faces"):
-                        # Do selection.
-                        cur_selection_mask = poly_attr.selection_mask(me)
+                    futures.append(
+                        executor.submit(
+                            _prepare_faces,
+                            p,
+                            view,
+                            is_view_ortho,
+                            not select_backfacing,
+                            not select_all_faces,
+                            worker_count,
+                        )
+                    )
+
+        with timer.time_section("Wait for projection"):
+            for future in futures:
+                future.result()
+
+        # Whether results of the edge pass are used only to select edges, and results of the vertex pass only to select
+        # vertices. Only then elements with decided selection can be skipped.
+        check_edges = mesh_select_mode[1] or (mesh_select_mode[2] and select_all_faces)
+        skip_decided_verts = mesh_select_mode[0] and not check_edges
+        skip_decided_edges = mesh_select_mode[1] and not (mesh_select_mode[2] and select_all_faces)
+
+        # VERTEX PASS
+        if passes and check_verts:
+            with timer.time_section("Calculate vertex intersection", prefix=">> VERTEX PASS\n"):
+                # Masks of visible vertices inside the selection region from all vertices.
+                verts_masks_visin = _calculate_points_masks_in(
+                    [(p.ob_name, 'VERT') for p in passes],
+                    region,
+                    [p.vert_co for p in passes],
+                    [p.vis_vert_co for p in passes],
+                    [p.verts_mask_vis for p in passes],
+                    tool,
+                    tool_co,
+                    worker_count,
+                    [selection_utils.get_undecided_mask(p.snapshot.verts_mask_sel, mode) for p in passes]
+                    if skip_decided_verts
+                    else None,
+                )
+                for p, verts_mask_visin in zip(passes, verts_masks_visin):
+                    p.verts_mask_visin = verts_mask_visin
+
+            # Do selection.
+            if mesh_select_mode[0]:
+                with timer.time_section("Select vertices"):
+                    for p in passes:
+                        cur_selection_mask = p.snapshot.verts_mask_sel
                         new_selection_mask = selection_utils.calculate_selection_mask(
-                            cur_selection_mask, faces_mask_visin, mode
+                            cur_selection_mask, p.verts_mask_visin, mode
+                        )
+                        _write_selection(p.bm.verts, cur_selection_mask, new_selection_mask)
+                        p.snapshot.verts_mask_sel = new_selection_mask
+
+        # EDGE PASS
+        if passes and check_edges:
+            with timer.time_section("Calculate edge intersection", prefix=">> EDGE PASS\n"):
+                # Selection region bbox.
+                xmin, xmax, ymin, ymax = _get_tool_bbox(tool, tool_co)
+
+                # Masks of edges inside the selection region from visible edges.
+                vis_edges_masks_in: list[Bool1DArray] = []
+                # Masks of edges from visible edges that should be tested for intersection, `None` if there are none.
+                vis_edges_masks_may_isect: list[Bool1DArray | None] = []
+                # Coordinates of verts of visible edges that may intersect the selection region.
+                may_isect_vis_edge_co_list: list[Float2x2DArray] = []
+
+                for p in passes:
+                    # For each visible edge get 2 vertex indices.
+                    vis_edge_vert_indices = p.snapshot.topology.edge_vert_indices[p.snapshot.edges_mask_vis]
+                    # For each visible edge, get mask of vertices in the selection region.
+                    vis_edge_verts_mask_in = p.verts_mask_visin[vis_edge_vert_indices]
+                    vis_edges_mask_may_isect = None
+                    # Mask of visible edges whose selection may still change, `None` if all may change.
+                    vis_edges_mask_undecided = None
+                    if skip_decided_edges:
+                        edges_mask_undecided = selection_utils.get_undecided_mask(p.snapshot.edges_mask_sel, mode)
+                        if edges_mask_undecided is not None:
+                            vis_edges_mask_undecided = edges_mask_undecided[p.snapshot.edges_mask_vis]
+
+                    # Try to select edges that are completely inside the selection region.
+                    if not select_all_edges:
+                        # Mask of edges inside the selection region from visible edges.
+                        vis_edges_mask_in = vis_edge_verts_mask_in[:, 0] & vis_edge_verts_mask_in[:, 1]
+
+                    # If select_all_edges enabled or no inner edges found,
+                    # then select edges that intersect the selection region.
+                    if (
+                        select_all_edges
+                        or (not select_all_edges and not np.any(vis_edges_mask_in))
+                        or (mesh_select_mode[2] and select_all_faces)
+                    ):
+                        # Mask of edges from visible edges that have vertex inside the selection region and
+                        # should be selected.
+                        vis_edges_mask_in = cast(
+                            Bool1DArray,
+                            vis_edge_verts_mask_in[:, 0] | vis_edge_verts_mask_in[:, 1],
+                        )
+
+                        # Mask of edges from visible edges that aren't inside the selection region and may still
+                        # change selection.
+                        vis_edges_mask_test = ~vis_edges_mask_in
+                        if vis_edges_mask_undecided is not None:
+                            vis_edges_mask_test &= vis_edges_mask_undecided
+                        # Coordinates of vertices of these edges.
+                        test_vis_edge_vert_co = p.vert_co[vis_edge_vert_indices[vis_edges_mask_test]]
+
+                        # A mask of edges from these edges whose vertices are both located outside any
+                        # side of the selection region's bounding box.
+                        # These edges cannot intersect the selection region and should not be selected.
+                        test_vis_edges_mask_cant_isect = geometry_tests.segments_on_same_rectangle_side(
+                            test_vis_edge_vert_co, xmin, xmax, ymin, ymax
                         )
-                        update_mask = cur_selection_mask ^ new_selection_mask
-
-                        poly_update_list: list[bool] = update_mask.tolist()
-                        poly_state_list: list[bool] = new_selection_mask.tolist()
-
-                        for f, state in itertools.compress(zip(bm.faces, poly_state_list), poly_update_list):
-                            f.select = state
-
-                with timer.time_section("Finalize", prefix=">> END\n"):
-                    if bpy.app.version >= (5, 0, 0):
-                        # Ignore current UV selection.
-                        bm.uv_select_sync_valid = False
-                    # Flush face selection after selecting/deselecting edges and vertices.
-                    bm.select_flush_mode()
-                    bmesh.update_edit_mesh(ob.data, loop_triangles=False, destructive=False)
-
-            finally:
-                if bpy.app.version >= (3, 4, 0):
-                    if me is not None:
-                        bpy.data.meshes.remove(me, do_unlink=True)
+
+                        # Mask of edges from visible edges that may intersect the selection region and
+                        # should be tested for intersection.
+                        vis_edges_mask_may_isect = vis_edges_mask_test
+                        vis_edges_mask_may_isect[vis_edges_mask_test] = ~test_vis_edges_mask_cant_isect
+
+                        # Skip if there are no edges that need to be tested for intersection.
+                        if np.any(vis_edges_mask_may_isect):
+                            may_isect_vis_edge_co_list.append(test_vis_edge_vert_co[~test_vis_edges_mask_cant_isect])
+                        else:
+                            vis_edges_mask_may_isect = None
+
+                    vis_edges_masks_in.append(vis_edges_mask_in)
+                    vis_edges_masks_may_isect.append(vis_edges_mask_may_isect)
+
+                # Test edges of all objects that may intersect the selection region at once.
+                if may_isect_vis_edge_co_list:
+                    # Mask of edges that intersect the selection region from edges that may intersect it.
+                    may_isect_vis_edges_mask_isect = _segments_intersect_region(
+                        _concatenate(may_isect_vis_edge_co_list, tool), tool, tool_co, worker_count
+                    )
+                    parts = iter(
+                        _split(may_isect_vis_edges_mask_isect, [co.shape[0] for co in may_isect_vis_edge_co_list])
+                    )
+                    for vis_edges_mask_in, vis_edges_mask_may_isect in zip(
+                        vis_edges_masks_in, vis_edges_masks_may_isect
+                    ):
+                        if vis_edges_mask_may_isect is not None:
+                            vis_edges_mask_in[vis_edges_mask_may_isect] = next(parts)
+
+                for p, vis_edges_mask_in in zip(passes, vis_edges_masks_in):
+                    # Mask of visible edges inside the selection region from all edges.
+                    p.edges_mask_visin = np.zeros(p.snapshot.element_counts[1], "?")
+                    p.edges_mask_visin[p.snapshot.edges_mask_vis] = vis_edges_mask_in
+
+            # Do selection.
+            if mesh_select_mode[1]:
+                with timer.time_section("Select edges"):
+                    for p in passes:
+                        cur_selection_mask = p.snapshot.edges_mask_sel
+                        new_selection_mask = selection_utils.calculate_selection_mask(
+                            cur_selection_mask, p.edges_mask_visin, mode
+                        )
+                        _write_selection(p.bm.edges, cur_selection_mask, new_selection_mask)
+                        p.snapshot.edges_mask_sel = new_selection_mask
+
+        # FACE PASS
+        if passes and mesh_select_mode[2]:
+            # Select faces which centers are inside the selection region.
+            if not select_all_faces:
+                with timer.time_section("Calculate faces centers intersection", prefix=">> FACE PASS\n"):
+                    # Masks of visible faces inside the selection region from all faces.
+                    faces_masks_visin = _calculate_points_masks_in(
+                        [(p.ob_name, 'FACE') for p in passes],
+                        region,
+                        [p.face_center_co for p in passes],
+                        [p.vis_face_center_co for p in passes],
+                        [p.faces_mask_vis for p in passes],
+                        tool,
+                        tool_co,
+                        worker_count,
+                        [selection_utils.get_undecided_mask(p.snapshot.faces_mask_sel, mode) for p in passes],
+                    )
+                    for p, faces_mask_visin in zip(passes, faces_masks_visin):
+                        p.faces_mask_visin = faces_mask_visin
+            else:
+                with timer.time_section("Calculate faces by edges", prefix=">> FACE PASS\n"):
+                    # Masks of all faces in the selection region.
+                    faces_masks_in: list[Bool1DArray] = []
+
+                    for p in passes:
+                        face_count = p.snapshot.element_counts[2]
+                        faces_mask_in = np.zeros(face_count, "?")
+
+                        # Skip calculating faces from edges if there is no edges inside selection region.
+                        visin_edge_indices = np.flatnonzero(p.edges_mask_visin)
+                        if visin_edge_indices.size:
+                            # Indices of faces using visible edges inside the selection region.
+                            in_face_indices = p.snapshot.topology.get_edge_faces(visin_edge_indices)
+                            faces_mask_in[in_face_indices] = np.True_
+
+                        # Mask of visible faces in the selection region.
+                        p.faces_mask_visin = p.faces_mask_vis & faces_mask_in
+                        faces_masks_in.append(faces_mask_in)
+
+                with timer.time_section("Calculate faces under cursor"):
+                    # Select faces under the cursor (faces that have the selection region inside their area).
+                    match tool:
+                        case 'BOX':
+                            cursor_co = (tool_co.box_xmax, tool_co.box_ymin)  # bottom right box corner
+                        case 'CIRCLE':
+                            cursor_co = tool_co.circle_center
+                        case 'LASSO':
+                            cursor_co = tool_co.lasso_poly[0]
+
+                    # Masks of visible faces not in the selection region.
+                    faces_masks_visnoin: list[Bool1DArray] = []
+                    # Number of vertices of each visible face not in the selection region.
+                    visnoin_face_loop_totals_list: list[Int1DArray] = []
+                    # Coordinates of vertices of visible faces not in the selection region.
+                    visnoin_face_vert_co_list: list[Float2DArray] = []
+
+                    for p, faces_mask_in in zip(passes, faces_masks_in):
+                        face_loop_totals = p.snapshot.topology.face_loop_totals
+                        faces_mask_visnoin = ~faces_mask_in & p.faces_mask_vis
+                        # Skip faces whose selection can't change.
+                        faces_mask_undecided = selection_utils.get_undecided_mask(p.snapshot.faces_mask_sel, mode)
+                        if faces_mask_undecided is not None:
+                            faces_mask_visnoin &= faces_mask_undecided
+
+                        # Mask of vertices not in the selection region from face vertices.
+                        face_verts_mask_visnoin = np.repeat(faces_mask_visnoin, face_loop_totals)
+                        # Indices of vertices of visible faces not in the selection region.
+                        visnoin_face_vert_indices = p.snapshot.topology.loop_vert_indices[face_verts_mask_visnoin]
+
+                        faces_masks_visnoin.append(faces_mask_visnoin)
+                        visnoin_face_loop_totals_list.append(face_loop_totals[faces_mask_visnoin])
+                        visnoin_face_vert_co_list.append(p.vert_co[visnoin_face_vert_indices])
+
+                    # Number of vertices of each visible face not in the selection region, of all objects.
+                    visnoin_face_loop_totals = np.concatenate(visnoin_face_loop_totals_list)
+
+                    # Skip if all faces are already selected.
+                    if visnoin_face_loop_totals.size > 0:
+                        # Index of first face vertex in a face vertex sequence.
+                        cumsum: Int1DArray = visnoin_face_loop_totals.cumsum()
+                        visnoin_face_cell_starts = np.insert(cumsum[:-1], 0, 0)
+
+                        # Mask of faces that have cursor inside their polygon area.
+                        # From visible faces not in the selection region.
+                        visnoin_faces_mask_under = geometry_tests.point_inside_polygons_prefiltered(
+                            cursor_co,
+                            np.concatenate(visnoin_face_vert_co_list),
+                            visnoin_face_cell_starts,
+                            visnoin_face_loop_totals,
+                        )
+
+                        parts = _split(
+                            visnoin_faces_mask_under, [totals.size for totals in visnoin_face_loop_totals_list]
+                        )
+                        for p, faces_mask_visnoin, ob_visnoin_faces_mask_under in zip(
+                            passes, faces_masks_visnoin, parts
+                        ):
+                            # Mask of visible faces under cursor from all faces.
+                            faces_mask_visunder = np.zeros(p.snapshot.element_counts[2], "?")
+                            faces_mask_visunder[faces_mask_visnoin] = ob_visnoin_faces_mask_under
+
+                            # Mask of visible faces in the selection region and under the cursor.
+                            p.faces_mask_visin[faces_mask_visunder] = np.True_
+
+            with timer.time_section("Select faces"):
+                # Do selection.
+                for p in passes:
+                    cur_selection_mask = p.snapshot.faces_mask_sel
+                    new_selection_mask = selection_utils.calculate_selection_mask(
+                        cur_selection_mask, p.faces_mask_visin, mode
+                    )
+                    _write_selection(p.bm.faces, cur_selection_mask, new_selection_mask)
+                    p.snapshot.faces_mask_sel = new_selection_mask
+
+        with timer.time_section("Finalize", prefix=">> END\n"):
+            for p in passes:
+                if bpy.app.version >= (5, 0, 0):
+                    # Ignore current UV selection.
+                    p.bm.uv_select_sync_valid = False
+                # Flush face selection after selecting/deselecting edges and vertices.
+                p.bm.select_flush_mode()
+                assert isinstance(p.ob.data, bpy.types.Mesh)
+                geometry_versions.update_edit_mesh_selection(p.ob.data)
+
+                # Flushing the selection in a mixed selection mode may change the selection of other element types,
+                # so the selection tracked by the snapshot can't be reused.
+                if sum(mesh_select_mode) > 1:
+                    mesh_snapshot.discard_snapshot(p.ob)
+
+    except BaseException:
+        # Snapshots can be freed only after workers stop using them.
+        concurrent.futures.wait(futures)
+        for ob in obs:
+            mesh_snapshot.discard_snapshot(ob)
+        raise
+
+    finally:
+        mesh_snapshot.release_snapshots()
+        # Evaluate the selection updates now, so they don't invalidate the cached topology.
+        geometry_versions.apply_selection_updates(context)
+
+    # Keep projections only for objects that may be selected again.
+    projection_cache.retain(ob.name for ob in sel_obs)
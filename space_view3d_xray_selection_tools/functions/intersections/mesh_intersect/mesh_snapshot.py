@@ -0,0 +1,153 @@
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import bmesh
+import bpy
+
+from ....types import Bool1DArray, Float3DArray
+from ... import mesh_topology, timer
+from ...mesh_attr import edge_attr, poly_attr, vert_attr
+
+# Functions reading snapshot attributes from a mesh, by attribute name.
+_ATTRIBUTE_READERS: dict[str, Callable[[bpy.types.Mesh], Any]] = {
+    "vert_co_local": vert_attr.coordinates,
+    "verts_mask_vis": vert_attr.visibility_mask,
+    "vert_normal": vert_attr.normal_vector,
+    "verts_mask_sel": vert_attr.selection_mask,
+    "edges_mask_vis": edge_attr.visibility_mask,
+    "edges_mask_sel": edge_attr.selection_mask,
+    "face_center_co_local": poly_attr.center_coordinates,
+    "faces_mask_vis": poly_attr.visibility_mask,
+    "face_normal": poly_attr.normal_vector,
+    "faces_mask_sel": poly_attr.selection_mask,
+    "topology": mesh_topology.MeshTopology.from_mesh,
+}
+
+
+class MeshSnapshot:
+    """
+    Mesh data of an object in edit mode, read once and reused until the geometry changes.
+
+    Only the attributes requested with `load` are read, in bulk from an intermediate mesh that is removed right
+    after reading, so the snapshot holds just the arrays and no copy of the whole mesh.
+    The topology is shared with the topology cache and survives the snapshot until the mesh geometry is edited.
+    Selection masks are tracked in memory: after writing a new selection to the bmesh, the caller is expected to
+    assign the written mask back to the snapshot.
+    Other attributes don't change during the snapshot's lifetime and only change with the geometry, so the
+    signature of the edit mesh identifies them, also across snapshots.
+    """
+
+    # Vertices.
+    vert_co_local: Float3DArray
+    verts_mask_vis: Bool1DArray
+    vert_normal: Float3DArray
+    verts_mask_sel: Bool1DArray
+    # Edges.
+    edges_mask_vis: Bool1DArray
+    edges_mask_sel: Bool1DArray
+    # Faces.
+    face_center_co_local: Float3DArray
+    faces_mask_vis: Bool1DArray
+    face_normal: Float3DArray
+    faces_mask_sel: Bool1DArray
+    # Connectivity.
+    topology: mesh_topology.MeshTopology
+
+    def __init__(self, ob: bpy.types.Object, bm: bmesh.types.BMesh) -> None:
+        self.signature: tuple[int, ...] = mesh_topology.edit_mesh_signature(ob, bm)
+        self.element_counts: tuple[int, int, int] = (len(bm.verts), len(bm.edges), len(bm.faces))
+
+    def is_valid_for(self, bm: bmesh.types.BMesh) -> bool:
+        """Whether the snapshot still matches the geometry of the bmesh."""
+        return self.element_counts == (len(bm.verts), len(bm.edges), len(bm.faces))
+
+    def load(self, ob: bpy.types.Object, bm: bmesh.types.BMesh, names: Iterable[str]) -> None:
+        """Read the attributes with the given names, skipping the ones already read."""
+        missing_names = [name for name in names if name not in self.__dict__]
+
+        # Reuse the cached topology when the mesh geometry is unchanged.
+        topology_key = (ob.name, 'EDIT')
+        if "topology" in missing_names:
+            topology = mesh_topology.get_cached_topology(topology_key, self.signature)
+            if topology is not None:
+                self.topology = topology
+                missing_names.remove("topology")
+
+        if not missing_names:
+            return
+
+        with timer.time_section(f"Read {len(missing_names)} mesh attributes"):
+            # Reading element by element from the bmesh is much slower than converting it to a mesh and reading
+            # the mesh attributes in bulk.
+            if bpy.app.version >= (3, 4, 0):
+                me = bpy.data.meshes.new("xray_select_temp_mesh")
+                try:
+                    bm.to_mesh(me)
+                    for name in missing_names:
+                        setattr(self, name, _ATTRIBUTE_READERS[name](me))
+                finally:
+                    bpy.data.meshes.remove(me, do_unlink=True)
+            else:
+                assert isinstance(ob.data, bpy.types.Mesh)
+                ob.update_from_editmode()
+                for name in missing_names:
+                    setattr(self, name, _ATTRIBUTE_READERS[name](ob.data))
+
+        if "topology" in missing_names:
+            mesh_topology.cache_topology(topology_key, self.signature, self.topology)
+
+    def free(self) -> None:
+        """Drop the read attributes."""
+        self.__dict__.clear()
+
+
+# Snapshots by object name.
+_snapshots: dict[str, MeshSnapshot] = {}
+_is_stroke_active: bool = False
+
+
+def begin_stroke() -> None:
+    """
+    Keep snapshots alive between calls until `end_stroke` is called.
+
+    Used by tools that run many selections in a row on the same geometry, such as a circle selection drag.
+    """
+    global _is_stroke_active
+    _is_stroke_active = True
+
+
+def end_stroke() -> None:
+    """Free snapshots kept since `begin_stroke`."""
+    global _is_stroke_active
+    _is_stroke_active = False
+    release_snapshots()
+
+
+def get_snapshot(ob: bpy.types.Object, bm: bmesh.types.BMesh, names: Iterable[str]) -> MeshSnapshot:
+    """
+    Return a snapshot of the object's edit mesh with the given attributes read, reusing the one from the current
+    stroke when still valid.
+    """
+    snapshot = _snapshots.get(ob.name)
+    if snapshot is None or not snapshot.is_valid_for(bm):
+        discard_snapshot(ob)
+        snapshot = _snapshots[ob.name] = MeshSnapshot(ob, bm)
+
+    snapshot.load(ob, bm, names)
+    return snapshot
+
+
+def discard_snapshot(ob: bpy.types.Object) -> None:
+    """Free the snapshot of the object, so the next call reads the mesh again."""
+    snapshot = _snapshots.pop(ob.name, None)
+    if snapshot is not None:
+        snapshot.free()
+
+
+def release_snapshots() -> None:
+    """Free all snapshots unless a stroke is in progress."""
+    if _is_stroke_active:
+        return
+    for snapshot in _snapshots.values():
+        snapshot.free()
+    _snapshots.clear()
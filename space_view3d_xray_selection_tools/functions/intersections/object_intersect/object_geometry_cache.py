@@ -0,0 +1,269 @@
+import dataclasses
+from collections.abc import Hashable, Sequence
+
+import bmesh
+import bpy
+import numpy as np
+
+from ....types import Float3DArray, Int1DArray
+from ... import mesh_topology
+from ...mesh_attr import vert_attr
+from . import object_intersect_shared, vertex_tree
+
+# Upper bound for the total size in bytes of arrays held by cached geometries.
+_MAX_CACHE_SIZE = 512 << 20
+# Number of vertices below which all vertices stand in for the convex hull vertices.
+_MIN_HULL_INPUT_SIZE = 64
+# Number of vertices below which vertices are tested without a vertex tree.
+_MIN_TREE_VERT_COUNT = 1 << 15
+
+
+@dataclasses.dataclass
+class ObjectGeometry:
+    """
+    Local space vertex coordinates and topology of an evaluated object, read from a temporary mesh once and reused
+    by next selections until the object's geometry is updated.
+
+    Vertices of the 3D convex hull stand in for all vertices in tests against convex regions and in conservative
+    rejects. Topology and the convex hull aren't needed by every test, so they are read on first request.
+    Vertex trees of many vertices are built on first request too.
+    """
+
+    # Session UID of the original object data, to drop the geometry when the data is updated.
+    data_uid: int
+    vert_co_local: Float3DArray
+    topology: mesh_topology.MeshTopology | None = None
+    hull_vert_co_local: Float3DArray | None = None
+    # Vertex trees by id of the vertex coordinates they are built for.
+    vertex_trees: dict[int, vertex_tree.VertexTree] = dataclasses.field(default_factory=dict)
+
+    def get_vertex_tree(self, co_local: Float3DArray) -> vertex_tree.VertexTree | None:
+        """
+        Return the vertex tree of the given vertex coordinates of the geometry, building it on first request.
+
+        Returns:
+            The vertex tree, or `None` when there are too few vertices for the tree to pay off.
+        """
+        if co_local.shape[0] < _MIN_TREE_VERT_COUNT:
+            return None
+        tree = self.vertex_trees.get(id(co_local))
+        if tree is None:
+            tree = self.vertex_trees[id(co_local)] = vertex_tree.VertexTree(co_local)
+            _update_cache_size(self)
+        return tree
+
+    @property
+    def nbytes(self) -> int:
+        """Size in bytes of the arrays held by the geometry, including its topology and vertex trees."""
+        nbytes = self.vert_co_local.nbytes
+        if self.topology is not None:
+            nbytes += self.topology.nbytes
+        # Small meshes use all vertices as hull vertices.
+        if self.hull_vert_co_local is not None and self.hull_vert_co_local is not self.vert_co_local:
+            nbytes += self.hull_vert_co_local.nbytes
+        return nbytes + sum(tree.nbytes for tree in self.vertex_trees.values())
+
+
+def _read_hull_vert_co_local(me: bpy.types.Mesh, vert_co_local: Float3DArray) -> Float3DArray:
+    """
+    Local coordinates of mesh vertices that aren't inside the mesh's convex hull.
+
+    All vertices are returned for small meshes and when the hull can't be built.
+    """
+    if vert_co_local.shape[0] < _MIN_HULL_INPUT_SIZE:
+        return vert_co_local
+
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(me)
+        bm.verts.index_update()
+        try:
+            hull = bmesh.ops.convex_hull(bm, input=bm.verts[:], use_existing_faces=False)
+        except RuntimeError:
+            return vert_co_local
+        interior_vert_indices = [elem.index for elem in hull["geom_interior"] if isinstance(elem, bmesh.types.BMVert)]
+    finally:
+        bm.free()
+
+    if not interior_vert_indices:
+        return vert_co_local
+    verts_mask_hull = np.ones(vert_co_local.shape[0], "?")
+    verts_mask_hull[interior_vert_indices] = False
+    hull_vert_co_local = vert_co_local[verts_mask_hull]
+    hull_vert_co_local.flags.writeable = False
+    return hull_vert_co_local
+
+
+# Cached geometries by session UID of the original object, from the least to the most recently used.
+_geometries: dict[int, ObjectGeometry] = {}
+# Number of objects sharing each cached geometry, by geometry id.
+_geometry_user_counts: dict[int, int] = {}
+# Size in bytes counted for each cached geometry, by geometry id, and the total size of cached geometries.
+_geometry_sizes: dict[int, int] = {}
+_cache_size: int = 0
+
+
+def get_geometry(ob_eval: bpy.types.Object, with_topology: bool = False, with_hull: bool = False) -> ObjectGeometry:
+    """
+    Return the geometry of the evaluated object, converting the object to a mesh only if it isn't cached.
+
+    Args:
+        ob_eval: Evaluated object.
+        with_topology: Whether the topology is needed.
+        with_hull: Whether the convex hull vertices are needed.
+    """
+    ob = ob_eval.original
+    geometry = _geometries.get(ob.session_uid)
+
+    if (
+        geometry is None
+        or (with_topology and geometry.topology is None)
+        or (with_hull and geometry.hull_vert_co_local is None)
+    ):
+        with object_intersect_shared.managed_mesh(ob_eval) as me:
+            if geometry is None:
+                vert_co_local = vert_attr.coordinates(me)
+                vert_co_local.flags.writeable = False
+                geometry = ObjectGeometry(ob.data.session_uid, vert_co_local)
+            if with_topology and geometry.topology is None:
+                geometry.topology = mesh_topology.get_evaluated_topology(ob_eval, me)
+            if with_hull and geometry.hull_vert_co_local is None:
+                geometry.hull_vert_co_local = _read_hull_vert_co_local(me, geometry.vert_co_local)
+
+    _cache_geometry(ob, geometry)
+    return geometry
+
+
+def _cache_geometry(ob: bpy.types.Object, geometry: ObjectGeometry) -> None:
+    """Cache the geometry of the original object, dropping the least recently used ones when the cache is full."""
+    _drop_geometry(ob.session_uid)
+    _geometries[ob.session_uid] = geometry
+    # Geometries shared by linked duplicates are counted once.
+    user_count = _geometry_user_counts.get(id(geometry), 0)
+    if user_count == 0:
+        _geometry_sizes[id(geometry)] = 0
+    _geometry_user_counts[id(geometry)] = user_count + 1
+    _update_cache_size(geometry)
+
+
+def _update_cache_size(geometry: ObjectGeometry) -> None:
+    """
+    Count the current size of the geometry, if cached, since arrays are attached to it after it's cached.
+    Drop the least recently used geometries when the cache is full.
+    """
+    global _cache_size
+    counted_size = _geometry_sizes.get(id(geometry))
+    if counted_size is None:
+        return
+    size = geometry.nbytes
+    _geometry_sizes[id(geometry)] = size
+    _cache_size += size - counted_size
+
+    while _cache_size > _MAX_CACHE_SIZE and len(_geometries) > 1:
+        _drop_geometry(next(iter(_geometries)))
+
+
+def _drop_geometry(uid: int) -> None:
+    """Drop the cached geometry of the object with the given session UID, if any."""
+    global _cache_size
+    geometry = _geometries.pop(uid, None)
+    if geometry is None:
+        return
+    user_count = _geometry_user_counts.pop(id(geometry)) - 1
+    if user_count == 0:
+        _cache_size -= _geometry_sizes.pop(id(geometry))
+    else:
+        _geometry_user_counts[id(geometry)] = user_count
+
+
+def _geometry_key(ob_eval: bpy.types.Object) -> Hashable:
+    """
+    Identity of the evaluated geometry of the object.
+
+    Evaluated data of mesh objects is the mesh with modifiers applied, shared by linked duplicates without modifiers.
+    Geometry of other objects is evaluated per object, since their data doesn't include their modifiers.
+    """
+    if ob_eval.type == 'MESH':
+        return ('DATA', ob_eval.data.as_pointer())
+    return ('OBJECT', ob_eval.original.session_uid)
+
+
+def group_by_geometry(
+    obs_eval: Sequence[bpy.types.Object], with_topology: bool = False, with_hull: bool = False
+) -> list[tuple[ObjectGeometry, Int1DArray]]:
+    """
+    Group evaluated objects by their geometry, so geometry shared by linked duplicates is read and tested once.
+
+    Args:
+        obs_eval: Evaluated objects.
+        with_topology: Whether the topology is needed.
+        with_hull: Whether the convex hull vertices are needed.
+
+    Returns:
+        List of geometries and the indices of objects sharing them.
+    """
+    groups: dict[Hashable, tuple[ObjectGeometry, list[int]]] = {}
+    for i, ob_eval in enumerate(obs_eval):
+        key = _geometry_key(ob_eval)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = (get_geometry(ob_eval, with_topology, with_hull), [i])
+        else:
+            _cache_geometry(ob_eval.original, group[0])
+            group[1].append(i)
+    return [(geometry, np.array(indices, "i")) for geometry, indices in groups.values()]
+
+
+def clear() -> None:
+    """Drop all cached geometries."""
+    global _cache_size
+    _geometries.clear()
+    _geometry_user_counts.clear()
+    _geometry_sizes.clear()
+    _cache_size = 0
+
+
+@bpy.app.handlers.persistent
+def _drop_updated_geometries(_scene: bpy.types.Scene, depsgraph: bpy.types.Depsgraph) -> None:
+    """Drop geometries of objects whose geometry, or the geometry of whose data, was updated."""
+    if not _geometries:
+        return
+
+    updated_uids = {update.id.original.session_uid for update in depsgraph.updates if update.is_updated_geometry}
+    if not updated_uids:
+        return
+
+    for uid, geometry in list(_geometries.items()):
+        if uid in updated_uids or geometry.data_uid in updated_uids:
+            _drop_geometry(uid)
+
+
+@bpy.app.handlers.persistent
+def _drop_all_geometries(_scene: bpy.types.Scene, _depsgraph: bpy.types.Depsgraph | None = None) -> None:
+    """Drop all geometries, when the file is loaded, undo restores data or the frame changes."""
+    clear()
+
+
+_CLEARING_HANDLERS = (
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+    bpy.app.handlers.frame_change_post,
+)
+
+
+def register() -> None:
+    if _drop_updated_geometries not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_drop_updated_geometries)
+    for handlers in _CLEARING_HANDLERS:
+        if _drop_all_geometries not in handlers:
+            handlers.append(_drop_all_geometries)
+
+
+def unregister() -> None:
+    if _drop_updated_geometries in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_drop_updated_geometries)
+    for handlers in _CLEARING_HANDLERS:
+        if _drop_all_geometries in handlers:
+            handlers.remove(_drop_all_geometries)
+    clear()
@@ -7,25 +7,7 @@ import numpy as np
 
 from ....types import Bool1DArray
 from ... import geometry_tests
-from . import object_intersect_shared
-
-
-def _is_mesh_in_selbox(
-    ob_eval: bpy.types.Object,
-    me: bpy.types.Mesh,
-    region: bpy.types.Region,
-    rv3d: bpy.types.RegionView3D,
-    xmin: int,
-    xmax: int,
-    ymin: int,
-    ymax: int,
-) -> bool:
-    """
-    Determine whether all object data vertices lie fully within the selection region.
-    """
-    vert_co_2d = object_intersect_shared.get_vert_co_2d(me, ob_eval, region, rv3d)
-    verts_mask_in_selbox = geometry_tests.points_inside_rectangle(vert_co_2d, xmin, xmax, ymin, ymax)
-    return bool(np.all(verts_mask_in_selbox))
+from . import object_geometry_cache, object_intersect_shared
 
 
 def _get_obs_mask_in_selbox(
@@ -42,16 +24,31 @@ def _get_obs_mask_in_selbox(
     """
     Determine whether all object data vertices lie fully within the selection region.
     """
-    obs_to_check = compress(obs, obs_mask_check)
-    bools: list[bool] = []
-
-    for ob in obs_to_check:
-        ob_eval = ob.evaluated_get(depsgraph)
-        with object_intersect_shared.managed_mesh(ob_eval) as me:
-            res = _is_mesh_in_selbox(ob_eval, me, region, rv3d, xmin, xmax, ymin, ymax)
-        bools.append(res)
-
-    return np.fromiter(bools, "?", len(bools))
+    obs_eval = [ob.evaluated_get(depsgraph) for ob in compress(obs, obs_mask_check)]
+    bools = np.empty(len(obs_eval), "?")
+    region_tests = object_intersect_shared.RegionTests(
+        lambda co: geometry_tests.points_inside_rectangle(co, xmin, xmax, ymin, ymax),
+        lambda *rect: geometry_tests.classify_rectangles_against_rectangle(*rect, xmin, xmax, ymin, ymax),
+        center=((xmin + xmax) / 2, (ymin + ymax) / 2),
+    )
+
+    # Linked duplicates share the geometry, test them together.
+    for geometry, indices in object_geometry_cache.group_by_geometry(obs_eval, with_hull=True):
+        hull_vert_co_local = geometry.hull_vert_co_local
+        assert hull_vert_co_local is not None
+        group_obs_eval = [obs_eval[i] for i in indices]
+        # The selection region is convex, so all vertices lie inside it exactly when all convex hull vertices do.
+        bools[indices] = object_intersect_shared.get_obs_mask_verts_in_region(
+            hull_vert_co_local,
+            geometry.get_vertex_tree(hull_vert_co_local),
+            group_obs_eval,
+            region,
+            rv3d,
+            region_tests,
+            require_all=True,
+        )
+
+    return bools
 
 
 def select_objects_in_box(
@@ -5,35 +5,26 @@ from typing import Literal, cast
 import bpy
 import numpy as np
 
-from ....types import Bool1DArray
-from ... import geometry_tests
-from . import object_intersect_shared
+from ....types import Bool1DArray, Float2DArray
+from ... import geometry_tests, mesh_topology
+from . import object_geometry_cache, object_intersect_shared
 
 
 def _is_mesh_overlap_selcircle(
-    ob_eval: bpy.types.Object,
-    me: bpy.types.Mesh,
-    region: bpy.types.Region,
-    rv3d: bpy.types.RegionView3D,
+    topology: mesh_topology.MeshTopology,
+    vert_co_2d: Float2DArray,
     center: tuple[int, int],
     radius: int,
     check_faces: bool = False,
 ) -> bool:
     """
-    Determine whether object data vertices overlap the selection region.
+    Determine whether object data edges or faces overlap the selection region, when none of its vertices do.
 
     Args:
         check_faces: Check for existence of faces having the selection region inside their area.
     """
-    vert_co_2d = object_intersect_shared.get_vert_co_2d(me, ob_eval, region, rv3d)
-
-    # One of the vertices lies inside the selection region.
-    verts_mask_in_selcircle = geometry_tests.points_inside_circle(vert_co_2d, center, radius)
-    if np.any(verts_mask_in_selcircle):
-        return True
-
     # One of the edges intersects the selection region.
-    edge_vert_co_2d = object_intersect_shared.get_edge_vert_co_2d(me, vert_co_2d)
+    edge_vert_co_2d = object_intersect_shared.get_edge_vert_co_2d(topology, vert_co_2d)
     edges_mask_isect_selcircle = geometry_tests.segments_intersect_circle_prefiltered(edge_vert_co_2d, center, radius)
     if np.any(edges_mask_isect_selcircle):
         return True
@@ -41,7 +32,7 @@ def _is_mesh_overlap_selcircle(
     # One of the faces has a cursor inside their area.
     if check_faces:
         face_vert_co_2d, face_cell_starts, _face_cell_ends, face_loop_totals = (
-            object_intersect_shared.get_face_vert_co_2d(me, vert_co_2d)
+            object_intersect_shared.get_face_vert_co_2d(topology, vert_co_2d)
         )
         if face_loop_totals.size > 0:
             faces_mask_cursor_in = geometry_tests.point_inside_polygons_prefiltered(
@@ -69,32 +60,52 @@ def _get_obs_mask_overlap_selcircle(
     Args:
         check_faces: Check for existence of faces having the selection region inside their area.
     """
-    obs_to_check = compress(obs, obs_mask_check)
-    bools: list[bool] = []
-
-    for ob in obs_to_check:
-        ob_eval = ob.evaluated_get(depsgraph)
-        with object_intersect_shared.managed_mesh(ob_eval) as me:
-            res = _is_mesh_overlap_selcircle(ob_eval, me, region, rv3d, center, radius, check_faces)
-        bools.append(res)
+    obs_eval = [ob.evaluated_get(depsgraph) for ob in compress(obs, obs_mask_check)]
+    bools = np.zeros(len(obs_eval), "?")
+    region_tests = object_intersect_shared.RegionTests(
+        lambda co: geometry_tests.points_inside_circle(co, center, radius),
+        lambda *rect: geometry_tests.classify_rectangles_against_circle(*rect, center, radius),
+        center=center,
+    )
 
-    return np.fromiter(bools, "?", len(bools))
+    # Linked duplicates share the geometry, test their vertices together.
+    for geometry, indices in object_geometry_cache.group_by_geometry(obs_eval, with_topology=True, with_hull=True):
+        topology = geometry.topology
+        hull_vert_co_local = geometry.hull_vert_co_local
+        assert topology is not None and hull_vert_co_local is not None
+        group_obs_eval = [obs_eval[i] for i in indices]
+
+        # Objects with convex hull missing the selection region are rejected without testing all vertices.
+        if hull_vert_co_local.shape[0] < geometry.vert_co_local.shape[0]:
+            group_obs_mask_check = object_intersect_shared.get_obs_mask_hull_isect(
+                hull_vert_co_local,
+                group_obs_eval,
+                region,
+                rv3d,
+                lambda hull_co_2d: geometry_tests.polygon_intersect_circle(hull_co_2d, center, radius),
+            )
+            indices = indices[group_obs_mask_check]
+            group_obs_eval = list(compress(group_obs_eval, group_obs_mask_check))
+
+        # One of the vertices lies inside the selection region.
+        obs_mask_vert_in_selcircle = object_intersect_shared.get_obs_mask_verts_in_region(
+            geometry.vert_co_local,
+            geometry.get_vertex_tree(geometry.vert_co_local),
+            group_obs_eval,
+            region,
+            rv3d,
+            region_tests,
+            require_all=False,
+        )
+        bools[indices] = obs_mask_vert_in_selcircle
 
+        for i, ob_eval in zip(
+            indices[~obs_mask_vert_in_selcircle].tolist(), compress(group_obs_eval, ~obs_mask_vert_in_selcircle)
+        ):
+            vert_co_2d = object_intersect_shared.get_vert_co_2d(geometry.vert_co_local, ob_eval, region, rv3d)
+            bools[i] = _is_mesh_overlap_selcircle(topology, vert_co_2d, center, radius, check_faces)
 
-def _is_mesh_in_selcircle(
-    ob_eval: bpy.types.Object,
-    me: bpy.types.Mesh,
-    region: bpy.types.Region,
-    rv3d: bpy.types.RegionView3D,
-    center: tuple[int, int],
-    radius: int,
-) -> bool:
-    """
-    Determine whether all object data vertices lie fully within the selection region.
-    """
-    vert_co_2d = object_intersect_shared.get_vert_co_2d(me, ob_eval, region, rv3d)
-    verts_mask_in_selcircle = geometry_tests.points_inside_circle(vert_co_2d, center, radius)
-    return bool(np.all(verts_mask_in_selcircle))
+    return bools
 
 
 def _get_obs_mask_in_selcircle(
@@ -109,16 +120,31 @@ def _get_obs_mask_in_selcircle(
     """
     Determine whether all object data vertices lie fully within the selection region.
     """
-    obs_to_check = compress(obs, obs_mask_check)
-    bools: list[bool] = []
+    obs_eval = [ob.evaluated_get(depsgraph) for ob in compress(obs, obs_mask_check)]
+    bools = np.empty(len(obs_eval), "?")
+    region_tests = object_intersect_shared.RegionTests(
+        lambda co: geometry_tests.points_inside_circle(co, center, radius),
+        lambda *rect: geometry_tests.classify_rectangles_against_circle(*rect, center, radius),
+        center=center,
+    )
 
-    for ob in obs_to_check:
-        ob_eval = ob.evaluated_get(depsgraph)
-        with object_intersect_shared.managed_mesh(ob_eval) as me:
-            res = _is_mesh_in_selcircle(ob_eval, me, region, rv3d, center, radius)
-        bools.append(res)
+    # Linked duplicates share the geometry, test them together.
+    for geometry, indices in object_geometry_cache.group_by_geometry(obs_eval, with_hull=True):
+        hull_vert_co_local = geometry.hull_vert_co_local
+        assert hull_vert_co_local is not None
+        group_obs_eval = [obs_eval[i] for i in indices]
+        # The selection region is convex, so all vertices lie inside it exactly when all convex hull vertices do.
+        bools[indices] = object_intersect_shared.get_obs_mask_verts_in_region(
+            hull_vert_co_local,
+            geometry.get_vertex_tree(hull_vert_co_local),
+            group_obs_eval,
+            region,
+            rv3d,
+            region_tests,
+            require_all=True,
+        )
 
-    return np.fromiter(bools, "?", len(bools))
+    return bools
 
 
 def select_objects_in_circle(
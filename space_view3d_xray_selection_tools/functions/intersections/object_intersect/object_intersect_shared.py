@@ -1,16 +1,54 @@
 import contextlib
+import dataclasses
 import itertools
 import operator
 from collections.abc import Callable, Generator, Iterable, Sequence
 from typing import Any, Literal, cast
 
 import bpy
+import mathutils
 import numpy as np
 
-from ....types import Bool1DArray, Float1DArray, Float2DArray, Float2x2DArray, Float3DArray, Int1DArray
-from ... import view3d_utils
-from ...mesh_attr import edge_attr, loop_attr, poly_attr, vert_attr
+from ....types import (
+    Bool1DArray,
+    BoolNxMArray,
+    Float1DArray,
+    Float2DArray,
+    Float2x2DArray,
+    Float3DArray,
+    Float4x4DArray,
+    FloatNx2DArray,
+    Int1DArray,
+)
+from ... import mesh_topology, view3d_utils
 from .. import selection_utils
+from . import vertex_tree
+
+# Upper bound for the number of vertices of object instances projected at once.
+_MAX_BATCH_VERT_COUNT = 1 << 20
+# Padding in pixels of projected bounding boxes of vertex tree nodes, covers rounding in projections of vertices.
+_TREE_NODE_PADDING = 0.5
+# Number of vertex chunks crossing the selection region boundary tested first, doubled for each next test.
+_FIRST_STREAM_CHUNK_COUNT = 1
+
+
+@dataclasses.dataclass(frozen=True)
+class RegionTests:
+    """
+    Tests of 2D points and rectangles against the selection region.
+
+    Attributes:
+        points_inside: Mask of points inside the region.
+        classify_rectangles: Masks of rectangles, given by minimum and maximum x and y coordinates, entirely
+            outside and entirely inside the region.
+        center: Coordinates (x, y) of the region center, vertices near it are tested first.
+    """
+
+    points_inside: Callable[[Float2DArray], Bool1DArray]
+    classify_rectangles: Callable[
+        [Float1DArray, Float1DArray, Float1DArray, Float1DArray], tuple[Bool1DArray, Bool1DArray]
+    ]
+    center: tuple[float, float]
 
 
 @contextlib.contextmanager
@@ -33,41 +71,55 @@ def partition(items: Iterable[Any], predicate: Callable[[Any], bool] = bool) ->
     return a, b
 
 
-def get_ob_2dbboxes(
-    mesh_obs: Sequence[bpy.types.Object], mesh_ob_count: int, region: bpy.types.Region, rv3d: bpy.types.RegionView3D
-) -> tuple[Float1DArray, Float1DArray, Float1DArray, Float1DArray, Float2DArray, Float2x2DArray, Bool1DArray]:
+def get_ob_3dbbox_co_2d(
+    obs: Sequence[bpy.types.Object], ob_count: int, region: bpy.types.Region, rv3d: bpy.types.RegionView3D
+) -> tuple[FloatNx2DArray, BoolNxMArray]:
     """
-    Get coordinates of object's 2D bounding boxes.
+    Get 2D coordinates of corners of object's 3D bounding boxes, projected in one batch.
 
     Returns:
-         - Minimum x-coordinates of the bounding box.
-         - Maximum x-coordinates of the bounding box.
-         - Minimum y-coordinates of the bounding box.
-         - Maximum y-coordinates of the bounding box.
-         - Coordinates of the bounding box points, where each row represents (x, y).
-         - Coordinates of the bounding box segments, where each segment is ((x1, y1), (x2, y2)).
-         - Clipping mask (`np.True` for objects with bounding box entirely clipped, `np.False` otherwise).
+         - Nx8x2 array of 2D coordinates of bounding box corners, clipped corners are left unchanged.
+         - Nx8 clipping mask of bounding box corners (`np.True` for clipped corners, `np.False` otherwise).
     """
-    ob_3dbboxes = map(operator.attrgetter("bound_box"), mesh_obs)
+    ob_3dbboxes = map(operator.attrgetter("bound_box"), obs)
     ob_3dbboxes_flat = itertools.chain.from_iterable(itertools.chain.from_iterable(ob_3dbboxes))
-    ob_3dbbox_co_local = np.fromiter(ob_3dbboxes_flat, "f", mesh_ob_count * 24)
-    ob_3dbbox_co_local.shape = (mesh_ob_count, 8, 3)
+    ob_3dbbox_co_local = np.fromiter(ob_3dbboxes_flat, "f", ob_count * 24)
+    ob_3dbbox_co_local.shape = (ob_count, 8, 3)
 
     # Get object matrices.
-    ob_mats = map(operator.attrgetter("matrix_world"), mesh_obs)
+    ob_mats = map(operator.attrgetter("matrix_world"), obs)
     ob_mats_flat = itertools.chain.from_iterable(itertools.chain.from_iterable(ob_mats))
-    ob_mats = np.fromiter(ob_mats_flat, "f", mesh_ob_count * 16)
-    ob_mats.shape = (mesh_ob_count, 4, 4)
+    ob_mats = np.fromiter(ob_mats_flat, "f", ob_count * 16)
+    ob_mats.shape = (ob_count, 4, 4)
 
     # Get world space coordinates of 3D object bounding boxes.
     ob_3dbbox_co_world = view3d_utils.batch_transform_local_to_world_co(ob_mats, ob_3dbbox_co_local)
 
     # Get 2D coordinates of 3D object bounding boxes.
     ob_3dbbox_co_2d, ob_3dbbox_co_2d_mask_clip = view3d_utils.transform_world_to_2d_co(
-        region, rv3d, cast(Float3DArray, ob_3dbbox_co_world.reshape(mesh_ob_count * 8, 3)), apply_clipping_mask=False
+        region, rv3d, cast(Float3DArray, ob_3dbbox_co_world.reshape(ob_count * 8, 3)), apply_clipping_mask=False
     )
-    ob_3dbbox_co_2d.shape = (mesh_ob_count, 8, 2)
-    ob_3dbbox_co_2d_mask_clip.shape = (mesh_ob_count, 8)
+    ob_3dbbox_co_2d.shape = (ob_count, 8, 2)
+    ob_3dbbox_co_2d_mask_clip.shape = (ob_count, 8)
+    return cast(FloatNx2DArray, ob_3dbbox_co_2d), cast(BoolNxMArray, ob_3dbbox_co_2d_mask_clip)
+
+
+def get_ob_2dbboxes(
+    mesh_obs: Sequence[bpy.types.Object], mesh_ob_count: int, region: bpy.types.Region, rv3d: bpy.types.RegionView3D
+) -> tuple[Float1DArray, Float1DArray, Float1DArray, Float1DArray, Float2DArray, Float2x2DArray, Bool1DArray]:
+    """
+    Get coordinates of object's 2D bounding boxes.
+
+    Returns:
+         - Minimum x-coordinates of the bounding box.
+         - Maximum x-coordinates of the bounding box.
+         - Minimum y-coordinates of the bounding box.
+         - Maximum y-coordinates of the bounding box.
+         - Coordinates of the bounding box points, where each row represents (x, y).
+         - Coordinates of the bounding box segments, where each segment is ((x1, y1), (x2, y2)).
+         - Clipping mask (`np.True` for objects with bounding box entirely clipped, `np.False` otherwise).
+    """
+    ob_3dbbox_co_2d, ob_3dbbox_co_2d_mask_clip = get_ob_3dbbox_co_2d(mesh_obs, mesh_ob_count, region, rv3d)
 
     # Get min max 2D coordinates.
     x = ob_3dbbox_co_2d[:, :, 0]
@@ -130,49 +182,241 @@ def get_ob_2dbboxes(
 
 
 def get_vert_co_2d(
-    me: bpy.types.Mesh, ob: bpy.types.Object, region: bpy.types.Region, rv3d: bpy.types.RegionView3D
+    vert_co_local: Float3DArray, ob: bpy.types.Object, region: bpy.types.Region, rv3d: bpy.types.RegionView3D
 ) -> Float2DArray:
     """2D coordinates of mesh vertices."""
+    vert_co_2d = view3d_utils.transform_local_to_2d_co(region, rv3d, ob.matrix_world, vert_co_local)[0]
+    return vert_co_2d
 
-    # Get local coordinates of vertices.
-    vert_co_local = vert_attr.coordinates(me)
 
-    # Get 2d coordinates of vertices.
-    vert_co_world = view3d_utils.transform_local_to_world_co(ob.matrix_world, vert_co_local)
-    vert_co_2d = view3d_utils.transform_world_to_2d_co(region, rv3d, vert_co_world)[0]
-    return vert_co_2d
+def iter_instances_vert_co_2d(
+    vert_co_local: Float3DArray,
+    obs: Sequence[bpy.types.Object],
+    region: bpy.types.Region,
+    rv3d: bpy.types.RegionView3D,
+) -> Generator[tuple[slice, FloatNx2DArray], Any]:
+    """
+    2D coordinates of vertices of objects sharing the same mesh, projected with each object's matrix in batches.
 
+    Yields:
+        - Slice of the objects in the batch.
+        - MxNx2 array of 2D coordinates of vertices of each object in the batch, `np.nan` for clipped values.
+    """
+    ob_count = len(obs)
+    if ob_count == 1:
+        yield slice(0, 1), cast(FloatNx2DArray, get_vert_co_2d(vert_co_local, obs[0], region, rv3d)[np.newaxis])
+        return
+
+    vert_count = vert_co_local.shape[0]
+    batch_size = max(_MAX_BATCH_VERT_COUNT // max(vert_count, 1), 1)
+    for start in range(0, ob_count, batch_size):
+        batch = slice(start, min(start + batch_size, ob_count))
+        batch_obs = obs[batch]
+        batch_ob_count = len(batch_obs)
+
+        # Get object matrices.
+        ob_mats = map(operator.attrgetter("matrix_world"), batch_obs)
+        ob_mats_flat = itertools.chain.from_iterable(itertools.chain.from_iterable(ob_mats))
+        ob_mats = cast(
+            Float4x4DArray, np.fromiter(ob_mats_flat, "f", batch_ob_count * 16).reshape(batch_ob_count, 4, 4)
+        )
 
-def get_edge_vert_co_2d(me: bpy.types.Mesh, vert_co_2d: Float2DArray) -> Float2x2DArray:
-    """2D coordinates of mesh edges."""
+        # Get world space coordinates of vertices of all objects in the batch, then their 2D coordinates.
+        vert_co_world = view3d_utils.batch_transform_local_to_world_co(ob_mats, vert_co_local[np.newaxis])
+        vert_co_2d = view3d_utils.transform_world_to_2d_co(
+            region, rv3d, cast(Float3DArray, vert_co_world.reshape(batch_ob_count * vert_count, 3))
+        )[0]
+        yield batch, cast(FloatNx2DArray, vert_co_2d.reshape(batch_ob_count, vert_count, 2))
+
+
+def _classify_vertex_chunks(
+    tree: vertex_tree.VertexTree,
+    ob: bpy.types.Object,
+    region: bpy.types.Region,
+    rv3d: bpy.types.RegionView3D,
+    region_tests: RegionTests,
+) -> tuple[Bool1DArray, Bool1DArray, Float1DArray]:
+    """
+    Classify vertex chunks of the object against the selection region by projected bounds of the tree nodes.
+
+    Nodes entirely outside or inside the region decide all their chunks, only nodes crossing the region boundary
+    are descended into. Nodes with clipped bounding box corners are never decided.
 
-    # For each edge get 2 indices of its vertices.
-    edge_vert_indices = edge_attr.vertex_indices(me)
+    Returns:
+        - Mask of chunks entirely outside the region.
+        - Mask of chunks entirely inside the region.
+        - Distances from centers of projected chunk bounds to the region center, infinite for decided chunks and
+          chunks with clipped bounds.
+    """
+    chunks_mask_out = np.zeros(tree.chunk_count, "?")
+    chunks_mask_in = np.zeros(tree.chunk_count, "?")
+    chunks_distance = np.full(tree.chunk_count, np.inf, "f")
+    node_indices = np.zeros(1, "i")
+
+    for height, (nodes_bbox_min, nodes_bbox_max) in zip(range(tree.height, -1, -1), tree.levels):
+        # Get 2D coordinates of bounding box corners of the nodes.
+        bbox_min = nodes_bbox_min[node_indices]
+        bbox_max = nodes_bbox_max[node_indices]
+        node_count = node_indices.size
+        corner_co_local = np.empty((node_count, 8, 3), "f")
+        for corner, (use_max_x, use_max_y, use_max_z) in enumerate(itertools.product((False, True), repeat=3)):
+            corner_co_local[:, corner, 0] = (bbox_max if use_max_x else bbox_min)[:, 0]
+            corner_co_local[:, corner, 1] = (bbox_max if use_max_y else bbox_min)[:, 1]
+            corner_co_local[:, corner, 2] = (bbox_max if use_max_z else bbox_min)[:, 2]
+        corner_co_2d, corner_co_2d_mask_clip = view3d_utils.transform_local_to_2d_co(
+            region, rv3d, ob.matrix_world, cast(Float3DArray, corner_co_local.reshape(node_count * 8, 3))
+        )
+        corner_co_2d.shape = (node_count, 8, 2)
+
+        # Projected nodes lie within the bounding boxes of their projected corners.
+        nodes_mask_clip = np.any(corner_co_2d_mask_clip.reshape(node_count, 8), axis=1)
+        corner_co_2d[nodes_mask_clip] = 0
+        rect_xmin = np.amin(corner_co_2d[:, :, 0], axis=1) - _TREE_NODE_PADDING
+        rect_xmax = np.amax(corner_co_2d[:, :, 0], axis=1) + _TREE_NODE_PADDING
+        rect_ymin = np.amin(corner_co_2d[:, :, 1], axis=1) - _TREE_NODE_PADDING
+        rect_ymax = np.amax(corner_co_2d[:, :, 1], axis=1) + _TREE_NODE_PADDING
+        nodes_mask_out, nodes_mask_in = region_tests.classify_rectangles(rect_xmin, rect_xmax, rect_ymin, rect_ymax)
+        nodes_mask_out &= ~nodes_mask_clip
+        nodes_mask_in &= ~nodes_mask_clip
+
+        for chunks_mask, nodes_mask in ((chunks_mask_out, nodes_mask_out), (chunks_mask_in, nodes_mask_in)):
+            for node_index in node_indices[nodes_mask].tolist():
+                chunks_mask[node_index << height : (node_index + 1) << height] = True
+
+        # Measure proximity of chunks crossing the region boundary to the region center.
+        if height == 0:
+            nodes_mask_measure = ~nodes_mask_out & ~nodes_mask_in & ~nodes_mask_clip
+            center_x, center_y = region_tests.center
+            chunks_distance[node_indices[nodes_mask_measure]] = np.hypot(
+                (rect_xmin[nodes_mask_measure] + rect_xmax[nodes_mask_measure]) / 2 - center_x,
+                (rect_ymin[nodes_mask_measure] + rect_ymax[nodes_mask_measure]) / 2 - center_y,
+            )
+
+        # Descend into nodes crossing the region boundary.
+        elif height > 0:
+            crossing_node_indices = node_indices[~nodes_mask_out & ~nodes_mask_in]
+            child_count = tree.levels[tree.height - height + 1][0].shape[0]
+            node_indices = np.concatenate((crossing_node_indices * 2, crossing_node_indices * 2 + 1))
+            node_indices = np.sort(node_indices[node_indices < child_count])
+
+    return chunks_mask_out, chunks_mask_in, chunks_distance
+
+
+def get_obs_mask_verts_in_region(
+    vert_co_local: Float3DArray,
+    tree: vertex_tree.VertexTree | None,
+    obs: Sequence[bpy.types.Object],
+    region: bpy.types.Region,
+    rv3d: bpy.types.RegionView3D,
+    region_tests: RegionTests,
+    require_all: bool,
+) -> Bool1DArray:
+    """
+    Determine whether all or any of the given vertices of objects sharing the same mesh lie inside the selection region.
+
+    Without a vertex tree, vertices of all objects are projected and tested in batches. With a vertex tree, chunks of
+    vertices of each object are classified against the region by their projected bounds first, and only vertices of
+    chunks crossing the region boundary are projected and tested. Those chunks are tested in growing batches, from
+    the ones most likely to decide the result, until a vertex inside the region is found when any vertex is
+    required, or a vertex outside of it when all vertices are.
+
+    Args:
+        vert_co_local: Local coordinates of the vertices.
+        tree: Vertex tree of the vertices, if they are many.
+        obs: Objects sharing the mesh.
+        region: Region of the 3D viewport.
+        rv3d: 3D region data.
+        region_tests: Tests against the selection region.
+        require_all: Whether all vertices must lie inside the region, otherwise any vertex.
+    """
+    obs_mask_in = np.empty(len(obs), "?")
+    reduce = np.all if require_all else np.any
+
+    if tree is None:
+        for batch, vert_co_2d in iter_instances_vert_co_2d(vert_co_local, obs, region, rv3d):
+            verts_mask_in = region_tests.points_inside(cast(Float2DArray, vert_co_2d.reshape(-1, 2)))
+            obs_mask_in[batch] = reduce(verts_mask_in.reshape(vert_co_2d.shape[:2]), axis=1)
+        return obs_mask_in
+
+    for i, ob in enumerate(obs):
+        chunks_mask_out, chunks_mask_in, chunks_distance = _classify_vertex_chunks(tree, ob, region, rv3d, region_tests)
+        # A chunk entirely outside the region, or entirely inside it, decides the result.
+        if np.any(chunks_mask_out if require_all else chunks_mask_in):
+            obs_mask_in[i] = not require_all
+            continue
+
+        # Chunks near the region center likely have vertices inside the region, distant chunks and chunks with
+        # clipped bounds likely have vertices outside of it.
+        crossing_chunk_indices = np.flatnonzero(~chunks_mask_out & ~chunks_mask_in)
+        crossing_chunks_distance = chunks_distance[crossing_chunk_indices]
+        crossing_chunk_indices = crossing_chunk_indices[
+            np.argsort(-crossing_chunks_distance if require_all else crossing_chunks_distance, kind="stable")
+        ]
+
+        obs_mask_in[i] = require_all
+        start = 0
+        stream_chunk_count = _FIRST_STREAM_CHUNK_COUNT
+        while start < crossing_chunk_indices.size:
+            stream_chunk_indices = cast(Int1DArray, crossing_chunk_indices[start : start + stream_chunk_count])
+            stream_vert_co_2d = get_vert_co_2d(tree.chunks_co_local(stream_chunk_indices), ob, region, rv3d)
+            if reduce(region_tests.points_inside(stream_vert_co_2d)) != require_all:
+                obs_mask_in[i] = not require_all
+                break
+            start += stream_chunk_count
+            stream_chunk_count *= 2
+    return obs_mask_in
+
+
+def get_convex_hull_2d(co_2d: Float2DArray) -> Float2DArray:
+    """Vertices of the 2D convex hull of the points, in order."""
+    hull_indices = mathutils.geometry.convex_hull_2d(co_2d.tolist())
+    return co_2d[hull_indices]
+
+
+def get_obs_mask_hull_isect(
+    hull_vert_co_local: Float3DArray,
+    obs: Sequence[bpy.types.Object],
+    region: bpy.types.Region,
+    rv3d: bpy.types.RegionView3D,
+    hull_isect_region: Callable[[Float2DArray], bool],
+) -> Bool1DArray:
+    """
+    Determine whether projected convex hulls of objects sharing the same mesh may intersect the selection region.
+
+    A projected mesh lies within the 2D convex hull of its projected 3D convex hull vertices, so objects whose hull
+    misses the selection region don't overlap it. Objects with clipped hull vertices aren't rejected.
+
+    Args:
+        hull_vert_co_local: Local coordinates of vertices of the convex hull of the shared mesh.
+        obs: Objects sharing the mesh.
+        region: Region of the 3D viewport.
+        rv3d: 3D region data.
+        hull_isect_region: Test of a 2D convex hull against the selection region.
+    """
+    obs_mask_isect = np.ones(len(obs), "?")
+    for batch, hull_vert_co_2d in iter_instances_vert_co_2d(hull_vert_co_local, obs, region, rv3d):
+        for i, ob_hull_vert_co_2d in enumerate(hull_vert_co_2d, batch.start):
+            if not np.isnan(ob_hull_vert_co_2d).any():
+                obs_mask_isect[i] = hull_isect_region(get_convex_hull_2d(ob_hull_vert_co_2d))
+    return obs_mask_isect
+
+
+def get_edge_vert_co_2d(topology: mesh_topology.MeshTopology, vert_co_2d: Float2DArray) -> Float2x2DArray:
+    """2D coordinates of mesh edges."""
 
     # For each edge get 2 coordinates of its vertices.
-    edge_vert_co_2d = vert_co_2d[edge_vert_indices]
+    edge_vert_co_2d = vert_co_2d[topology.edge_vert_indices]
     return edge_vert_co_2d
 
 
 def get_face_vert_co_2d(
-    me: bpy.types.Mesh, vert_co_2d: Float2DArray
+    topology: mesh_topology.MeshTopology, vert_co_2d: Float2DArray
 ) -> tuple[Float2DArray, Int1DArray, Int1DArray, Int1DArray]:
     """2D coordinates of mesh faces."""
 
-    # Number of vertices for each face.
-    face_loop_totals = poly_attr.vertex_count(me)
-
-    # Sequence of faces vertices.
-    face_vert_indices = loop_attr.vertex_indices(me)
-
     # Coordinates of faces vertices.
-    face_vert_co_2d = vert_co_2d[face_vert_indices]
-    # Index of first face vertex in a face vertex sequence.
-    cumsum: Int1DArray = face_loop_totals.cumsum()
-    face_cell_starts = np.insert(cumsum[:-1], 0, 0)
-    # Index of last face vertex in a face vertex sequence.
-    face_cell_ends = np.subtract(cumsum, 1)
-    return face_vert_co_2d, face_cell_starts, face_cell_ends, face_loop_totals
+    face_vert_co_2d = vert_co_2d[topology.loop_vert_indices]
+    return face_vert_co_2d, topology.face_cell_starts, topology.face_cell_ends, topology.face_loop_totals
 
 
 def get_ob_loc_co_2d(
@@ -0,0 +1,75 @@
+from typing import cast
+
+import numpy as np
+
+from ....types import Float3DArray, Int1DArray
+
+# Number of vertices per chunk.
+CHUNK_SIZE = 1024
+
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    """Insert two zero bits between each of the lower 10 bits of the values."""
+    values = values & 0x3FF
+    values = (values | (values << 16)) & 0x030000FF
+    values = (values | (values << 8)) & 0x0300F00F
+    values = (values | (values << 4)) & 0x030C30C3
+    values = (values | (values << 2)) & 0x09249249
+    return values
+
+
+class VertexTree:
+    """
+    Hierarchy of object space axis-aligned bounding boxes of vertex chunks.
+
+    Vertices are ordered along a Morton curve and split into chunks of `CHUNK_SIZE` consecutive vertices, so
+    chunks are spatially compact. The chunks are the lowest level of the hierarchy, and each level above bounds
+    pairs of nodes of the level below, up to a single root. Node `i` of a level covers nodes `2 * i` and
+    `2 * i + 1` of the level below, and chunks `i << height:(i + 1) << height`.
+    """
+
+    def __init__(self, co_local: Float3DArray) -> None:
+        self.co_local = co_local
+        vert_count = co_local.shape[0]
+
+        # Order vertices along a Morton curve over their bounding box.
+        bbox_min = np.amin(co_local, axis=0)
+        bbox_size = np.amax(co_local, axis=0) - bbox_min
+        bbox_size[bbox_size == 0] = 1
+        cells = ((co_local - bbox_min) / bbox_size * 1023).astype(np.uint32)
+        codes = _spread_bits(cells[:, 0]) | (_spread_bits(cells[:, 1]) << 1) | (_spread_bits(cells[:, 2]) << 2)
+        self.vert_order = cast(Int1DArray, np.argsort(codes, kind="stable").astype("i"))
+
+        # Bounding boxes of chunks, then of pairs of nodes up to the root.
+        ordered_co_local = co_local[self.vert_order]
+        chunk_starts = np.arange(0, vert_count, CHUNK_SIZE)
+        nodes_bbox_min = np.minimum.reduceat(ordered_co_local, chunk_starts, axis=0)
+        nodes_bbox_max = np.maximum.reduceat(ordered_co_local, chunk_starts, axis=0)
+        levels = [(nodes_bbox_min, nodes_bbox_max)]
+        while nodes_bbox_min.shape[0] > 1:
+            pair_starts = np.arange(0, nodes_bbox_min.shape[0], 2)
+            nodes_bbox_min = np.minimum.reduceat(nodes_bbox_min, pair_starts, axis=0)
+            nodes_bbox_max = np.maximum.reduceat(nodes_bbox_max, pair_starts, axis=0)
+            levels.append((nodes_bbox_min, nodes_bbox_max))
+
+        self.chunk_count = chunk_starts.size
+        # Minimum and maximum corners of node bounding boxes by level, from the root to the chunks.
+        self.levels: list[tuple[Float3DArray, Float3DArray]] = levels[::-1]
+
+    @property
+    def height(self) -> int:
+        """Number of levels above the chunks."""
+        return len(self.levels) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the tree arrays in bytes, without the vertex coordinates."""
+        return self.vert_order.nbytes + sum(bbox_min.nbytes + bbox_max.nbytes for bbox_min, bbox_max in self.levels)
+
+    def chunks_co_local(self, chunk_indices: Int1DArray) -> Float3DArray:
+        """Local coordinates of vertices of the given chunks."""
+        vert_count = self.co_local.shape[0]
+        starts = chunk_indices.astype(np.intp) * CHUNK_SIZE
+        counts = np.minimum(starts + CHUNK_SIZE, vert_count) - starts
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return cast(Float3DArray, self.co_local[self.vert_order[np.repeat(starts, counts) + offsets]])
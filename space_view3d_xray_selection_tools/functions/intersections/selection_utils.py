@@ -33,3 +33,29 @@ def calculate_selection_mask(
             new_selection_mask = cur_selection_mask & inside_mask
 
     return new_selection_mask
+
+
+def get_undecided_mask(
+    cur_selection_mask: Bool1DArray, mode: Literal['SET', 'ADD', 'SUB', 'XOR', 'AND']
+) -> Bool1DArray | None:
+    """
+    Get a mask of elements whose selection may still change in the given mode.
+
+    Elements already selected in ADD mode, or already deselected in SUB mode, keep their selection whatever
+    the test result, so they don't need testing. During a stroke, the current selection accumulates the results
+    of the previous samples, so each sample only tests elements not decided by them.
+
+    Args:
+        cur_selection_mask: Current selection state of elements.
+        mode: Tool selection mode.
+
+    Returns:
+        The mask of undecided elements, or `None` if the selection of any element may change.
+    """
+    match mode:
+        case 'ADD':
+            return ~cur_selection_mask
+        case 'SUB':
+            return cur_selection_mask
+        case _:
+            return None
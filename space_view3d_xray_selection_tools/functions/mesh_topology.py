@@ -0,0 +1,176 @@
+import functools
+import itertools
+from collections.abc import Hashable
+
+import bmesh
+import bpy
+import numpy as np
+
+from ..types import Int1DArray, Int2DArray
+from . import geometry_versions
+from .mesh_attr import edge_attr, loop_attr, poly_attr
+
+# Upper bound for the total size in bytes of cached topology arrays.
+_MAX_CACHE_SIZE = 512 << 20
+
+
+class MeshTopology:
+    """
+    Immutable connectivity of a mesh: edge vertices, face loops in CSR form and loop vertices and edges.
+
+    Loops of the face `i` are `face_cell_starts[i]:face_cell_ends[i] + 1`. Derived arrays are computed on
+    first access and cached together with the topology.
+    """
+
+    def __init__(
+        self,
+        edge_vert_indices: Int2DArray,
+        face_loop_totals: Int1DArray,
+        loop_vert_indices: Int1DArray,
+        loop_edge_indices: Int1DArray,
+    ) -> None:
+        for array in (edge_vert_indices, face_loop_totals, loop_vert_indices, loop_edge_indices):
+            array.flags.writeable = False
+        self.edge_vert_indices = edge_vert_indices
+        self.face_loop_totals = face_loop_totals
+        self.loop_vert_indices = loop_vert_indices
+        self.loop_edge_indices = loop_edge_indices
+
+    @classmethod
+    def from_mesh(cls, me: bpy.types.Mesh) -> "MeshTopology":
+        """Read the topology of a mesh."""
+        return cls(
+            edge_attr.vertex_indices(me),
+            poly_attr.vertex_count(me),
+            loop_attr.vertex_indices(me),
+            loop_attr.edge_indices(me),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the topology arrays in bytes."""
+        arrays = itertools.chain.from_iterable(
+            value if isinstance(value, tuple) else (value,) for value in self.__dict__.values()
+        )
+        return sum(array.nbytes for array in arrays if isinstance(array, np.ndarray))
+
+    @functools.cached_property
+    def face_cell_starts(self) -> Int1DArray:
+        """Index of the first loop of each face."""
+        face_cell_starts = np.cumsum(self.face_loop_totals) - self.face_loop_totals
+        face_cell_starts.flags.writeable = False
+        return face_cell_starts
+
+    @functools.cached_property
+    def face_cell_ends(self) -> Int1DArray:
+        """Index of the last loop of each face."""
+        face_cell_ends = np.cumsum(self.face_loop_totals) - 1
+        face_cell_ends.flags.writeable = False
+        return face_cell_ends
+
+    @functools.cached_property
+    def loop_face_indices(self) -> Int1DArray:
+        """Index of the face of each loop."""
+        loop_face_indices = np.repeat(np.arange(self.face_loop_totals.size, dtype="i"), self.face_loop_totals)
+        loop_face_indices.flags.writeable = False
+        return loop_face_indices
+
+    @functools.cached_property
+    def _edge_face_table(self) -> tuple[Int1DArray, Int1DArray, Int1DArray]:
+        # Faces of the edge `i` are `edge_faces[edge_face_starts[i]:edge_face_starts[i] + edge_face_counts[i]]`.
+        order = np.argsort(self.loop_edge_indices, kind="stable")
+        edge_faces = self.loop_face_indices[order]
+        edge_face_counts = np.bincount(self.loop_edge_indices, minlength=self.edge_vert_indices.shape[0])
+        edge_face_starts = np.cumsum(edge_face_counts) - edge_face_counts
+        return edge_faces, edge_face_starts, edge_face_counts
+
+    def get_edge_faces(self, edge_indices: Int1DArray) -> Int1DArray:
+        """
+        Get indices of faces using the given edges.
+
+        A face is listed once for each of its edges among the given ones.
+        """
+        edge_faces, edge_face_starts, edge_face_counts = self._edge_face_table
+        counts = edge_face_counts[edge_indices]
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return edge_faces[np.repeat(edge_face_starts[edge_indices], counts) + offsets]
+
+
+# Cached topologies and signatures of the meshes they were read from, by key, from the least to the most recently
+# used.
+_topologies: dict[Hashable, tuple[tuple[int, ...], MeshTopology]] = {}
+
+
+def edit_mesh_signature(ob: bpy.types.Object, bm: bmesh.types.BMesh) -> tuple[int, ...]:
+    """
+    Cheap signature of the edit mesh geometry: the mesh, its element counts and the version of its geometry.
+
+    The version changes on every geometry edit, so data read after any edit, including ones keeping the element
+    counts, has a different signature.
+    """
+    assert isinstance(ob.data, bpy.types.Mesh)
+    me = ob.data
+    return me.session_uid, len(bm.verts), len(bm.edges), len(bm.faces), geometry_versions.get_version(me)
+
+
+def get_cached_topology(key: Hashable, signature: tuple[int, ...]) -> MeshTopology | None:
+    """Return the cached topology if its signature matches."""
+    cached = _topologies.pop(key, None)
+    if cached is None or cached[0] != signature:
+        return None
+    _topologies[key] = cached
+    return cached[1]
+
+
+def cache_topology(key: Hashable, signature: tuple[int, ...], topology: MeshTopology) -> None:
+    """Cache the topology, dropping the least recently used ones when the cache is full."""
+    _topologies.pop(key, None)
+    _topologies[key] = (signature, topology)
+    cache_size = sum(cached_topology.nbytes for _, cached_topology in _topologies.values())
+    while cache_size > _MAX_CACHE_SIZE and len(_topologies) > 1:
+        oldest_key = next(iter(_topologies))
+        cache_size -= _topologies.pop(oldest_key)[1].nbytes
+
+
+def get_evaluated_topology(ob_eval: bpy.types.Object, me: bpy.types.Mesh) -> MeshTopology:
+    """
+    Return the topology of the mesh of the evaluated object, reading it only if the geometry of the object or its
+    data was updated since the cached one was read.
+    """
+    ob = ob_eval.original
+    signature = (
+        ob.data.session_uid,
+        len(me.vertices),
+        len(me.edges),
+        len(me.polygons),
+        len(me.loops),
+        geometry_versions.get_version(ob),
+        geometry_versions.get_version(ob.data),
+    )
+    key = (ob.name, 'EVALUATED')
+    topology = get_cached_topology(key, signature)
+    if topology is None:
+        topology = MeshTopology.from_mesh(me)
+        cache_topology(key, signature, topology)
+    return topology
+
+
+def clear() -> None:
+    """Drop all cached topologies."""
+    _topologies.clear()
+
+
+@bpy.app.handlers.persistent
+def _clear_on_file_load(_scene: bpy.types.Scene) -> None:
+    clear()
+
+
+def register() -> None:
+    if _clear_on_file_load not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_clear_on_file_load)
+
+
+def unregister() -> None:
+    if _clear_on_file_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_clear_on_file_load)
+    clear()
@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, Any, Literal, TypeAlias, cast
 import bpy
 
 from ... import addon_info
+from .. import process_pool
 
 if TYPE_CHECKING:
     from ...operators.mesh_ot.mesh_ot_box import MESH_OT_select_box_xray
@@ -83,10 +84,23 @@ def set_properties_from_preferences(
             case 'LASSO':
                 op = cast("MESH_OT_select_lasso_xray", op)
                 op.show_lasso_icon = mesh_tools_props.show_lasso_icon
+                op.lasso_simplify_tolerance = mesh_tools_props.lasso_simplify_tolerance
             case 'CIRCLE':
                 pass
 
 
+def start_worker_processes() -> None:
+    """
+    Start worker processes when enabled, so they are ready by the time the selection region is drawn.
+
+    Called when a mesh tool is activated, and again when an operator is invoked, for operators run from a keymap
+    without their tool.
+    """
+    mesh_tools_props = addon_info.get_preferences().mesh_tools
+    if mesh_tools_props.use_worker_processes:
+        process_pool.start(mesh_tools_props.worker_count)
+
+
 def initialize_shading_from_properties(op: _MESH_OT, context: bpy.types.Context) -> None:
     sv3d = context.space_data
     assert isinstance(sv3d, bpy.types.SpaceView3D)
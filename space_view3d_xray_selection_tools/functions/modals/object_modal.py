@@ -43,6 +43,7 @@ def set_properties(op: _OBJECT_OT, tool: Literal['BOX', 'CIRCLE', 'LASSO']) -> N
             case 'LASSO':
                 op = cast("OBJECT_OT_select_lasso_xray", op)
                 op.show_lasso_icon = object_tools_props.show_lasso_icon
+                op.lasso_simplify_tolerance = object_tools_props.lasso_simplify_tolerance
                 op.behavior = op.curr_behavior = object_tools_props.lasso_select_behavior
 
 
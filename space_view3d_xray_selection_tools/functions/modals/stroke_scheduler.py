@@ -0,0 +1,51 @@
+import math
+import time
+
+# Minimum time in seconds between selection passes of a stroke.
+_FRAME_INTERVAL = 1 / 60
+
+
+class StrokeScheduler:
+    """
+    Coalesces cursor positions of a selection stroke, so at most one selection pass runs per interval.
+
+    Only the latest cursor position is kept. When a pass takes longer than the interval, mouse events queued meanwhile
+    just replace the pending position, and the next pass selects at the latest one instead of replaying every event,
+    so the selection doesn't lag behind the cursor. The operator is expected to run a window timer, so pending
+    positions are selected even when the cursor stops, and to select the pending position when the stroke ends.
+    Skipped positions are only covered by passes selecting the area swept from the previous pass position, so
+    passes testing a single circle are expected to take every position with `pop_pending` instead of `pop_due`.
+    """
+
+    def __init__(self, interval: float = _FRAME_INTERVAL) -> None:
+        self.interval = interval
+        self._pending_position: tuple[int, int] | None = None
+        self._last_pass_end: float = -math.inf
+        # Cursor position of the previous pass of the stroke.
+        self.prev_position: tuple[int, int] | None = None
+
+    def push(self, x: int, y: int) -> None:
+        """Replace the pending cursor position."""
+        self._pending_position = (x, y)
+
+    def pop_due(self) -> tuple[int, int] | None:
+        """Take the pending cursor position, if any, once the interval since the previous pass has elapsed."""
+        if time.perf_counter() - self._last_pass_end < self.interval:
+            return None
+        return self.pop_pending()
+
+    def pop_pending(self) -> tuple[int, int] | None:
+        """Take the pending cursor position, if any, regardless of the interval."""
+        position = self._pending_position
+        self._pending_position = None
+        return position
+
+    def finish_pass(self, position: tuple[int, int]) -> None:
+        """Record the end of a selection pass at the given cursor position."""
+        self._last_pass_end = time.perf_counter()
+        self.prev_position = position
+
+    def end_stroke(self) -> None:
+        """Forget the pending and the previous cursor positions, so the next stroke starts from scratch."""
+        self._pending_position = None
+        self.prev_position = None
@@ -0,0 +1,143 @@
+from collections.abc import Callable, Sequence
+from typing import Any, cast
+
+import bpy
+import mathutils
+import numpy as np
+
+from ..types import Bool1DArray, Float2DArray, Float2x2DArray, Float3DArray
+from . import geometry_tests, thread_pool, view3d_utils
+
+# Number of elements per block, so inputs and temporary arrays of a block stay in the CPU cache.
+_BLOCK_SIZE = 1 << 15
+# Number of elements below which kernels run as a single call on the calling thread.
+_MIN_PARALLEL_SIZE = 1 << 17
+
+
+def _is_parallel(count: int, worker_count: int) -> bool:
+    return worker_count >= 2 and count >= _MIN_PARALLEL_SIZE
+
+
+def _map_blocks(
+    kernel: Callable[..., Bool1DArray], co: np.ndarray, args: tuple[Any, ...], worker_count: int
+) -> Bool1DArray:
+    """Apply a kernel to blocks of coordinates on the shared thread pool, collecting its results in one mask."""
+    count = co.shape[0]
+    if not _is_parallel(count, worker_count):
+        return kernel(co, *args)
+
+    mask = np.empty(count, "?")
+
+    def run_block(start: int, stop: int) -> None:
+        mask[start:stop] = kernel(co[start:stop], *args)
+
+    thread_pool.run_blocks(run_block, count, _BLOCK_SIZE, worker_count)
+    return mask
+
+
+def points_inside_rectangle(
+    co: Float2DArray, xmin: float, xmax: float, ymin: float, ymax: float, worker_count: int
+) -> Bool1DArray:
+    """Parallel `geometry_tests.points_inside_rectangle`."""
+    return _map_blocks(geometry_tests.points_inside_rectangle, co, (xmin, xmax, ymin, ymax), worker_count)
+
+
+def points_inside_capsule(
+    co: Float2DArray, start: tuple[float, float], end: tuple[float, float], radius: float, worker_count: int
+) -> Bool1DArray:
+    """Parallel `geometry_tests.points_inside_capsule`."""
+    return _map_blocks(geometry_tests.points_inside_capsule, co, (start, end, radius), worker_count)
+
+
+def points_inside_polygon_prefiltered(
+    co: Float2DArray, poly: Sequence[tuple[float, float]], worker_count: int
+) -> Bool1DArray:
+    """
+    Parallel `geometry_tests.points_inside_polygon_prefiltered`.
+
+    The polygon bitmap or slab table is built once and shared by all blocks.
+    """
+    if not _is_parallel(co.shape[0], worker_count):
+        return geometry_tests.points_inside_polygon_prefiltered(co, poly)
+
+    points_mask_in = np.zeros(co.shape[0], "?")
+    xmin, xmax, ymin, ymax = geometry_tests.polygon_bbox(poly)
+    points_mask_prefiltered = points_inside_rectangle(co, xmin, xmax, ymin, ymax, worker_count)
+    if not np.any(points_mask_prefiltered):
+        return points_mask_in
+
+    prefiltered_co = co[points_mask_prefiltered]
+    if geometry_tests.is_rasterized_test_cheaper(prefiltered_co.shape[0], poly):
+        bitmap = geometry_tests.rasterize_polygon(poly)
+        prefiltered_points_mask_in = _map_blocks(
+            geometry_tests.points_inside_polygon_bitmap, prefiltered_co, (bitmap,), worker_count
+        )
+    else:
+        table = geometry_tests.build_polygon_slab_table(poly)
+        prefiltered_points_mask_in = _map_blocks(
+            geometry_tests.points_inside_polygon_slabs, prefiltered_co, (table,), worker_count
+        )
+
+    points_mask_in[points_mask_prefiltered] = prefiltered_points_mask_in
+    return points_mask_in
+
+
+def segments_intersect_rectangle(
+    segment_co: Float2x2DArray, xmin: float, xmax: float, ymin: float, ymax: float, worker_count: int
+) -> Bool1DArray:
+    """Parallel `geometry_tests.segments_intersect_rectangle`."""
+    return _map_blocks(geometry_tests.segments_intersect_rectangle, segment_co, (xmin, xmax, ymin, ymax), worker_count)
+
+
+def segments_intersect_capsule(
+    segment_co: Float2x2DArray,
+    start: tuple[float, float],
+    end: tuple[float, float],
+    radius: float,
+    worker_count: int,
+) -> Bool1DArray:
+    """Parallel `geometry_tests.segments_intersect_capsule`."""
+    return _map_blocks(geometry_tests.segments_intersect_capsule, segment_co, (start, end, radius), worker_count)
+
+
+def segments_intersect_polygon(
+    segment_co: Float2x2DArray, poly: Sequence[tuple[float, float]], worker_count: int
+) -> Bool1DArray:
+    """
+    Parallel `geometry_tests.segments_intersect_polygon`.
+
+    The side grid is built once and shared by all blocks.
+    """
+    if not _is_parallel(segment_co.shape[0], worker_count):
+        return geometry_tests.segments_intersect_polygon(segment_co, poly)
+
+    grid = geometry_tests.build_polygon_side_grid(poly)
+    return _map_blocks(geometry_tests.segments_intersect_polygon_grid, segment_co, (grid,), worker_count)
+
+
+def transform_local_to_2d_co(
+    region: bpy.types.Region | view3d_utils.RegionView,
+    rv3d: bpy.types.RegionView3D | view3d_utils.RegionView,
+    mat_world: mathutils.Matrix,
+    co_local: Float3DArray,
+    worker_count: int,
+    out: Float2DArray | None = None,
+) -> tuple[Float2DArray, Bool1DArray]:
+    """Parallel `view3d_utils.transform_local_to_2d_co`, blocks write directly to the output arrays."""
+    count = co_local.shape[0]
+    if not _is_parallel(count, worker_count):
+        return view3d_utils.transform_local_to_2d_co(region, rv3d, mat_world, co_local, out=out)
+
+    # Blender data can't be accessed from worker threads.
+    view = region if isinstance(region, view3d_utils.RegionView) else view3d_utils.RegionView.from_region(region, rv3d)
+    mat_world = mat_world.copy()
+    co_2d = cast(Float2DArray, np.empty((count, 2), "f")) if out is None else out
+    mask_clip = cast(Bool1DArray, np.empty(count, "?"))
+
+    def run_block(start: int, stop: int) -> None:
+        view3d_utils.transform_local_to_2d_co(
+            view, view, mat_world, co_local[start:stop], out=co_2d[start:stop], out_mask_clip=mask_clip[start:stop]
+        )
+
+    thread_pool.run_blocks(run_block, count, _BLOCK_SIZE, worker_count)
+    return co_2d, mask_clip
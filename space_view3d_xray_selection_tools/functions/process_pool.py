@@ -0,0 +1,197 @@
+import concurrent.futures
+import multiprocessing
+import os
+import runpy
+from collections.abc import Callable, Sequence
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+
+from ..types import Bool1DArray, Float2DArray, Float2x2DArray
+from . import geometry_tests
+
+# Number of elements tested by a worker process at once.
+_BLOCK_SIZE = 1 << 18
+# Number of elements below which tests aren't worth sending to worker processes.
+_MIN_OFFLOAD_SIZE = 1 << 21
+
+_executor: concurrent.futures.ProcessPoolExecutor | None = None
+_executor_worker_count: int = 0
+# Shared memory blocks reused between tests, by role.
+_buffers: dict[str, shared_memory.SharedMemory] = {}
+# Shared memory blocks attached by a worker process, by name.
+_attached_buffers: dict[str, shared_memory.SharedMemory] = {}
+
+
+def _warm_up() -> None:
+    """Do nothing, submitted once per worker, so the workers start and import numpy before the first test."""
+
+
+def start(worker_count: int) -> None:
+    """
+    Start the worker processes, unless they are already running with the given number of workers.
+
+    Processes start in the background, so it's meant to be called when a tool is activated, to have the workers
+    ready by the time the selection region is drawn.
+    """
+    global _executor, _executor_worker_count
+    if _executor is not None and _executor_worker_count == worker_count:
+        return
+
+    shutdown()
+    package_name = __name__.rsplit(".", 2)[0]
+    package_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    bootstrap_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "process_pool_bootstrap.py")
+    # Forking would copy the whole Blender process.
+    _executor = concurrent.futures.ProcessPoolExecutor(
+        worker_count,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=runpy.run_path,
+        initargs=(bootstrap_path, {"package_name": package_name, "package_path": package_path}),
+    )
+    _executor_worker_count = worker_count
+    for _ in range(worker_count):
+        _executor.submit(_warm_up)
+
+
+def shutdown() -> None:
+    """Stop the worker processes and free the shared memory."""
+    global _executor, _executor_worker_count
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _executor_worker_count = 0
+
+    for shm in _buffers.values():
+        shm.close()
+        shm.unlink()
+    _buffers.clear()
+
+
+def is_worth_offloading(count: int) -> bool:
+    """Whether the worker processes are running and testing the given number of elements is worth sending to them."""
+    return _executor is not None and count >= _MIN_OFFLOAD_SIZE
+
+
+def _get_buffer(role: str, size: int) -> shared_memory.SharedMemory:
+    """Return a shared memory block of at least the given size in bytes, reusing the previous one when big enough."""
+    shm = _buffers.get(role)
+    if shm is None or shm.size < size:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+        # Leave room for growth, so the block isn't recreated on every slightly bigger selection.
+        shm = _buffers[role] = shared_memory.SharedMemory(create=True, size=size + size // 2)
+    return shm
+
+
+def _is_in_buffer(data: np.ndarray, shm: shared_memory.SharedMemory) -> bool:
+    """Whether the array is a float array starting at the beginning of the shared memory block."""
+    buffer = np.frombuffer(shm.buf, "u1")
+    is_in_buffer = data.dtype == np.float32 and data.flags.c_contiguous and data.ctypes.data == buffer.ctypes.data
+    del buffer
+    return is_in_buffer
+
+
+def concatenate(arrays: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Concatenate float arrays of elements to test, directly into shared memory when testing them is worth sending
+    to the worker processes, so the test doesn't copy them again.
+
+    The result must be released before the next call.
+    """
+    count = sum(array.shape[0] for array in arrays)
+    if not is_worth_offloading(count):
+        return np.concatenate(arrays)
+
+    shape = (count, *arrays[0].shape[1:])
+    input_shm = _get_buffer('INPUT', int(np.prod(shape)) * 4)
+    return np.concatenate(arrays, out=np.ndarray(shape, "f", buffer=input_shm.buf))
+
+
+def _attach_buffer(name: str) -> shared_memory.SharedMemory:
+    """Attach a worker process to a shared memory block, keeping the attachment for next tests."""
+    shm = _attached_buffers.get(name)
+    if shm is None:
+        shm = _attached_buffers[name] = shared_memory.SharedMemory(name)
+    return shm
+
+
+def _detach_buffers(keep_names: Sequence[str]) -> None:
+    """Detach a worker process from shared memory blocks replaced by bigger ones."""
+    for name in [name for name in _attached_buffers if name not in keep_names]:
+        _attached_buffers.pop(name).close()
+
+
+def _test_block(
+    kernel: Callable[..., Bool1DArray],
+    input_name: str,
+    output_name: str,
+    shape: tuple[int, ...],
+    start: int,
+    stop: int,
+    args: tuple[Any, ...],
+) -> None:
+    """Run a kernel on a block of shared elements and write the result to the shared mask. Runs in a worker process."""
+    _detach_buffers((input_name, output_name))
+    data = np.ndarray(shape, "f", buffer=_attach_buffer(input_name).buf)
+    mask = np.ndarray(shape[0], "?", buffer=_attach_buffer(output_name).buf)
+    mask[start:stop] = kernel(data[start:stop], *args)
+    # Release the views, so the blocks can be closed.
+    del data, mask
+
+
+def _map_blocks(kernel: Callable[..., Bool1DArray], data: np.ndarray, args: tuple[Any, ...]) -> Bool1DArray:
+    """
+    Test blocks of elements in the worker processes, passing the elements and the result through shared memory.
+
+    Elements concatenated with `concatenate` are already in shared memory, others are copied there first.
+    """
+    assert _executor is not None
+    count = data.shape[0]
+    input_shm = _get_buffer('INPUT', data.size * 4)
+    output_shm = _get_buffer('OUTPUT', count)
+
+    if not _is_in_buffer(data, input_shm):
+        shared_data = np.ndarray(data.shape, "f", buffer=input_shm.buf)
+        shared_data[:] = data
+        del shared_data
+
+    futures = [
+        _executor.submit(
+            _test_block,
+            kernel,
+            input_shm.name,
+            output_shm.name,
+            data.shape,
+            start,
+            min(start + _BLOCK_SIZE, count),
+            args,
+        )
+        for start in range(0, count, _BLOCK_SIZE)
+    ]
+    # Let all blocks finish before raising, so no worker writes to the buffers after they are replaced.
+    concurrent.futures.wait(futures)
+    for future in futures:
+        future.result()
+
+    shared_mask = np.ndarray(count, "?", buffer=output_shm.buf)
+    mask = shared_mask.copy()
+    del shared_mask
+    return mask
+
+
+def points_inside_polygon(co: Float2DArray, poly: Sequence[tuple[float, float]]) -> Bool1DArray:
+    """`geometry_tests.points_inside_polygon_prefiltered` run in the worker processes."""
+    return _map_blocks(geometry_tests.points_inside_polygon_prefiltered, co, (tuple(poly),))
+
+
+def segments_intersect_polygon(segment_co: Float2x2DArray, poly: Sequence[tuple[float, float]]) -> Bool1DArray:
+    """
+    `geometry_tests.segments_intersect_polygon` run in the worker processes.
+
+    The side grid is built once and sent to the workers with each block.
+    """
+    grid = geometry_tests.build_polygon_side_grid(poly)
+    return _map_blocks(geometry_tests.segments_intersect_polygon_grid, segment_co, (grid,))
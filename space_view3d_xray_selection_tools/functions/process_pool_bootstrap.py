@@ -0,0 +1,22 @@
+"""
+Initializer of worker processes of the process pool, run with `runpy.run_path`.
+
+Worker processes run outside of Blender, where the add-on package can't be imported, since its `__init__` imports
+`bpy`. Empty modules are registered in place of the add-on package and its parent packages, so the worker can import
+submodules that don't use `bpy`, such as `geometry_tests`.
+"""
+
+import sys
+import types
+
+# Set by the process pool through the initial globals.
+_package_name: str = globals()["package_name"]
+_package_path: str = globals()["package_path"]
+
+_parts = _package_name.split(".")
+for _i in range(1, len(_parts) + 1):
+    _name = ".".join(_parts[:_i])
+    if _name not in sys.modules:
+        _module = types.ModuleType(_name)
+        _module.__path__ = [_package_path] if _i == len(_parts) else []
+        sys.modules[_name] = _module
@@ -0,0 +1,136 @@
+import dataclasses
+import itertools
+from collections.abc import Hashable, Iterable
+
+import bpy
+import mathutils
+import numpy as np
+
+from ..types import Bool1DArray, Float2DArray, Float3DArray
+from . import parallel_kernels, screen_grid, view3d_utils
+
+
+@dataclasses.dataclass
+class _Projection:
+    view_key: tuple[float, ...]
+    matrix_key: tuple[float, ...]
+    data_key: Hashable
+    co_2d: Float2DArray
+    vis_co_2d: Float2DArray
+    reuse_count: int = 0
+    grid: screen_grid.ScreenGrid | None = None
+
+
+# Projections by object name and element type.
+_projections: dict[tuple[str, str], _Projection] = {}
+
+
+def _view_key(
+    region: bpy.types.Region | view3d_utils.RegionView, rv3d: bpy.types.RegionView3D | view3d_utils.RegionView
+) -> tuple[float, ...]:
+    return (region.width, region.height, *itertools.chain.from_iterable(rv3d.perspective_matrix))
+
+
+def _matrix_key(mat_world: mathutils.Matrix) -> tuple[float, ...]:
+    return tuple(itertools.chain.from_iterable(mat_world))
+
+
+def get_co_2d(
+    key: tuple[str, str],
+    region: bpy.types.Region | view3d_utils.RegionView,
+    rv3d: bpy.types.RegionView3D | view3d_utils.RegionView,
+    mat_world: mathutils.Matrix,
+    co_local: Float3DArray,
+    mask_vis: Bool1DArray,
+    data_key: Hashable,
+    worker_count: int = 1,
+) -> tuple[Float2DArray, Float2DArray]:
+    """
+    Project visible points to the region, reusing the previous result while the view, object transform and
+    data key are unchanged.
+
+    Coordinates and visibility aren't compared, it would cost about as much as the projection. The data key
+    identifies them instead.
+
+    Args:
+        key: Cache key, usually the object name and the type of projected elements.
+        region: Region of the 3D viewport, or its copy when called off the main thread.
+        rv3d: 3D region data, or its copy when called off the main thread.
+        mat_world: 4x4 world space transformation matrix of the object.
+        co_local: Nx3 array of local coordinates of all points.
+        mask_vis: Mask of visible points. Invisible points aren't projected.
+        data_key: Token that changes whenever coordinates or visibility may change.
+        worker_count: Number of threads projecting blocks of points.
+
+    Returns:
+        A tuple containing:
+            - Nx2 array of 2D coordinates of all points, `np.nan` for invisible and clipped points.
+            - Mx2 array of 2D coordinates of visible points, `np.nan` for clipped points.
+
+    Note:
+        Returned arrays are shared between calls and must not be modified. Their buffers are reused
+        when the projection is recalculated.
+    """
+    view_key = _view_key(region, rv3d)
+    matrix_key = _matrix_key(mat_world)
+
+    prj = _projections.get(key)
+    if prj is not None and prj.view_key == view_key and prj.matrix_key == matrix_key and prj.data_key == data_key:
+        prj.reuse_count += 1
+        return prj.co_2d, prj.vis_co_2d
+
+    # Project all points at once, it's cheaper than gathering visible points first.
+    out = prj.co_2d if prj is not None and prj.co_2d.shape[0] == co_local.shape[0] else None
+    co_2d = parallel_kernels.transform_local_to_2d_co(region, rv3d, mat_world, co_local, worker_count, out=out)[0]
+    co_2d[~mask_vis] = np.nan
+    # 2d coordinates of visible points.
+    vis_co_2d = co_2d[mask_vis]
+
+    _projections[key] = _Projection(view_key, matrix_key, data_key, co_2d, vis_co_2d)
+    return co_2d, vis_co_2d
+
+
+def is_reused(key: tuple[str, str]) -> bool:
+    """Whether the cached projection was returned more than once."""
+    prj = _projections.get(key)
+    return prj is not None and prj.reuse_count > 0
+
+
+def get_grid(key: tuple[str, str], region: bpy.types.Region) -> screen_grid.ScreenGrid:
+    """
+    Get a uniform grid over 2D coordinates of all points of the cached projection, built on first request.
+
+    Grid point indices are indices of all points, not only visible ones.
+    """
+    prj = _projections[key]
+    if prj.grid is None:
+        prj.grid = screen_grid.build(prj.co_2d, region.width, region.height)
+    return prj.grid
+
+
+def retain(names: Iterable[str]) -> None:
+    """Drop cached projections of all objects except the given ones."""
+    names = set(names)
+    for key in [key for key in _projections if key[0] not in names]:
+        del _projections[key]
+
+
+def clear() -> None:
+    """Drop all cached projections."""
+    _projections.clear()
+
+
+@bpy.app.handlers.persistent
+def _clear_on_file_load(_scene: bpy.types.Scene) -> None:
+    clear()
+
+
+def register() -> None:
+    if _clear_on_file_load not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_clear_on_file_load)
+
+
+def unregister() -> None:
+    if _clear_on_file_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_clear_on_file_load)
+    clear()
@@ -0,0 +1,114 @@
+import dataclasses
+import math
+
+import numpy as np
+
+from ..types import Float2DArray, Int1DArray
+
+# Average number of points per grid cell.
+_POINTS_PER_CELL = 8
+# Upper bound for the number of grid cells.
+_MAX_CELL_COUNT = 1 << 22
+
+
+@dataclasses.dataclass(frozen=True)
+class ScreenGrid:
+    """
+    Uniform grid over 2D points with point indices sorted by cell.
+
+    Points of the cell `i` are `point_indices[cell_starts[i]:cell_starts[i + 1]]`,
+    where cells are numbered row by row.
+    """
+
+    xmin: float
+    ymin: float
+    cell_size: float
+    col_count: int
+    row_count: int
+    cell_starts: Int1DArray
+    point_indices: Int1DArray
+
+
+def build(co: Float2DArray, width: int, height: int) -> ScreenGrid:
+    """
+    Build a uniform grid over 2D points.
+
+    The grid covers the points within the region bounds. Points outside the bounds are added to
+    the border cells, so they remain candidates of queries touching the region border.
+
+    Args:
+        co: Coordinates of the points, where each row represents (x, y). Points with `np.nan` coordinates
+            are not added to the grid.
+        width: Width of the region.
+        height: Height of the region.
+
+    Returns:
+        The grid.
+    """
+    point_indices = np.flatnonzero(~np.isnan(co[:, 0]) & ~np.isnan(co[:, 1]))
+    point_count = point_indices.size
+    if point_count == 0:
+        return ScreenGrid(0.0, 0.0, 1.0, 1, 1, np.zeros(2, "i"), point_indices.astype("i"))
+
+    x = co[point_indices, 0]
+    y = co[point_indices, 1]
+    # Bounding box of the points clamped to the region.
+    xmin = min(max(float(np.amin(x)), 0.0), width)
+    xmax = min(max(float(np.amax(x)), 0.0), width)
+    ymin = min(max(float(np.amin(y)), 0.0), height)
+    ymax = min(max(float(np.amax(y)), 0.0), height)
+    grid_width = xmax - xmin
+    grid_height = ymax - ymin
+
+    # Cell size giving about `_POINTS_PER_CELL` points per cell for evenly distributed points.
+    cell_size = max(math.sqrt(grid_width * grid_height * _POINTS_PER_CELL / point_count), 1.0)
+    while (grid_width // cell_size + 1) * (grid_height // cell_size + 1) > _MAX_CELL_COUNT:
+        cell_size *= 2
+    col_count = int(grid_width // cell_size) + 1
+    row_count = int(grid_height // cell_size) + 1
+
+    cols = np.clip((x - xmin) // cell_size, 0, col_count - 1).astype("i")
+    rows = np.clip((y - ymin) // cell_size, 0, row_count - 1).astype("i")
+    cell_ids = rows * col_count + cols
+
+    order = np.argsort(cell_ids, kind="stable")
+    cell_point_counts = np.bincount(cell_ids, minlength=col_count * row_count)
+    cell_starts = np.zeros(col_count * row_count + 1, "i")
+    np.cumsum(cell_point_counts, out=cell_starts[1:])
+
+    return ScreenGrid(xmin, ymin, cell_size, col_count, row_count, cell_starts, point_indices[order].astype("i"))
+
+
+def query_rectangle(grid: ScreenGrid, xmin: float, xmax: float, ymin: float, ymax: float) -> Int1DArray:
+    """
+    Get indices of points in grid cells overlapping a rectangle.
+
+    The result is a superset of points inside the rectangle, the points should be tested further.
+
+    Args:
+        grid: The grid.
+        xmin: Minimum x-coordinate of the rectangle.
+        xmax: Maximum x-coordinate of the rectangle.
+        ymin: Minimum y-coordinate of the rectangle.
+        ymax: Maximum y-coordinate of the rectangle.
+
+    Returns:
+        Indices of the points.
+    """
+    # Cells overlapping the rectangle, border cells also hold points outside the grid.
+    col_min = min(max(int((xmin - grid.xmin) // grid.cell_size), 0), grid.col_count - 1)
+    col_max = min(max(int((xmax - grid.xmin) // grid.cell_size), 0), grid.col_count - 1)
+    row_min = min(max(int((ymin - grid.ymin) // grid.cell_size), 0), grid.row_count - 1)
+    row_max = min(max(int((ymax - grid.ymin) // grid.cell_size), 0), grid.row_count - 1)
+
+    # Cells of a row overlapping the rectangle are adjacent, so are their points.
+    row_offsets = np.arange(row_min, row_max + 1) * grid.col_count
+    range_starts = grid.cell_starts[row_offsets + col_min]
+    range_ends = grid.cell_starts[row_offsets + col_max + 1]
+    range_lengths = range_ends - range_starts
+
+    # Concatenate ranges of point indices.
+    total = int(range_lengths.sum())
+    range_offsets = np.cumsum(range_lengths) - range_lengths
+    positions = np.arange(total) + np.repeat(range_starts - range_offsets, range_lengths)
+    return grid.point_indices[positions]
@@ -0,0 +1,120 @@
+import concurrent.futures
+import threading
+from collections.abc import Callable
+from typing import Any
+
+
+class _InlineExecutor(concurrent.futures.Executor):
+    """Executor running submitted functions immediately on the calling thread."""
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> concurrent.futures.Future[Any]:
+        future: concurrent.futures.Future[Any] = concurrent.futures.Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:  # noqa: BLE001 - re-raised by `Future.result` on the calling thread.
+            future.set_exception(e)
+        return future
+
+
+_inline_executor = _InlineExecutor()
+_executor: concurrent.futures.ThreadPoolExecutor | None = None
+_executor_worker_count: int = 0
+
+
+def get_executor(worker_count: int) -> concurrent.futures.Executor:
+    """
+    Return the shared executor with the given number of worker threads.
+
+    The thread pool is created on first request and recreated when the number of workers changes. With less than
+    two workers, functions run immediately on the calling thread.
+
+    Note:
+        Functions submitted to the executor must not access Blender data, only numpy arrays and plain values
+        read on the main thread beforehand.
+    """
+    global _executor, _executor_worker_count
+    if worker_count < 2:
+        return _inline_executor
+
+    if _executor is None or _executor_worker_count != worker_count:
+        shutdown()
+        _executor = concurrent.futures.ThreadPoolExecutor(worker_count, thread_name_prefix="xray_select")
+        _executor_worker_count = worker_count
+    return _executor
+
+
+def shutdown() -> None:
+    """Stop the worker threads of the shared executor."""
+    global _executor, _executor_worker_count
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+        _executor_worker_count = 0
+
+
+class _BlockRunner:
+    """Runs a function on consecutive blocks of a range, taken one by one by any number of threads."""
+
+    def __init__(self, fn: Callable[[int, int], None], count: int, block_size: int) -> None:
+        self._fn = fn
+        self._count = count
+        self._block_size = block_size
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._next_start = 0
+        self._running_count = 0
+        self._error: Exception | None = None
+
+    def _take_block(self) -> int | None:
+        with self._lock:
+            if self._next_start >= self._count or self._error is not None:
+                return None
+            start = self._next_start
+            self._next_start += self._block_size
+            self._running_count += 1
+            return start
+
+    def run(self) -> None:
+        """Run blocks until there are none left."""
+        while (start := self._take_block()) is not None:
+            try:
+                self._fn(start, min(start + self._block_size, self._count))
+            except Exception as e:  # noqa: BLE001 - re-raised by `wait` on the calling thread.
+                with self._lock:
+                    if self._error is None:
+                        self._error = e
+            finally:
+                with self._lock:
+                    self._running_count -= 1
+                    self._idle.notify_all()
+
+    def wait(self) -> None:
+        """Wait for blocks taken by other threads and raise the first error of any block."""
+        with self._lock:
+            while self._running_count:
+                self._idle.wait()
+        if self._error is not None:
+            raise self._error
+
+
+def run_blocks(fn: Callable[[int, int], None], count: int, block_size: int, worker_count: int) -> None:
+    """
+    Call `fn(start, stop)` for consecutive blocks covering `range(count)`, using the shared thread pool.
+
+    The calling thread processes blocks as well and waits only for blocks already taken by workers, so it's safe
+    to call from a worker thread of the pool, even when all other workers are busy.
+
+    Args:
+        fn: Function processing a block, it must not access Blender data.
+        count: Number of elements.
+        block_size: Number of elements in a block.
+        worker_count: Number of worker threads of the shared thread pool.
+    """
+    block_count = -(-count // block_size)
+    runner = _BlockRunner(fn, count, block_size)
+    if worker_count >= 2 and block_count >= 2:
+        executor = get_executor(worker_count)
+        for _ in range(min(worker_count, block_count) - 1):
+            executor.submit(runner.run)
+    runner.run()
+    runner.wait()
@@ -1,15 +1,48 @@
 import contextlib
 import time
+import tracemalloc
+
+# Highest traced memory seen so far in each open section, from the outermost one.
+_open_section_peaks: list[int] = []
+
+
+def _update_open_section_peaks() -> None:
+    """Fold the traced memory peak into peaks of open sections, before it's reset or read."""
+    peak = tracemalloc.get_traced_memory()[1]
+    for i, section_peak in enumerate(_open_section_peaks):
+        _open_section_peaks[i] = max(section_peak, peak)
 
 
 @contextlib.contextmanager
 def time_section(label: str, prefix: str = "", suffix: str = "", debug: bool = False):
-    """Context manager to measure elapsed time for a code block."""
+    """
+    Context manager to measure elapsed time and peak memory allocated within a code block.
+
+    Memory is measured with `tracemalloc`, so it includes NumPy arrays and Python objects but not Blender's own
+    allocations. Tracing is started for the outermost section and stopped after it.
+    """
     if not debug:
         yield
         return
 
+    is_tracing_started = not tracemalloc.is_tracing()
+    if is_tracing_started:
+        tracemalloc.start()
+    _update_open_section_peaks()
+    tracemalloc.reset_peak()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    _open_section_peaks.append(start_memory)
+
     start = time.perf_counter()
-    yield
-    end = time.perf_counter()
-    print(f"{prefix}[{label}] elapsed time: {end - start:.3f} seconds{suffix}")
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        _update_open_section_peaks()
+        peak_memory = _open_section_peaks.pop() - start_memory
+        if is_tracing_started:
+            tracemalloc.stop()
+        print(
+            f"{prefix}[{label}] elapsed time: {end - start:.3f} seconds, "
+            f"peak memory: {peak_memory / (1 << 20):.1f} MB{suffix}"
+        )
@@ -1,3 +1,4 @@
+import dataclasses
 from typing import cast
 
 import bpy
@@ -7,6 +8,24 @@ import numpy as np
 from ..types import Bool1DArray, Float2DArray, Float3DArray, Float4x4DArray, FloatNx3DArray
 
 
+@dataclasses.dataclass(frozen=True)
+class RegionView:
+    """
+    Size of a 3D viewport region and its perspective matrix, copied on the main thread.
+
+    Stands in for the region and the region data in code running on worker threads, which must not access
+    Blender data.
+    """
+
+    width: int
+    height: int
+    perspective_matrix: mathutils.Matrix
+
+    @classmethod
+    def from_region(cls, region: bpy.types.Region, rv3d: bpy.types.RegionView3D) -> "RegionView":
+        return cls(region.width, region.height, rv3d.perspective_matrix.copy())
+
+
 def transform_local_to_world_co(mat_world: mathutils.Matrix, co_local: Float3DArray) -> Float3DArray:
     """
     Transform local coordinates to global/world coordinates using the world space transformation matrix.
@@ -47,8 +66,8 @@ def batch_transform_local_to_world_co(mat_world: Float4x4DArray, co_local: Float
 
 
 def transform_world_to_2d_co(
-    region: bpy.types.Region,
-    rv3d: bpy.types.RegionView3D,
+    region: bpy.types.Region | RegionView,
+    rv3d: bpy.types.RegionView3D | RegionView,
     co_world: Float3DArray,
     apply_clipping_mask: bool = True,
 ) -> tuple[Float2DArray, Bool1DArray]:
@@ -96,3 +115,62 @@ def transform_world_to_2d_co(
         co_2d[mask_clip] = np.nan
 
     return co_2d, mask_clip
+
+
+def transform_local_to_2d_co(
+    region: bpy.types.Region | RegionView,
+    rv3d: bpy.types.RegionView3D | RegionView,
+    mat_world: mathutils.Matrix,
+    co_local: Float3DArray,
+    out: Float2DArray | None = None,
+    out_mask_clip: Bool1DArray | None = None,
+) -> tuple[Float2DArray, Bool1DArray]:
+    """
+    Transform local coordinates to 2D coordinates in a single pass.
+
+    The viewport perspective matrix and the world space transformation matrix are multiplied once, and
+    the coordinates are projected in float32 without intermediate world coordinates. Views without
+    perspective division, such as orthographic views, skip the per-point division.
+
+    Args:
+        region: Region of the 3D viewport, typically bpy.context.region.
+        rv3d: 3D region data, typically bpy.context.space_data.region_3d.
+        mat_world: 4x4 world space transformation matrix.
+        co_local: Nx3 array representing local coordinates in the object’s space.
+        out: Optional Nx2 float32 array to write 2D coordinates to.
+        out_mask_clip: Optional boolean array of length N to write the clipping mask to.
+
+    Returns:
+        A tuple containing:
+            - Nx2 array of 2D coordinates, `np.nan` for clipped values.
+            - Clipping mask (`np.True` for clipped values, `np.False` otherwise).
+    """
+    mat = (np.array(rv3d.perspective_matrix, "d") @ np.array(mat_world, "d")).astype("f")
+    c = co_local.shape[0]
+    co_2d = cast(Float2DArray, np.empty((c, 2), "f")) if out is None else out
+    mask_clip = cast(Bool1DArray, np.empty(c, "?")) if out_mask_clip is None else out_mask_clip
+
+    # Clip space x and y.
+    np.matmul(co_local, mat[:2, :3].T, out=co_2d)
+    co_2d += mat[:2, 3]
+
+    half_size = np.array((region.width / 2.0, region.height / 2.0), "f")
+    if not np.any(mat[3, :3]):
+        # The same w for all points.
+        prj_w = float(mat[3, 3])
+        mask_clip[:] = prj_w <= 0
+        if prj_w <= 0:
+            co_2d[:] = np.nan
+            return co_2d, mask_clip
+        co_2d *= half_size / prj_w
+    else:
+        prj_w = co_local @ mat[3, :3]
+        prj_w += mat[3, 3]  # negative if coord is behind the origin of a perspective view
+        np.less_equal(prj_w, 0, out=mask_clip)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            co_2d /= prj_w[:, np.newaxis]
+        co_2d *= half_size
+        co_2d[mask_clip] = np.nan
+    co_2d += half_size
+
+    return co_2d, mask_clip
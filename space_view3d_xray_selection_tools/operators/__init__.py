@@ -1,3 +1,4 @@
+from ..functions import process_pool, thread_pool
 from . import ot_keymap, xraysel_ot_info
 from .mesh_ot import mesh_ot_box, mesh_ot_circle, mesh_ot_lasso, mesh_ot_toggle
 from .object_ot import object_ot_box, object_ot_circle, object_ot_lasso
@@ -32,3 +33,6 @@ def unregister() -> None:
 
     for cls in _classes:
         unregister_class(cls)
+
+    thread_pool.shutdown()
+    process_pool.shutdown()
@@ -380,6 +380,7 @@ class MESH_OT_select_box_xray(bpy.types.Operator):
     def invoke(self, context: bpy.types.Context, event: bpy.types.Event) -> set["OperatorReturnItems"]:
         # Set operator properties from addon preferences.
         mesh_modal.set_properties_from_preferences(self, tool='BOX')
+        mesh_modal.start_worker_processes()
 
         self.override_intersect_tests = (
             self.select_all_faces
@@ -591,6 +592,7 @@ class MESH_OT_select_box_xray(bpy.types.Operator):
             select_all_edges=self.select_all_edges,
             select_all_faces=self.select_all_faces,
             select_backfacing=self.select_backfacing,
+            worker_count=addon_info.get_preferences().mesh_tools.worker_count,
         )
 
     def finish_modal(self, context: bpy.types.Context) -> None:
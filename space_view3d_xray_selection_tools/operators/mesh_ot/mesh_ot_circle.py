@@ -7,8 +7,9 @@ import mathutils
 import numpy as np
 from gpu_extras import batch
 
+from ... import addon_info
 from ...functions.intersections import mesh_intersect
-from ...functions.modals import mesh_modal
+from ...functions.modals import mesh_modal, stroke_scheduler
 
 if TYPE_CHECKING:
     from bpy.stub_internal.rna_enums import OperatorReturnItems
@@ -300,6 +301,7 @@ class MESH_OT_select_circle_xray(bpy.types.Operator):
 
         self.last_mouse_region_x: int = 0
         self.last_mouse_region_y: int = 0
+        self.stroke_scheduler: stroke_scheduler.StrokeScheduler = stroke_scheduler.StrokeScheduler()
 
         self.init_mods: list[tuple[bpy.types.Modifier, bool]] = []
         self.init_overlays: dict[str, Any] = dict()
@@ -315,6 +317,7 @@ class MESH_OT_select_circle_xray(bpy.types.Operator):
         ] = mesh_modal.get_select_through_toggle_keys()
 
         self.handler: Any | None = None
+        self.timer: bpy.types.Timer | None = None
         self.border_batch: gpu.types.GPUBatch | None = None
         self.fill_batch: gpu.types.GPUBatch | None = None
         self.UBO_data: _UBOStruct = _UBOStruct()
@@ -325,6 +328,7 @@ class MESH_OT_select_circle_xray(bpy.types.Operator):
     def invoke(self, context: bpy.types.Context, event: bpy.types.Event) -> set["OperatorReturnItems"]:
         # Set operator properties from addon preferences.
         mesh_modal.set_properties_from_preferences(self, tool='CIRCLE')
+        mesh_modal.start_worker_processes()
 
         self.override_intersect_tests = (
             self.select_all_faces
@@ -400,18 +404,25 @@ class MESH_OT_select_circle_xray(bpy.types.Operator):
                     or not self.select_through
                     and self.invert_select_through
                 ):
-                    self.begin_custom_intersect_tests(context)
+                    self.begin_custom_intersect_tests(context, (self.last_mouse_region_x, self.last_mouse_region_y))
                 else:
-                    self.exec_inbuilt_circle_select()
+                    self.exec_inbuilt_circle_select((self.last_mouse_region_x, self.last_mouse_region_y))
 
         if self.stage == 'CUSTOM_SELECTION':
             # Update shader.
             if event.type == 'MOUSEMOVE':
                 self.update_shader_position(context, event)
-                if self.override_intersect_tests and self.select_through:
-                    self.begin_custom_intersect_tests(context)
+                self.stroke_scheduler.push(event.mouse_region_x, event.mouse_region_y)
+
+            # Custom selection covers the area swept since the previous pass, so it selects at the latest cursor
+            # position at most once per frame. The inbuilt operator tests a single circle and selects at every move.
+            if event.type in {'MOUSEMOVE', 'TIMER'}:
+                if self.is_custom_selection():
+                    center = self.stroke_scheduler.pop_due()
                 else:
-                    self.exec_inbuilt_circle_select()
+                    center = self.stroke_scheduler.pop_pending()
+                if center is not None:
+                    self.select_stroke_sample(context, center)
 
             # Toggle modifiers and overlays.
             if event.type in self.select_through_toggle_key_list:
@@ -431,8 +442,14 @@ class MESH_OT_select_circle_xray(bpy.types.Operator):
 
             # Finish stage.
             if event.value == 'RELEASE' and event.type in {'LEFTMOUSE', 'MIDDLEMOUSE'}:
+                # Catch up with the cursor.
+                if (center := self.stroke_scheduler.pop_pending()) is not None:
+                    self.select_stroke_sample(context, center)
+                self.stroke_scheduler.end_stroke()
+
                 if self.wait_for_input:
                     self.stage = 'CUSTOM_WAIT_FOR_INPUT'
+                    mesh_intersect.end_stroke()
                 else:
                     self.remove_custom_ui(context)
                     self.finish_modal(context)
@@ -483,6 +500,8 @@ class MESH_OT_select_circle_xray(bpy.types.Operator):
 
         self.build_circle_shader()
         self.handler = context.space_data.draw_handler_add(self.draw_circle_shader, (), 'WINDOW', 'POST_PIXEL')  # pyright: ignore [reportArgumentType]
+        # Select the pending cursor position when the cursor stops.
+        self.timer = context.window_manager.event_timer_add(self.stroke_scheduler.interval, window=context.window)
         self.update_shader_position(context, event)
 
     def update_radius(self, context: bpy.types.Context, event: bpy.types.Event) -> None:
@@ -497,6 +516,8 @@ class MESH_OT_select_circle_xray(bpy.types.Operator):
         """Restore cursor and status text, remove shader."""
         context.workspace.status_text_set(text=None)
         context.space_data.draw_handler_remove(self.handler, 'WINDOW')
+        assert isinstance(self.timer, bpy.types.Timer)
+        context.window_manager.event_timer_remove(self.timer)
         context.region.tag_redraw()
 
     def invoke_inbuilt_circle_select(self):
@@ -505,32 +526,53 @@ class MESH_OT_select_circle_xray(bpy.types.Operator):
             'INVOKE_DEFAULT', mode=self.curr_mode, wait_for_input=self.wait_for_input, radius=self.radius
         )
 
-    def exec_inbuilt_circle_select(self) -> None:
+    def is_custom_selection(self) -> bool:
+        return self.override_intersect_tests and self.select_through
+
+    def select_stroke_sample(self, context: bpy.types.Context, center: tuple[int, int]) -> None:
+        if self.is_custom_selection():
+            self.begin_custom_intersect_tests(context, center)
+        else:
+            self.exec_inbuilt_circle_select(center)
+
+    def exec_inbuilt_circle_select(self, center: tuple[int, int]) -> None:
+        # The inbuilt operator changes selection behind the back of the stroke snapshot.
+        mesh_intersect.end_stroke()
         bpy.ops.view3d.select_circle(
-            x=self.last_mouse_region_x,
-            y=self.last_mouse_region_y,
+            x=center[0],
+            y=center[1],
             mode=self.curr_mode,
             wait_for_input=False,
             radius=self.radius,
         )
         if self.curr_mode == 'SET':
             self.curr_mode = 'ADD'
+        self.stroke_scheduler.finish_pass(center)
+
+    def begin_custom_intersect_tests(self, context: bpy.types.Context, center: tuple[int, int]) -> None:
+        # Reuse mesh data between selections until the mouse button is released.
+        mesh_intersect.begin_stroke()
 
-    def begin_custom_intersect_tests(self, context: bpy.types.Context) -> None:
-        center = (self.last_mouse_region_x, self.last_mouse_region_y)
         mesh_intersect.select_mesh_elements(
             context,
             mode=self.curr_mode,
             tool='CIRCLE',
-            tool_co_kwargs={"circle_center": center, "circle_radius": self.radius},
+            tool_co_kwargs={
+                "circle_center": center,
+                "circle_radius": self.radius,
+                "circle_prev_center": self.stroke_scheduler.prev_position,
+            },
             select_all_edges=self.select_all_edges,
             select_all_faces=self.select_all_faces,
             select_backfacing=self.select_backfacing,
+            worker_count=addon_info.get_preferences().mesh_tools.worker_count,
         )
         if self.curr_mode == 'SET':
             self.curr_mode = 'ADD'
+        self.stroke_scheduler.finish_pass(center)
 
     def finish_modal(self, context: bpy.types.Context) -> None:
+        mesh_intersect.end_stroke()
         mesh_modal.restore_overlays(self, context)
         mesh_modal.restore_modifiers(self)
         context.window_manager.operator_properties_last("mesh.select_circle_xray").radius = self.radius
@@ -165,6 +165,7 @@ class MESH_OT_select_lasso_xray(bpy.types.Operator):
         hide_solidify: bool
         hide_gizmo: bool
         show_lasso_icon: bool
+        lasso_simplify_tolerance: float
     else:
         mode: bpy.props.EnumProperty(
             name="Mode",
@@ -322,6 +323,18 @@ class MESH_OT_select_lasso_xray(bpy.types.Operator):
             default=True,
             options={'SKIP_SAVE'},
         )
+        lasso_simplify_tolerance: bpy.props.FloatProperty(
+            name="Lasso Simplification Tolerance",
+            description=(
+                "Remove lasso points deviating from the simplified lasso by no more than this distance. "
+                "Zero removes only points lying on the lasso between their neighbors"
+            ),
+            default=0.0,
+            min=0.0,
+            max=1.0,
+            subtype='PIXEL',
+            options={'SKIP_SAVE'},
+        )
 
     @classmethod
     def poll(cls, context: bpy.types.Context):
@@ -372,6 +385,7 @@ class MESH_OT_select_lasso_xray(bpy.types.Operator):
     def invoke(self, context: bpy.types.Context, event: bpy.types.Event) -> set["OperatorReturnItems"]:
         # Set operator properties from addon preferences.
         mesh_modal.set_properties_from_preferences(self, tool='LASSO')
+        mesh_modal.start_worker_processes()
 
         self.override_intersect_tests = (
             self.select_all_faces
@@ -571,10 +585,13 @@ class MESH_OT_select_lasso_xray(bpy.types.Operator):
             context,
             mode=self.curr_mode,
             tool='LASSO',
-            tool_co_kwargs={"lasso_poly": tuple(self.lasso_poly)},
+            tool_co_kwargs={
+                "lasso_poly": geometry_tests.simplify_polygon(self.lasso_poly, self.lasso_simplify_tolerance)
+            },
             select_all_edges=self.select_all_edges,
             select_all_faces=self.select_all_faces,
             select_backfacing=self.select_backfacing,
+            worker_count=addon_info.get_preferences().mesh_tools.worker_count,
         )
 
     def finish_modal(self, context: bpy.types.Context) -> None:
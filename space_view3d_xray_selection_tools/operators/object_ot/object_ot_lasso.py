@@ -156,6 +156,7 @@ class OBJECT_OT_select_lasso_xray(bpy.types.Operator):
         xray_toggle_type: Literal['HOLD', 'PRESS']
         hide_gizmo: bool
         show_lasso_icon: bool
+        lasso_simplify_tolerance: float
         behavior: Literal['ORIGIN', 'CONTAIN', 'OVERLAP', 'DIRECTIONAL', 'DIRECTIONAL_REVERSED']
     else:
         mode: bpy.props.EnumProperty(
@@ -248,6 +249,18 @@ class OBJECT_OT_select_lasso_xray(bpy.types.Operator):
             default=True,
             options={'SKIP_SAVE'},
         )
+        lasso_simplify_tolerance: bpy.props.FloatProperty(
+            name="Lasso Simplification Tolerance",
+            description=(
+                "Remove lasso points deviating from the simplified lasso by no more than this distance. "
+                "Zero removes only points lying on the lasso between their neighbors"
+            ),
+            default=0.0,
+            min=0.0,
+            max=1.0,
+            subtype='PIXEL',
+            options={'SKIP_SAVE'},
+        )
         behavior: bpy.props.EnumProperty(
             name="Selection Behavior",
             description="Selection behavior",
@@ -502,7 +515,10 @@ class OBJECT_OT_select_lasso_xray(bpy.types.Operator):
     def begin_custom_intersect_tests(self, context: bpy.types.Context) -> None:
         assert self.curr_behavior == 'CONTAIN' or self.curr_behavior == 'OVERLAP'
         object_intersect.select_objects_in_lasso(
-            context, mode=self.curr_mode, lasso_poly=tuple(self.lasso_poly), behavior=self.curr_behavior
+            context,
+            mode=self.curr_mode,
+            lasso_poly=geometry_tests.simplify_polygon(self.lasso_poly, self.lasso_simplify_tolerance),
+            behavior=self.curr_behavior,
         )
 
     def finish_modal(self, context: bpy.types.Context) -> None:
@@ -36,6 +36,27 @@ _info_texts: dict[str, tuple[str, ...]] = {
         "Show crosshair of box tool or lasso icon of lasso tool next to cursor when tool is started with "
         "a keyboard shortcut.",
     ),
+    "lasso_simplify_tolerance": (
+        (
+            "Remove lasso points that deviate from the simplified lasso by no more than the tolerance before "
+            "testing geometry. Long lassos get much cheaper to test. Zero removes only points lying on the lasso "
+            "between their neighbors and keeps the selection identical. A higher tolerance moves the lasso outline "
+            "by up to that distance, so elements that close to the lasso may be selected differently."
+        ),
+    ),
+    "worker_count": (
+        (
+            "While mesh data of one object is read, visibility and screen coordinates of the already read objects are "
+            "calculated on other threads. Helps when selecting in many objects at once in multi-object edit mode."
+        ),
+    ),
+    "use_worker_processes": (
+        (
+            "Test lasso against meshes with millions of vertices in background processes, which aren't limited by "
+            "the single Python interpreter of Blender. Processes are started in the background when a mesh tool is "
+            "used, and coordinates are passed to them through shared memory."
+        ),
+    ),
     "hide_gizmo": (
         "Hide gizmo of the active tool for the duration of the selection and restore it after finishing selection.",
     ),
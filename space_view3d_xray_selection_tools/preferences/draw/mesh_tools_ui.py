@@ -252,6 +252,23 @@ def draw_mesh_tools_preferences(addon_prefs: "XRAYSELPreferences", box: bpy.type
     row.prop(mesh_tools_props, "show_lasso_icon", text="Show Lasso Icon", icon='RESTRICT_SELECT_OFF')
     row.operator("xraysel.show_info_popup", text="", icon='QUESTION').button = "wait_for_input_cursor"
 
+    # Lasso simplification
+    _draw_flow_vertical_separator(flow)
+    flow.label(text="Simplify the lasso before testing geometry")
+    row = flow.row(align=True)
+    row.prop(mesh_tools_props, "lasso_simplify_tolerance", text="Tolerance")
+    row.operator("xraysel.show_info_popup", text="", icon='QUESTION').button = "lasso_simplify_tolerance"
+
+    # Worker threads
+    _draw_flow_vertical_separator(flow)
+    flow.label(text="Process objects in multi-object edit mode on several threads")
+    row = flow.row(align=True)
+    row.prop(mesh_tools_props, "worker_count", text="Threads")
+    row.operator("xraysel.show_info_popup", text="", icon='QUESTION').button = "worker_count"
+    row = flow.row(align=True)
+    row.prop(mesh_tools_props, "use_worker_processes", text="Use Worker Processes", icon='RESTRICT_SELECT_OFF')
+    row.operator("xraysel.show_info_popup", text="", icon='QUESTION').button = "use_worker_processes"
+
     # Startup
     _draw_flow_vertical_separator(flow)
     flow.label(text="Automatically activate following tool at startup")
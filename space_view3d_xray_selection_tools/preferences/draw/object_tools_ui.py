@@ -74,6 +74,13 @@ def draw_object_tools_preferences(addon_prefs: "XRAYSELPreferences", box: bpy.ty
     row.prop(object_tools_props, "show_lasso_icon", text="Show Lasso Icon", icon='RESTRICT_SELECT_OFF')
     row.operator("xraysel.show_info_popup", text="", icon='QUESTION').button = "wait_for_input_cursor"
 
+    # Lasso simplification
+    _draw_flow_vertical_separator(flow)
+    flow.label(text="Simplify the lasso before testing geometry")
+    row = flow.row(align=True)
+    row.prop(object_tools_props, "lasso_simplify_tolerance", text="Tolerance")
+    row.operator("xraysel.show_info_popup", text="", icon='QUESTION').button = "lasso_simplify_tolerance"
+
     # Startup
     _draw_flow_vertical_separator(flow)
     flow.label(text="Automatically activate following tool at startup")
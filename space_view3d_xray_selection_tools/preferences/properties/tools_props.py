@@ -2,7 +2,16 @@ from typing import TYPE_CHECKING, Literal
 
 import bpy
 
-from ... import tools
+from ... import addon_info, tools
+from ...functions import process_pool
+
+
+def _toggle_worker_processes(_pg: bpy.types.PropertyGroup, _context: bpy.types.Context) -> None:
+    mesh_tools_props = addon_info.get_preferences().mesh_tools
+    if mesh_tools_props.use_worker_processes:
+        process_pool.start(mesh_tools_props.worker_count)
+    else:
+        process_pool.shutdown()
 
 
 class ToolsSharedPreferences:
@@ -10,6 +19,7 @@ class ToolsSharedPreferences:
         hide_gizmo: bool
         show_crosshair: bool
         show_lasso_icon: bool
+        lasso_simplify_tolerance: float
         tool_to_activate: Literal['NONE', 'BOX', 'CIRCLE', 'LASSO']
         group_with_builtins: bool
         display_header_buttons: bool
@@ -30,6 +40,18 @@ class ToolsSharedPreferences:
             description="Display the lasso cursor icon when wait_for_input is enabled",
             default=True,
         )
+        lasso_simplify_tolerance: bpy.props.FloatProperty(
+            name="Lasso Simplification Tolerance",
+            description=(
+                "Remove lasso points deviating from the simplified lasso by no more than this distance in pixels "
+                "before testing geometry. Speeds up selection with long lassos. Zero keeps the selection identical, "
+                "a higher tolerance may change the selection of elements that close to the lasso"
+            ),
+            default=0.0,
+            min=0.0,
+            max=1.0,
+            subtype='PIXEL',
+        )
         tool_to_activate: bpy.props.EnumProperty(
             name="Activate automatically at startup",
             description="Set this tool as active in toolbar automatically when you start blender or load a save file",
@@ -131,6 +153,8 @@ class XRAYSELMeshToolsPreferencesPG(ToolsSharedPreferences, XRAYSELToolMeDirecti
         select_through_toggle_type: Literal['HOLD', 'PRESS']
         hide_mirror: bool
         hide_solidify: bool
+        worker_count: int
+        use_worker_processes: bool
     else:
         direction_properties: bpy.props.CollectionProperty(
             type=XRAYSELToolMeDirectionProps,
@@ -177,6 +201,26 @@ class XRAYSELMeshToolsPreferencesPG(ToolsSharedPreferences, XRAYSELToolMeDirecti
             description="Temporarily hide solidify modifiers during selection",
             default=True,
         )
+        worker_count: bpy.props.IntProperty(
+            name="Worker Threads",
+            description=(
+                "Number of threads processing objects while selecting in multi-object edit mode. "
+                "With 1, everything runs on the main thread"
+            ),
+            default=4,
+            min=1,
+            max=64,
+            soft_max=32,
+        )
+        use_worker_processes: bpy.props.BoolProperty(
+            name="Worker Processes",
+            description=(
+                "Test lasso against very dense meshes in background processes, one per worker thread. "
+                "Processes are started when a mesh tool is used and use additional memory"
+            ),
+            default=False,
+            update=_toggle_worker_processes,
+        )
 
 
 class XRAYSELObjectToolsPreferencesPG(bpy.types.PropertyGroup, ToolsSharedPreferences):
@@ -1,8 +1,15 @@
 import bpy
 
 from . import addon_info
+from .functions import geometry_versions, mesh_topology, projection_cache
+from .functions.intersections.object_intersect import object_geometry_cache
+from .functions.modals import mesh_modal
 from .tools import tools_utils
 
+# Owner of the message bus subscription to changes of the active tool.
+_tool_change_owner = object()
+_MESH_TOOL_IDNAMES = {"mesh_tool.select_box_xray", "mesh_tool.select_circle_xray", "mesh_tool.select_lasso_xray"}
+
 
 def _activate_tool():
     idname_by_enum = {
@@ -26,16 +33,49 @@ def _activate_tool():
                         area.tag_redraw()
 
 
+def _start_worker_processes_for_active_tool() -> None:
+    """Start worker processes when a mesh tool of the add-on is active, so they are ready for its first selection."""
+    workspace = bpy.context.workspace
+    if workspace is None:
+        return
+    tool = workspace.tools.from_space_view3d_mode('EDIT_MESH', create=False)
+    if tool is not None and tool.idname in _MESH_TOOL_IDNAMES:
+        mesh_modal.start_worker_processes()
+
+
+def _subscribe_to_tool_changes() -> None:
+    bpy.msgbus.clear_by_owner(_tool_change_owner)
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.WorkSpace, "tools"),
+        owner=_tool_change_owner,
+        args=(),
+        notify=_start_worker_processes_for_active_tool,
+    )
+
+
 @bpy.app.handlers.persistent
 def _activate_tool_on_file_load(_scene: bpy.types.Scene) -> None:
     _activate_tool()
+    # Loading a file clears message bus subscriptions.
+    _subscribe_to_tool_changes()
+    _start_worker_processes_for_active_tool()
 
 
 def register():
     if _activate_tool_on_file_load not in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.append(_activate_tool_on_file_load)
+    _subscribe_to_tool_changes()
+    geometry_versions.register()
+    mesh_topology.register()
+    projection_cache.register()
+    object_geometry_cache.register()
 
 
 def unregister():
     if _activate_tool_on_file_load in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(_activate_tool_on_file_load)
+    bpy.msgbus.clear_by_owner(_tool_change_owner)
+    geometry_versions.unregister()
+    mesh_topology.unregister()
+    projection_cache.unregister()
+    object_geometry_cache.unregister()
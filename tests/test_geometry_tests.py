@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+# The add-on package imports Blender modules, `fake-bpy-module` provides them outside Blender.
+pytest.importorskip("bpy")
+
+from space_view3d_xray_selection_tools.functions import geometry_tests
+
+_SQUARE = ((0.0, 0.0), (100.0, 0.0), (100.0, 100.0), (0.0, 100.0))
+
+
+@pytest.mark.parametrize(
+    ("poly", "expected"),
+    [
+        # Polygon fully inside the other polygon.
+        (((40, 40), (60, 40), (60, 60), (40, 60)), True),
+        # Polygon containing the other polygon.
+        (((-10, -10), (110, -10), (110, 110), (-10, 110)), True),
+        # Crossing sides.
+        (((50, 50), (150, 50), (150, 150), (50, 150)), True),
+        # Disjoint polygons.
+        (((140, 140), (160, 140), (160, 160), (140, 160)), False),
+    ],
+)
+def test_polygon_intersect_polygon(poly: tuple[tuple[int, int], ...], expected: bool) -> None:
+    assert geometry_tests.polygon_intersect_polygon(np.array(poly, "f"), _SQUARE) is expected